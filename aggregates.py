@@ -0,0 +1,69 @@
+# aggregates.py
+
+HOUSING_CAPACITY = 10   # colonists a Housing building holds unless it says otherwise
+
+
+def housing_capacity(building):
+    return building.get("capacity", HOUSING_CAPACITY)
+
+
+class ColonyTotals:
+    def __init__(self):
+        """
+        Colony-wide sums, kept current by the entities themselves.
+
+        The building manager reports finished buildings, farms their output
+        and units what goes in and out of their cargo holds, so reading any
+        total is O(1) and every reader in a frame sees the same numbers.
+        Generator charge moves every frame, so it is summed by resync() at
+        each round boundary (and when a generator is added) rather than on
+        every change.
+        """
+        self.generator_charge = 0       # summed % charge of all generators as of the last resync()
+        self.generators = []
+        self.housing_capacity = 0
+        self.vehicle_bays = 0           # finished Vehicle Bays; each builds one unit at a time
+        self.farm_output = 0            # food per round from the farms that are growing
+        self.units = {}                 # unit class name -> count
+        self.stored_ore = {}            # resource type -> units held by rovers and drones
+        self.stored_total = 0
+
+    # -----------------------------
+    # Notifications
+    # -----------------------------
+    def building_finished(self, building):
+        b_type = building["type"]
+        if b_type == "Housing":
+            self.housing_capacity += housing_capacity(building)
+        elif b_type == "Power Generator" and "object" in building:
+            self.generators.append(building["object"])
+            self.resync()
+        elif b_type == "Vehicle Bay":
+            self.vehicle_bays += 1
+
+    def resync(self):
+        self.generator_charge = sum(g.power for g in self.generators)
+
+    def farm_output_changed(self, delta):
+        self.farm_output += delta
+
+    def unit_added(self, unit):
+        unit.totals = self
+        name = type(unit).__name__
+        self.units[name] = self.units.get(name, 0) + 1
+        for res_type, amount in unit.resources_held.items():
+            self.ore_changed(res_type, amount)
+
+    def ore_changed(self, res_type, delta):
+        self.stored_ore[res_type] = self.stored_ore.get(res_type, 0) + delta
+        self.stored_total += delta
+
+    # -----------------------------
+    # Reads
+    # -----------------------------
+    def power(self):
+        """Summed generator charge as the dashboard shows it."""
+        return round(self.generator_charge, 1)
+
+    def unit_count(self, name=None):
+        return self.units.get(name, 0) if name else sum(self.units.values())
@@ -0,0 +1,88 @@
+# alloc_tracker.py
+import gc
+import sys
+from collections import deque
+
+tracemalloc = None  # imported by the first enable(); it is slow to import and rarely used
+
+
+class AllocationTracker:
+    def __init__(self, history=120):
+        """
+        Per-phase allocation accounting, driven by FrameTimer's start/stop calls.
+
+        For every phase it records:
+          - transient bytes: tracemalloc peak above the phase's starting usage
+            (roughly how much the phase allocated, even if it was freed again)
+          - retained bytes: traced memory still held when the phase ended
+          - blocks: net change in allocated interpreter memory blocks
+          - gc objects: net change in GC-tracked objects (generation 0 count)
+        tracemalloc slows everything down, so only enable this while measuring.
+        """
+        self.enabled = False
+        self.frames = deque(maxlen=history)
+        self._frame = {}
+        self._start = None
+
+    def enable(self):
+        global tracemalloc
+        if tracemalloc is None:
+            import tracemalloc
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+        self.frames.clear()
+        self._frame = {}
+        self._start = None  # ignore a phase that was already running when enabled
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+        if tracemalloc is not None and tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+    # -----------------------------
+    # Phase hooks (called by FrameTimer)
+    # -----------------------------
+    def phase_start(self):
+        tracemalloc.reset_peak()
+        current, _ = tracemalloc.get_traced_memory()
+        self._start = (current, sys.getallocatedblocks(), gc.get_count()[0])
+
+    def phase_stop(self, phase):
+        if self._start is None:
+            return
+        current, peak = tracemalloc.get_traced_memory()
+        start_bytes, start_blocks, start_gc = self._start
+        stats = self._frame.setdefault(phase, [0, 0, 0, 0])
+        stats[0] += peak - start_bytes
+        stats[1] += current - start_bytes
+        stats[2] += sys.getallocatedblocks() - start_blocks
+        # gen0 resets when a collection runs; skip the sample rather than report a bogus negative
+        gen0 = gc.get_count()[0]
+        if gen0 >= start_gc:
+            stats[3] += gen0 - start_gc
+
+    def end_frame(self):
+        self.frames.append(self._frame)
+        self._frame = {}
+
+    # -----------------------------
+    # Reporting
+    # -----------------------------
+    def summary(self):
+        """Mean per frame: {phase: (transient_bytes, retained_bytes, blocks, gc_objects)}."""
+        totals = {}
+        for frame in self.frames:
+            for phase, values in frame.items():
+                acc = totals.setdefault(phase, [0, 0, 0, 0])
+                for i, v in enumerate(values):
+                    acc[i] += v
+        n = max(len(self.frames), 1)
+        return {phase: tuple(v / n for v in values) for phase, values in totals.items()}
+
+    def report(self):
+        lines = [f"Allocations per frame over {len(self.frames)} frames",
+                 f"{'phase':<12}{'transient B':>14}{'retained B':>12}{'blocks':>10}{'gc objs':>10}"]
+        for phase, (transient, retained, blocks, objs) in self.summary().items():
+            lines.append(f"{phase:<12}{transient:>14.0f}{retained:>12.0f}{blocks:>10.1f}{objs:>10.1f}")
+        return "\n".join(lines)
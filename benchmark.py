@@ -0,0 +1,260 @@
+# benchmark.py
+"""
+Headless micro-benchmarks for the simulation and render hot paths.
+
+Usage:
+    python benchmark.py                       # run everything, write bench_results.json
+    python benchmark.py --only terrain        # run benchmarks whose name contains "terrain"
+    python benchmark.py --compare old.json    # print the ratio against a previous run
+"""
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import argparse
+import json
+import platform
+import random
+import statistics
+import subprocess
+import time
+
+import numpy as np
+import pygame
+
+from terrain import generate_noise_map, draw_terrain
+from resources import ResourceDeposit
+from building_manager import BuildingManager
+from rover import Rover
+from drone import Drone
+from rover_inventory import RoverInventory
+from dashboard import Dashboard
+from event import EventManager
+from unit_sprites import SpriteAtlas
+from menu import Menu
+
+WIDTH, HEIGHT = 1280, 720
+TILE_SIZE = 10
+COLS = WIDTH // TILE_SIZE
+ROWS = HEIGHT // TILE_SIZE
+
+
+# ---------------- Timing helpers ---------------- #
+def measure(fn, number=1, repeat=20, warmup=3, setup=None):
+    """
+    Time fn() and return per-call timings in microseconds.
+
+    setup (optional) runs before every sample and is not timed, so benchmarks
+    that mutate state can reset it. Each sample calls fn `number` times.
+    """
+    for _ in range(warmup):
+        if setup:
+            setup()
+        for _ in range(number):
+            fn()
+
+    samples = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter_ns()
+        for _ in range(number):
+            fn()
+        samples.append((time.perf_counter_ns() - start) / number / 1000)
+
+    return {
+        "number": number,
+        "repeat": repeat,
+        "min_us": round(min(samples), 3),
+        "median_us": round(statistics.median(samples), 3),
+        "mean_us": round(statistics.fmean(samples), 3),
+        "stdev_us": round(statistics.stdev(samples), 3) if len(samples) > 1 else 0.0,
+    }
+
+
+def git_commit():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"],
+                             capture_output=True, text=True, check=True,
+                             cwd=os.path.dirname(os.path.abspath(__file__)))
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+# ---------------- Fixtures ---------------- #
+def building_grid(count, size=(2, 2), gap=1):
+    """BuildingManager on a flat map holding `count` buildings laid out on a grid."""
+    per_row = int(np.ceil(np.sqrt(count)))
+    step = size[0] + gap
+    cols = rows = per_row * step + 10
+    manager = BuildingManager(np.zeros((rows, cols)))
+    for i in range(count):
+        manager.buildings.append({
+            "gx": (i % per_row) * step,
+            "gy": (i // per_row) * step,
+            "size": size,
+            "type": "Generic",
+            "color": (180, 180, 180),
+        })
+    # First free spot exactly one tile right of the grid's top row
+    spot = (per_row * step, 0)
+    return manager, spot
+
+
+def deposit_field(count):
+    """`count` single-tile deposits spread over the map, none under the map's top-left corner."""
+    rng = random.Random(count)
+    deposits = []
+    for _ in range(count):
+        x = rng.randint(10, COLS - 1)
+        y = rng.randint(10, ROWS - 1)
+        deposits.append(ResourceDeposit("iron", [(x, y)], (0, 0, 0)))
+    return deposits
+
+
+# ---------------- Benchmarks ---------------- #
+def build_benchmarks(screen):
+    random.seed(1234)
+    noise_map = generate_noise_map(ROWS, COLS)
+    benches = []
+
+    benches.append(("generate_noise_map", {}, dict(
+        fn=lambda: generate_noise_map(ROWS, COLS), number=1, repeat=5, warmup=1)))
+
+    benches.append(("draw_terrain", {}, dict(
+        fn=lambda: draw_terrain(screen, noise_map, TILE_SIZE), number=1, repeat=10)))
+
+    benches.append(("spawn_resources", {}, dict(
+        fn=lambda: ResourceDeposit.spawn_resources(noise_map, COLS, ROWS, TILE_SIZE), number=5)))
+
+    for count in (10, 100, 1000):
+        manager, (sx, sy) = building_grid(count)
+        benches.append((f"can_place[{count}]", {"buildings": count}, dict(
+            fn=lambda m=manager, x=sx, y=sy: m.can_place(x, y, (2, 2)), number=5)))
+
+        snapshot = list(manager.buildings)
+
+        def reset(m=manager, s=snapshot):
+            m.buildings[:] = s
+        benches.append((f"add_building[{count}]", {"buildings": count}, dict(
+            fn=lambda m=manager, x=sx, y=sy: m.add_building(x, y, size=(2, 2)),
+            number=1, setup=reset)))
+
+    for count in (10, 100, 1000):
+        rover = Rover(5, 5)
+        inventory = RoverInventory(rover)
+        deposits = deposit_field(count)
+        benches.append((f"resource_under_rover[{count}]", {"deposits": count}, dict(
+            fn=lambda i=inventory, d=deposits: i.resource_under_rover(d), number=20)))
+
+    rover = Rover(100, 100)
+    flat = np.zeros((ROWS, COLS))
+
+    def reset_rover():
+        rover.x, rover.y = 100, 100
+        rover.set_target((1000, 600))
+        rover.power = rover.max_power
+    benches.append(("Rover.move", {}, dict(
+        fn=lambda: rover.move(flat, TILE_SIZE, COLS, ROWS, 1 / 60), number=200, setup=reset_rover)))
+
+    drone = Drone(100, 100)
+
+    def reset_drone():
+        drone.x, drone.y = 100, 100
+        drone.set_target((1000, 600))
+        drone.power = drone.max_power
+    benches.append(("Drone.move", {}, dict(
+        fn=lambda: drone.move(flat, TILE_SIZE, COLS, ROWS, 1 / 60), number=200, setup=reset_drone)))
+
+    rng = random.Random(500)
+    units = [(Rover if i % 2 else Drone)(rng.randint(20, WIDTH - 20), rng.randint(20, HEIGHT - 20)) for i in range(500)]
+    for u in units:
+        u.power = rng.uniform(0, 100)
+
+    def draw_each():
+        for u in units:
+            u.draw(screen)
+    benches.append(("units.draw[500]", {"units": 500}, dict(fn=draw_each, number=1)))
+    atlas = SpriteAtlas()
+    benches.append(("SpriteAtlas.draw_units[500]", {"units": 500}, dict(
+        fn=lambda: atlas.draw_units(screen, units), number=1)))
+
+    dashboard = Dashboard(rounds_total=30)
+    benches.append(("Dashboard.draw", {}, dict(
+        fn=lambda: dashboard.draw(screen), number=10)))
+
+    panel = RoverInventory(Rover(640, 360))
+    benches.append(("RoverInventory.draw[compose]", {}, dict(
+        fn=lambda: panel.draw(screen, []), number=1, setup=panel.panel_cache.invalidate)))
+    benches.append(("RoverInventory.draw[cached]", {}, dict(
+        fn=lambda: panel.draw(screen, []), number=10)))
+
+    event_manager = EventManager(dashboard, WIDTH, HEIGHT)
+    event_manager.active_event = event_manager.events[6]  # longest popup (volcanic eruption)
+    benches.append(("EventManager.draw", {}, dict(
+        fn=lambda: event_manager.draw(screen), number=10)))
+
+    benches.append(("Menu.__init__", {}, dict(
+        fn=lambda: Menu(WIDTH, HEIGHT), number=1, repeat=5, warmup=1)))
+
+    menu = Menu(WIDTH, HEIGHT)
+    benches.append(("Menu.draw_main_menu", {}, dict(
+        fn=lambda: menu.draw_main_menu(screen), number=10)))
+
+    return benches
+
+
+# ---------------- Reporting ---------------- #
+def print_table(results, baseline=None):
+    print(f"{'benchmark':<28}{'median us':>12}{'min us':>12}{'stdev':>10}" + (f"{'vs base':>10}" if baseline else ""))
+    for name, r in results.items():
+        line = f"{name:<28}{r['median_us']:>12.1f}{r['min_us']:>12.1f}{r['stdev_us']:>10.1f}"
+        if baseline:
+            old = baseline.get("results", {}).get(name)
+            line += f"{r['median_us'] / old['median_us']:>9.2f}x" if old and old["median_us"] else f"{'-':>10}"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mars Colony Simulator micro-benchmarks")
+    parser.add_argument("--output", default="bench_results.json", help="JSON file to write results to")
+    parser.add_argument("--only", default=None, help="run only benchmarks whose name contains this text")
+    parser.add_argument("--repeat", type=int, default=None, help="override the number of timed samples")
+    parser.add_argument("--compare", default=None, help="previous results JSON to compare against")
+    args = parser.parse_args()
+
+    pygame.init()
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+
+    results = {}
+    for name, params, spec in build_benchmarks(screen):
+        if args.only and args.only not in name:
+            continue
+        if args.repeat:
+            spec["repeat"] = args.repeat
+        results[name] = dict(params, **measure(**spec))
+
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "pygame": pygame.version.ver,
+            "platform": platform.platform(),
+        },
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    print_table(results, baseline)
+    print(f"\nWrote {args.output}")
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
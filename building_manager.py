@@ -1,12 +1,16 @@
 import pygame
 import random
+from tracing import tracer
 
 class BuildingManager:
-    def __init__(self, noise_map=None):
+    def __init__(self, noise_map=None, totals=None):
         self.noise_map = noise_map
+        self.totals = totals  # ColonyTotals told about every finished building
         self.buildings = []
         self.resources = []
         self.base = None
+        self.version = 0  # bumped whenever a building (or airlock) is added
+        self._draw_rect = pygame.Rect(0, 0, 0, 0)  # reused by draw()
 
     # -------------------------
     # Utility methods
@@ -47,6 +51,7 @@ class BuildingManager:
                 "object": getattr(base, "object", None)
             }
             self.buildings.append(bdict)
+            self.version += 1
 
     # -------------------------
     # Placement rules
@@ -91,7 +96,13 @@ class BuildingManager:
 
         return valid_gap
 
-    def add_building(self, gx, gy, size=(4,4), color=(180,180,180), b_type="Generic", obj=None):
+    def add_building(self, gx, gy, size=(4,4), color=(180,180,180), b_type="Generic", obj=None,
+                     under_construction=False):
+        """Place a building; returns its dict, or False if the spot is invalid."""
+        with tracer.span("add_building", "buildings"):
+            return self._add_building(gx, gy, size, b_type, obj, under_construction)
+
+    def _add_building(self, gx, gy, size, b_type, obj, under_construction):
         if not self.can_place(gx, gy, size):
             return False
 
@@ -104,10 +115,24 @@ class BuildingManager:
         }
         if obj:
             new_building["object"] = obj
+        if under_construction:
+            new_building["under_construction"] = True
 
         self.buildings.append(new_building)
         self._maybe_create_airlocks_for(new_building)
-        return True
+        self.version += 1
+        if self.totals is not None and not under_construction:
+            self.totals.building_finished(new_building)
+        return new_building
+
+    def finish_construction(self, building, obj=None):
+        """Turn a building placed with "under_construction" set into a working one."""
+        building.pop("under_construction", None)
+        if obj:
+            building["object"] = obj
+        self.version += 1
+        if self.totals is not None:
+            self.totals.building_finished(building)
 
     # -------------------------
     # Airlock logic (single tile connection)
@@ -149,19 +174,18 @@ class BuildingManager:
     # Drawing (match home base perfectly)
     # -------------------------
     def draw(self, screen, tile_size):
+        rect = self._draw_rect
         for b in self.buildings:
             gx, gy = b["gx"], b["gy"]
             w, h = b["size"]
-            x = gx * tile_size
-            y = gy * tile_size
-            rect = pygame.Rect(x, y, w * tile_size, h * tile_size)
+            rect.update(gx * tile_size, gy * tile_size, w * tile_size, h * tile_size)
 
             if b.get("type") == "Airlock":
                 pygame.draw.rect(screen, (0, 0, 0), rect)
                 continue
 
-            # Fill (same color as main base)
-            pygame.draw.rect(screen, (180, 180, 180), rect)
+            # Fill (same color as main base; darker while still being built)
+            pygame.draw.rect(screen, (110, 110, 110) if b.get("under_construction") else (180, 180, 180), rect)
 
             # Outer border directly on edge (no gray sliver)
             pygame.draw.rect(screen, (0, 0, 0), rect, 2)
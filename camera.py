@@ -0,0 +1,75 @@
+# camera.py
+import pygame
+
+
+class Camera:
+    def __init__(self, view_size, world_size, max_level=3):
+        """
+        The part of the world shown in the window, in world pixels.
+
+        Units, buildings, deposits and clicks all live in world coordinates;
+        only drawing and mouse input are converted with to_screen()/to_world().
+        Zoom `level` k shows the world at 1/2**k size (one screen pixel covers
+        `scale` world pixels), matching the compositor's mip levels. The view
+        is clamped to the world, or centred on it once the world is smaller
+        than the window. `version` changes whenever the view moves or zooms so
+        cached screen contents know to redraw.
+        """
+        self.view_size = view_size
+        self.world_rect = pygame.Rect((0, 0), world_size)
+        self.max_level = max_level
+        self.level = 0
+        self.scale = 1
+        self.rect = pygame.Rect((0, 0), view_size)
+        self.x = 0.0    # unrounded top-left, so slow pans accumulate
+        self.y = 0.0
+        self.version = 0
+
+    def move_to(self, x, y):
+        """Put the view's top-left at world (x, y); returns True if the view moved."""
+        self.x = self._clamp(x, self.rect.width, self.world_rect.width)
+        self.y = self._clamp(y, self.rect.height, self.world_rect.height)
+        # Whole mip pixels, so the zoomed-out background and the units line up
+        left, top = int(self.x) // self.scale * self.scale, int(self.y) // self.scale * self.scale
+        if (left, top) == self.rect.topleft:
+            return False
+        self.rect.topleft = (left, top)
+        self.version += 1
+        return True
+
+    @staticmethod
+    def _clamp(value, view, world):
+        if view >= world:
+            return (world - view) // 2
+        return max(0.0, min(value, world - view))
+
+    def pan(self, dx, dy):
+        """Pan by screen pixels (scaled to world pixels at the current zoom)."""
+        return self.move_to(self.x + dx * self.scale, self.y + dy * self.scale)
+
+    def center_on(self, x, y):
+        return self.move_to(x - self.rect.width / 2, y - self.rect.height / 2)
+
+    def zoom_to(self, level, anchor=None):
+        """Change zoom level keeping the world point under screen pos `anchor` (default: centre) in place."""
+        level = max(0, min(self.max_level, level))
+        if level == self.level:
+            return False
+        if anchor is None:
+            anchor = (self.view_size[0] // 2, self.view_size[1] // 2)
+        wx, wy = self.to_world(anchor)
+        self.level = level
+        self.scale = 1 << level
+        self.rect.size = (self.view_size[0] * self.scale, self.view_size[1] * self.scale)
+        self.move_to(wx - anchor[0] * self.scale, wy - anchor[1] * self.scale)
+        self.version += 1
+        return True
+
+    # -----------------------------
+    # Coordinates
+    # -----------------------------
+    def to_world(self, pos):
+        return (pos[0] * self.scale + self.rect.x, pos[1] * self.scale + self.rect.y)
+
+    def to_screen(self, pos):
+        return ((pos[0] - self.rect.x) // self.scale, (pos[1] - self.rect.y) // self.scale)
@@ -0,0 +1,28 @@
+# cargo.py
+
+
+class CargoHold:
+    """
+    Mixin for units that carry mined resources in `resources_held` (a
+    `storage` count up to `storage_capacity`); every change is reported to
+    `totals` (a ColonyTotals) when one is set.
+    """
+    totals = None
+
+    def load(self, res_type, amount):
+        """Put `amount` of res_type in the hold (the caller checks there is room)."""
+        self.storage += amount
+        held = self.resources_held.get(res_type, 0)
+        self.resources_held[res_type] = min(held + amount, self.storage_capacity)
+        if self.totals is not None:
+            self.totals.ore_changed(res_type, self.resources_held[res_type] - held)
+
+    def unload(self):
+        """Empty the hold; returns what was in it."""
+        held = self.resources_held
+        self.resources_held = {}
+        self.storage = 0
+        if self.totals is not None:
+            for res_type, amount in held.items():
+                self.totals.ore_changed(res_type, -amount)
+        return held
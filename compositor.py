@@ -0,0 +1,165 @@
+# compositor.py
+import pygame
+from dirty_rects import DirtyTracker
+
+COLORKEY = (255, 0, 255)  # transparent in the deposit/building layers (no game colour uses it)
+
+
+class StaticLayer:
+    def __init__(self, name, version_fn, render, opaque=False, damage_fn=None):
+        """
+        A world layer cached in its own Surface.
+
+        render(surface, area) runs again only when version_fn() returns
+        something new. If damage_fn is given it returns the world Rect (or
+        list of Rects) that changed since its last call, or None for
+        "everything", and only those areas are cleared and re-rendered;
+        render() should skip what lies outside `area` (None = the whole
+        layer). Non-opaque layers are
+        colorkeyed so only what they drew covers the layers below.
+        """
+        self.name = name
+        self.version_fn = version_fn
+        self.render = render
+        self.opaque = opaque
+        self.damage_fn = damage_fn
+        self.surface = None
+        self.version = None
+        self.rebuilds = 0
+
+    def refresh(self, size, screen):
+        """Re-render what changed; returns the list of damaged Rects (empty when nothing did)."""
+        version = self.version_fn()
+        if self.surface is not None and version == self.version:
+            return []
+        self.version = version
+        self.rebuilds += 1
+        clear = (0, 0, 0) if self.opaque else COLORKEY
+        if self.surface is None:
+            self.surface = pygame.Surface(size, 0, screen)
+            if not self.opaque:
+                self.surface.set_colorkey(COLORKEY)
+            area = None
+            if self.damage_fn:
+                self.damage_fn()    # take the model snapshot the next damage is measured against
+        else:
+            area = self.damage_fn() if self.damage_fn else None
+        if area is None:
+            self.surface.fill(clear)
+            self.render(self.surface, None)
+            return [self.surface.get_rect()]
+        damaged = []
+        for rect in [area] if isinstance(area, pygame.Rect) else area:
+            rect = rect.clip(self.surface.get_rect())
+            if rect:
+                self.surface.set_clip(rect)
+                self.surface.fill(clear, rect)
+                self.render(self.surface, rect)
+                damaged.append(rect)
+        self.surface.set_clip(None)
+        return damaged
+
+
+class Compositor:
+    def __init__(self, size, world_size, static_layers, mip_levels=3):
+        """
+        Draws the frame as a stack of layers, bottom to top.
+
+        The static layers (terrain, deposits, buildings) each keep their own
+        world-sized cached Surface and are flattened into one background;
+        only the area a layer reports as damaged is re-rendered, re-flattened
+        and marked dirty on screen, so a new deposit no longer re-draws the
+        terrain or the whole frame.
+        The background also keeps `mip_levels` downsampled copies (1/2, 1/4,
+        1/8 size), updated for the same damaged area, which are shown as-is
+        when the camera zooms out. Each frame only the camera's view of the
+        background is copied to the screen, so frame cost follows the window,
+        not the world.
+        Dynamic layers (units, ghost, panels, hud, ...) are just names: their
+        drawables are registered every frame through add() and only the dirty
+        ones are drawn over the restored background.
+        """
+        self.world_size = world_size
+        self.static_layers = static_layers
+        self.mip_levels = mip_levels
+        self.dirty = DirtyTracker(size)
+        self.mips = None            # [background, 1/2, 1/4, 1/8]
+        self.view = None
+        self.level = 0
+        self._camera_version = None
+
+    @property
+    def background(self):
+        return self.mips[0] if self.mips else None
+
+    def add(self, layer, key, bounds, state, draw):
+        self.dirty.add(layer, key, bounds, state, draw)
+
+    # -----------------------------
+    # Static layers
+    # -----------------------------
+    def _refresh_static(self, screen):
+        """Re-render and re-flatten what the static layers report as changed; returns those world Rects."""
+        damage = []
+        for layer in self.static_layers:
+            damage += layer.refresh(self.world_size, screen)
+        if self.mips is None:
+            w, h = self.world_size
+            self.mips = [pygame.Surface((max(w >> k, 1), max(h >> k, 1)), 0, screen)
+                         for k in range(self.mip_levels + 1)]
+            damage = [self.mips[0].get_rect()]
+        background = self.mips[0]
+        for area in damage:
+            for layer in self.static_layers:
+                background.blit(layer.surface, area, area)
+            self._update_mips(area)
+        return damage
+
+    def _update_mips(self, area):
+        """Re-derive each downsampled level from the one above it, for `area` (level-0 pixels) only."""
+        for k in range(1, len(self.mips)):
+            step = 1 << k
+            left, top = area.left // step, area.top // step
+            right, bottom = -(-area.right // step), -(-area.bottom // step)
+            dst = pygame.Rect(left, top, right - left, bottom - top).clip(self.mips[k].get_rect())
+            src = pygame.Rect(dst.x * 2, dst.y * 2, dst.width * 2, dst.height * 2).clip(self.mips[k - 1].get_rect())
+            if dst and src:
+                scaled = pygame.transform.smoothscale(self.mips[k - 1].subsurface(src), dst.size)
+                self.mips[k].blit(scaled, dst)
+
+    # -----------------------------
+    # Frame
+    # -----------------------------
+    def begin_frame(self, screen, camera):
+        """Bring the static layers up to date and start collecting dynamic drawables."""
+        damage = self._refresh_static(screen)
+        self.view = camera.rect
+        self.level = camera.level
+        if camera.version != self._camera_version:
+            # Everything on screen shifted or rescaled; cheaper to redraw the view than to track it
+            self._camera_version = camera.version
+            self.dirty.invalidate()
+        else:
+            # Only the parts of the view whose background changed; a pixel wider for the rounded mip edges
+            level = self.level
+            for area in damage:
+                if area.colliderect(camera.rect):
+                    left, top = (area.x - camera.rect.x) >> level, (area.y - camera.rect.y) >> level
+                    self.dirty.damage(pygame.Rect(left - 1, top - 1, (area.width >> level) + 3,
+                                                  (area.height >> level) + 3))
+        self.dirty.begin_frame()
+
+    def restore(self, screen):
+        """Resolve this frame's dirty rects and put the background back under them (None = everything)."""
+        rects = self.dirty.resolve()
+        level = self.level
+        source = self.mips[level]
+        # Zoomed far enough out the world is smaller than the window; clear around it
+        clear = not source.get_rect().contains(pygame.Rect((self.view.x >> level, self.view.y >> level),
+                                                           screen.get_size()))
+        self.dirty.restore(screen, source, (self.view.x >> level, self.view.y >> level), clear)
+        return rects
+
+    def draw(self, screen, *layers):
+        for layer in layers:
+            self.dirty.draw(screen, layer)
@@ -0,0 +1,91 @@
+# construction.py
+import heapq
+import itertools
+from collections import deque
+
+
+class Job:
+    def __init__(self, name, rounds, on_complete):
+        """One thing being built; start/finish rounds are set when it gets a slot."""
+        self.name = name
+        self.rounds = rounds
+        self.on_complete = on_complete
+        self.start_round = None
+        self.finish_round = None
+
+
+class ConstructionScheduler:
+    def __init__(self, slots=1):
+        """
+        Jobs that take whole rounds, built `slots` at a time.
+
+        Running jobs sit in a heap keyed by the round they finish, so a round
+        boundary pops only the jobs that are done; jobs beyond the free slots
+        wait in order and start as slots free up. `version` changes with the
+        queue, and rows() only rebuilds the panel rows when it or the round
+        did.
+        """
+        self.slots = slots
+        self._active = []           # heap of (finish_round, seq, job)
+        self._waiting = deque()
+        self._seq = itertools.count()
+        self.version = 0
+        self._rows = ()
+        self._rows_key = None
+
+    def __len__(self):
+        return len(self._active) + len(self._waiting)
+
+    def submit(self, name, rounds, on_complete, current_round):
+        """Queue a job taking `rounds` rounds; on_complete() runs at the round boundary it finishes on."""
+        job = Job(name, rounds, on_complete)
+        self._waiting.append(job)
+        self._start_waiting(current_round)
+        self.version += 1
+        return job
+
+    def set_slots(self, slots, current_round):
+        """Run up to `slots` jobs at once; with fewer slots, running jobs still finish."""
+        if slots == self.slots:
+            return
+        self.slots = slots
+        if self._start_waiting(current_round):
+            self.version += 1
+
+    def _start_waiting(self, current_round):
+        started = False
+        while self._waiting and len(self._active) < self.slots:
+            job = self._waiting.popleft()
+            job.start_round = current_round
+            job.finish_round = current_round + job.rounds
+            heapq.heappush(self._active, (job.finish_round, next(self._seq), job))
+            started = True
+        return started
+
+    # -----------------------------
+    # Round boundary
+    # -----------------------------
+    def advance(self, current_round):
+        """Complete every job due by `current_round`, then start waiting ones; returns the completed jobs."""
+        done = []
+        while self._active and self._active[0][0] <= current_round:
+            done.append(heapq.heappop(self._active)[2])
+        for job in done:
+            job.on_complete()
+        if self._start_waiting(current_round) or done:
+            self.version += 1
+        return done
+
+    # -----------------------------
+    # Display
+    # -----------------------------
+    def rows(self, current_round):
+        """(name, rounds left, progress 0..1, waiting) per job: running ones by finish round, then the waiting."""
+        key = (self.version, current_round)
+        if key != self._rows_key:
+            rows = [(job.name, job.finish_round - current_round, (current_round - job.start_round) / job.rounds, False)
+                    for _, _, job in sorted(self._active)]
+            rows += [(job.name, job.rounds, 0.0, True) for job in self._waiting]
+            self._rows = tuple(rows)
+            self._rows_key = key
+        return self._rows
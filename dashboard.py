@@ -1,5 +1,14 @@
 # dashboard.py
 import pygame
+from text_cache import get_font, draw_text, render_text
+
+def merge_tiles(bounds, tiles):
+    """Grow the tile Rect `bounds` (None = empty) to cover the (x, y) tiles."""
+    for x, y in tiles:
+        tile = pygame.Rect(x, y, 1, 1)
+        bounds = tile if bounds is None else bounds.union(tile)
+    return bounds
+
 
 class Dashboard:
     def __init__(self, rounds_total, font_size=24, color=(255, 255, 255)):
@@ -9,7 +18,7 @@ class Dashboard:
         self.current_round = 1
         self.rounds_total = rounds_total
         self.color = color
-        self.font = pygame.font.SysFont("Arial", font_size, bold=True)
+        self.font = get_font("Arial", font_size, bold=True)
 
         # metrics
         self.population = 100
@@ -20,13 +29,23 @@ class Dashboard:
         self.metals = 20
         self.marsium = 0
         self.current_event = "None"
+        self.totals = None  # ColonyTotals, for the housing and farm figures
+
+        # bumped by whoever edits the map, so cached world layers know to rebuild;
+        # the damage Rects (in tiles) bound what changed since the layer last looked
+        self.terrain_version = 0
+        self.deposit_version = 0
+        self.terrain_damage = None
+        self.deposit_damage = None
 
         # Button appearance
-        self.button_font = pygame.font.SysFont("Arial", 20, bold=True)
+        self.button_font = get_font("Arial", 20, bold=True)
         self.button_width = 140
         self.button_height = 40
-        self.next_round_button = None
-        self.stop_control_button = None  # NEW
+        self.next_round_button = pygame.Rect(0, 0, self.button_width, self.button_height)
+        self.stop_control_button = pygame.Rect(0, 0, self.button_width, self.button_height)  # NEW
+        self.button_area = pygame.Rect(0, 0, 0, 0)  # both buttons; the UI router's hit region
+        self._layout_width = None
 
     def next_round(self):
         """Increment the current round."""
@@ -45,53 +64,78 @@ class Dashboard:
         if metals is not None: self.metals = metals
         if current_event is not None: self.current_event = current_event
 
+    def terrain_changed(self, tiles):
+        """Note (x, y) tiles whose terrain changed."""
+        self.terrain_version += 1
+        self.terrain_damage = merge_tiles(self.terrain_damage, tiles)
+
+    def deposits_changed(self, tiles):
+        """Note (x, y) tiles where deposits appeared or went away."""
+        self.deposit_version += 1
+        self.deposit_damage = merge_tiles(self.deposit_damage, tiles)
+
     def draw_text_with_outline(self, screen, text, x, y, outline_color=(0,0,0)):
-        """Draw text with black outline for readability."""
-        for dx in [-1,0,1]:
-            for dy in [-1,0,1]:
-                if dx != 0 or dy != 0:
-                    outline = self.font.render(text, True, outline_color)
-                    screen.blit(outline, (x + dx, y + dy))
-        render = self.font.render(text, True, self.color)
-        screen.blit(render, (x, y))
+        """Draw text with black outline for readability (one cached, pre-outlined blit)."""
+        draw_text(screen, self.font, text, self.color, (x, y), outline_color=outline_color)
+
+    def layout(self, screen_width):
+        """Position the buttons in the top-right corner (Rects are moved in place)."""
+        padding = 10
+        button_x = screen_width - self.button_width - padding
+        self.next_round_button.topleft = (button_x, padding)
+        self.stop_control_button.topleft = (button_x, padding + self.button_height + 10)
+        self.button_area = self.next_round_button.union(self.stop_control_button)
+        self._layout_width = screen_width
+
+    def text_lines(self):
+        """The metric lines shown in the top-left, top to bottom."""
+        totals = self.totals
+        food = f"Food: {self.food}"
+        if totals and totals.farm_output:
+            food += f" (+{totals.farm_output}/round)"
+        return (
+            f"Round: {self.current_round}/{self.rounds_total}",
+            "-"*20,
+            f"Population: {self.population}",
+            f"Housing: {totals.housing_capacity if totals else 0}",
+            food,
+            f"Power: {self.power}",
+            f"Water: {self.water}",
+            f"Soldiers: {self.soldiers}",
+            f"Metals: {self.metals}",
+            f"Marsium: {self.marsium}",
+            "-"*20,
+            f"Current Event: {self.current_event}",
+        )
+
+    def text_bounds(self, lines):
+        """Screen area draw_text_block() touches for `lines` (outline included)."""
+        line_height = self.font.get_height() + 4
+        bounds = None
+        for i, line in enumerate(lines):
+            surf = render_text(self.font, line, self.color, (0, 0, 0))
+            rect = surf.get_rect(topleft=(9, 9 + i * line_height))
+            bounds = rect if bounds is None else bounds.union(rect)
+        return bounds
 
     def draw(self, screen):
         """Draw the dashboard panel and buttons."""
+        self.draw_text_block(screen)
+        self.draw_buttons(screen)
+
+    def draw_text_block(self, screen, lines=None):
         # dashboard text (top-left)
         x = 10
         y = 10
         line_height = self.font.get_height() + 4
+        for line in lines or self.text_lines():
+            self.draw_text_with_outline(screen, line, x, y)
+            y += line_height
 
-        self.draw_text_with_outline(screen, f"Round: {self.current_round}/{self.rounds_total}", x, y)
-        y += line_height
-        self.draw_text_with_outline(screen, "-"*20, x, y)
-        y += line_height
-
-        self.draw_text_with_outline(screen, f"Population: {self.population}", x, y)
-        y += line_height
-        self.draw_text_with_outline(screen, f"Food: {self.food}", x, y)
-        y += line_height
-        self.draw_text_with_outline(screen, f"Power: {self.power}", x, y)
-        y += line_height
-        self.draw_text_with_outline(screen, f"Water: {self.water}", x, y)
-        y += line_height
-        self.draw_text_with_outline(screen, f"Soldiers: {self.soldiers}", x, y)
-        y += line_height
-        self.draw_text_with_outline(screen, f"Metals: {self.metals}", x, y)
-        y += line_height
-        self.draw_text_with_outline(screen, f"Marsium: {self.marsium}", x, y)  # <-- ADD THIS
-        y += line_height
-        self.draw_text_with_outline(screen, "-"*20, x, y)
-        y += line_height
-
-        self.draw_text_with_outline(screen, f"Current Event: {self.current_event}", x, y)
-
+    def draw_buttons(self, screen):
         # --- Next Round button (TOP-RIGHT) ---
-        screen_width = screen.get_width()
-        padding = 10
-        button_x = screen_width - self.button_width - padding
-        button_y = padding
-        self.next_round_button = pygame.Rect(button_x, button_y, self.button_width, self.button_height)
+        if self._layout_width != screen.get_width():
+            self.layout(screen.get_width())
 
         # choose color: green when active, grey when disabled
         if self.current_round >= self.rounds_total:
@@ -105,25 +149,25 @@ class Dashboard:
 
         pygame.draw.rect(screen, button_color, self.next_round_button, border_radius=6)
         pygame.draw.rect(screen, outline_color, self.next_round_button, 2, border_radius=6)
-        text_surf = self.button_font.render("Next Round", True, text_color)
+        text_surf = render_text(self.button_font, "Next Round", text_color)
         text_rect = text_surf.get_rect(center=self.next_round_button.center)
         screen.blit(text_surf, text_rect)
 
         # --- Stop Controlling button (RED, right below Next Round) ---
-        stop_y = button_y + self.button_height + 10
-        self.stop_control_button = pygame.Rect(button_x, stop_y, self.button_width, self.button_height)
         pygame.draw.rect(screen, (200, 0, 0), self.stop_control_button, border_radius=6)
         pygame.draw.rect(screen, (255, 255, 255), self.stop_control_button, 2, border_radius=6)
-        stop_text = self.button_font.render("Stop Controlling", True, (255,255,255))
+        stop_text = render_text(self.button_font, "Stop Controlling", (255,255,255))
         stop_rect = stop_text.get_rect(center=self.stop_control_button.center)
         screen.blit(stop_text, stop_rect)
 
     def handle_click(self, pos):
         """Return 'next_round' or 'stop_control' if button clicked."""
-        if self.next_round_button and self.next_round_button.collidepoint(pos):
+        if self._layout_width is None:
+            return None
+        if self.next_round_button.collidepoint(pos):
             if self.current_round < self.rounds_total:
                 self.next_round()
                 return "next_round"
-        if self.stop_control_button and self.stop_control_button.collidepoint(pos):
+        if self.stop_control_button.collidepoint(pos):
             return "stop_control"
         return None
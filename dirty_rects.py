@@ -0,0 +1,128 @@
+# dirty_rects.py
+import pygame
+
+
+class DirtyTracker:
+    def __init__(self, size, full_fraction=0.4, max_rects=200):
+        """
+        Redraws only the parts of the screen that changed since the last frame.
+
+        Each frame the session registers its drawables in draw order with
+        add(layer, key, bounds, state, draw). A drawable is dirty when it is
+        new, gone, moved (bounds) or shows something else (state); both its
+        old and new bounds are restored from the cached background and every
+        drawable overlapping them is redrawn in order. damage() adds areas
+        where the background itself changed. When the dirty area passes
+        `full_fraction` of the screen, or is split into more than `max_rects`
+        pieces (hundreds of small blits cost more than one big one), the
+        whole frame is redrawn and the caller should flip instead.
+        """
+        self.screen_rect = pygame.Rect((0, 0), size)
+        self.full_fraction = full_fraction
+        self.max_rects = max_rects
+        self.full = True            # first frame (and after invalidate()) is drawn in full
+        self.items = []
+        self.dirty = None           # list of Rects, or None for a full redraw
+        self._previous = {}         # key -> (bounds, state) from the last frame
+        self._damage = []           # background areas that changed under the drawables
+        self._redraw = None
+
+    def invalidate(self):
+        """Force a full redraw next frame (e.g. the background was rebuilt)."""
+        self.full = True
+
+    def damage(self, rect):
+        """Mark a screen area dirty because the background under it changed."""
+        rect = rect.clip(self.screen_rect)
+        if rect:
+            self._damage.append(rect)
+
+    def begin_frame(self):
+        self.items = []
+
+    def add(self, layer, key, bounds, state, draw):
+        """
+        Register a drawable that must stay inside `bounds`: either a callable
+        draw(screen) or a (source, dest, area) tuple for Surface.blits().
+        """
+        self.items.append((layer, key, bounds.clip(self.screen_rect), state, draw))
+
+    # -----------------------------
+    # Resolve + draw
+    # -----------------------------
+    def resolve(self):
+        """Work out this frame's dirty rects; returns them, or None for a full redraw."""
+        previous = self._previous
+        current = {}
+        dirty = self._damage
+        self._damage = []
+        redraw = [False] * len(self.items)
+
+        for i, (layer, key, bounds, state, draw) in enumerate(self.items):
+            current[key] = (bounds, state)
+            old = previous.get(key)
+            if old is None or old[0] != bounds or old[1] != state:
+                redraw[i] = True
+                if old is not None and old[0]:
+                    dirty.append(old[0])
+                if bounds:
+                    dirty.append(bounds)
+        for key, (bounds, state) in previous.items():
+            if key not in current and bounds:
+                dirty.append(bounds)
+        self._previous = current
+
+        limit = self.full_fraction * self.screen_rect.width * self.screen_rect.height
+        area = sum(r.width * r.height for r in dirty)
+
+        # Anything overlapping a restored area must be redrawn whole, which dirties its bounds too.
+        # Each pass only tests against the rects the previous pass added.
+        frontier = dirty
+        while frontier and not self.full and area <= limit and len(dirty) <= self.max_rects:
+            added = []
+            for i, item in enumerate(self.items):
+                bounds = item[2]
+                if not redraw[i] and bounds and bounds.collidelist(frontier) != -1:
+                    redraw[i] = True
+                    added.append(bounds)
+                    area += bounds.width * bounds.height
+            dirty = dirty + added
+            frontier = added
+
+        if self.full or area > limit or len(dirty) > self.max_rects:
+            self.full = False
+            self.dirty = None
+            self._redraw = None
+        else:
+            self.dirty = dirty
+            self._redraw = redraw
+        return self.dirty
+
+    def restore(self, screen, background, origin=(0, 0), clear=False):
+        """
+        Copy the cached background (shown from `origin`) over the dirty rects, or the whole screen.
+        `clear` blacks the area first, for when the background doesn't cover the whole screen.
+        """
+        ox, oy = origin
+        rects = [self.screen_rect] if self.dirty is None else self.dirty
+        for rect in rects:
+            if clear:
+                screen.fill((0, 0, 0), rect)
+            screen.blit(background, rect, rect.move(ox, oy))
+
+    def draw(self, screen, layer):
+        """
+        Draw the dirty drawables registered under `layer` in registration order;
+        blit tuples are batched into one Surface.blits call after the callables.
+        """
+        redraw = self._redraw
+        blits = []
+        for i, item in enumerate(self.items):
+            if item[0] == layer and (redraw is None or redraw[i]):
+                draw = item[4]
+                if isinstance(draw, tuple):
+                    blits.append(draw)
+                else:
+                    draw(screen)
+        if blits:
+            screen.blits(blits, doreturn=False)
@@ -1,13 +1,15 @@
 import pygame
 import math
+from cargo import CargoHold
 
-class Drone:
+class Drone(CargoHold):
     def __init__(self, x, y):
         self.x = x
         self.y = y
         self.target = None
         self.speed = 100  # pixels per second
         self.storage = 0
+        self.resources_held = {}
 
         # Behavior attributes
         self.mining_active = False
@@ -16,6 +18,7 @@ class Drone:
         # Visuals
         self.radius = 10
         self.color = (255, 255, 0)
+        self.sight = 9  # tiles revealed around the drone (it flies higher than a rover)
 
         # --- Power (Battery) Attributes ---
         self.max_power = 100  # full battery now 100%
@@ -31,6 +34,9 @@ class Drone:
         # Recharging rover
         self.recharging_rover = None
 
+        # Reused by draw()
+        self.bar_rect = pygame.Rect(0, 0, self.radius * 2, 4)
+
     # -----------------------------
     # Movement
     # -----------------------------
@@ -88,14 +94,33 @@ class Drone:
 
         # Power bar
         bar_width = self.radius * 2
-        bar_height = 4
-        bar_x = self.x - bar_width // 2
-        bar_y = self.y - self.radius - 8
+        bar = self.bar_rect
+        bar.update(self.x - bar_width // 2, self.y - self.radius - 8, bar_width, 4)
 
-        pygame.draw.rect(screen, (60, 60, 60), (bar_x, bar_y, bar_width, bar_height))
-        fill_width = int(bar_width * (self.power / self.max_power))
+        pygame.draw.rect(screen, (60, 60, 60), bar)
+        bar.width = int(bar_width * (self.power / self.max_power))
         color = (50, 220, 50) if self.power > 30 else (220, 50, 50)
-        pygame.draw.rect(screen, color, (bar_x, bar_y, fill_width, bar_height))
+        pygame.draw.rect(screen, color, bar)
+
+    # Sprite atlas (unit_sprites.py) hooks
+    def sprite_key(self):
+        return ("drone", self.radius, self.color)
+
+    def sprite_size(self):
+        # even sizes, so the half-size atlas cells stay whole pixels
+        return (2 * self.radius + 2, 2 * self.radius + 10)
+
+    def sprite_offset(self):
+        return (-self.radius, -self.radius - 8)
+
+    def draw_sprite(self, surface, topleft, fraction, low):
+        """draw() laid out in an atlas cell: power bar on top, body 8px below it."""
+        x, y = topleft
+        r = self.radius
+        pygame.draw.circle(surface, self.color, (x + r, y + 8 + r), r)
+        pygame.draw.rect(surface, (60, 60, 60), (x, y, 2 * r, 4))
+        color = (220, 50, 50) if low else (50, 220, 50)
+        pygame.draw.rect(surface, color, (x, y, int(2 * r * fraction), 4))
 
     # -----------------------------
     # Click detection
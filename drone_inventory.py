@@ -1,9 +1,16 @@
 import pygame
-import time
+from resources import deposit_under, probe_tiles
+from text_cache import get_font, render_text
+from panel_cache import PanelCache
+
+CHARGE_STEP = 0.25    # seconds of drone-to-rover transfer per timer tick
 
 class DroneInventory:
-    def __init__(self, drone, rovers=None, dashboard=None, building_manager=None):
+    def __init__(self, drone, rovers=None, dashboard=None, building_manager=None, tile_size=10, fog=None, timers=None):
         self.drone = drone
+        self.tile_size = tile_size
+        self.fog = fog  # deposits on unexplored tiles can't be found
+        self.timers = timers  # TimerWheel completing mining intervals and charge steps
         self.rovers = rovers or []  # list of rover objects
         self.dashboard = dashboard
         self.building_manager = building_manager
@@ -13,14 +20,26 @@ class DroneInventory:
         self.height = 420
         self.x = (1280 - self.width) // 2
         self.y = (720 - self.height) // 2
-        self.font = pygame.font.SysFont("Arial", 24, bold=True)
+        self.font = get_font("Arial", 24, bold=True)
+
+        # Buttons (panel position is fixed, so build the Rects once)
+        self.x_rect = pygame.Rect(self.x + self.width - 35, self.y + 5, 30, 30)
+        self.mine_rect = pygame.Rect(self.x + 50, self.y + self.height - 170, self.width - 100, 45)
+        self.recharge_rect = pygame.Rect(self.x + 50, self.y + self.height - 115, self.width - 100, 45)
+        self.refine_rect = pygame.Rect(self.x + 50, self.y + self.height - 60, self.width - 100, 45)
+        self.panel_rect = pygame.Rect(self.x, self.y, self.width, self.height)
+        self.panel_cache = PanelCache(self.panel_rect)
+        self.probe_rect = pygame.Rect(0, 0, 0, 0)  # reused for resource/rover checks
+        self.rover_rect = pygame.Rect(0, 0, 20, 20)
 
         # Mining state
         self.mining = False
-        self.mining_start_time = None
+        self.mining_timer = None
+        self.mining_elapsed = 0.0  # progress towards the next unit when there is no timer wheel
         self.mine_interval = 10
         self.error_message = ""
         self.current_resource = None
+        self._probe_key = None  # what current_resource was computed for
 
         # Drone storage
         self.drone.storage = getattr(self.drone, 'storage', 0)
@@ -33,6 +52,7 @@ class DroneInventory:
 
         # Recharging
         self.drone.recharging_rover = None
+        self.charge_timer = None
 
     # -----------------------------
     # Handle clicks
@@ -42,45 +62,35 @@ class DroneInventory:
             mx, my = event.pos
 
             # X button
-            x_rect = pygame.Rect(self.x + self.width - 35, self.y + 5, 30, 30)
-            if x_rect.collidepoint(mx, my):
+            if self.x_rect.collidepoint(mx, my):
                 return "close"
 
             # Mine button
-            mine_rect = pygame.Rect(self.x + 50, self.y + self.height - 170, self.width - 100, 45)
-            if mine_rect.collidepoint(mx, my):
+            if self.mine_rect.collidepoint(mx, my):
                 if self.drone.storage >= self.drone.storage_capacity:
                     self.error_message = "Drone Storage is Full"
                     return None
 
                 if self.mining:
-                    self.mining = False
-                    self.drone.mining_active = False
-                    self.error_message = ""
+                    self.stop_mining()
                 else:
                     res = self.resource_under_drone(resources)
                     if res:
-                        self.mining = True
-                        self.mining_start_time = time.time()
-                        self.error_message = ""
-                        self.drone.mining_active = True
-                        self.current_resource = res
+                        self.start_mining(res)
                     else:
                         self.error_message = "No Resources to Mine"
 
             # Recharge Rover button
-            recharge_rect = pygame.Rect(self.x + 50, self.y + self.height - 115, self.width - 100, 45)
-            if recharge_rect.collidepoint(mx, my):
+            if self.recharge_rect.collidepoint(mx, my):
                 rover = self.rover_under_drone()
                 if rover:
-                    self.drone.recharging_rover = rover
+                    self.start_recharge(rover)
                     self.error_message = "Recharging Rover..."
                 else:
                     self.error_message = "No Rover Under Drone"
 
             # Refine Resources button
-            refine_rect = pygame.Rect(self.x + 50, self.y + self.height - 60, self.width - 100, 45)
-            if refine_rect.collidepoint(mx, my):
+            if self.refine_rect.collidepoint(mx, my):
                 self.refine_resources()
 
         return None
@@ -89,65 +99,113 @@ class DroneInventory:
     # Check rover under drone
     # -----------------------------
     def rover_under_drone(self):
-        drone_rect = pygame.Rect(self.drone.x - self.drone.radius, self.drone.y - self.drone.radius,
-                                 self.drone.radius * 2, self.drone.radius * 2)
+        drone_rect = self._probe()
+        rover_rect = self.rover_rect
         for rover in self.rovers:
-            rover_rect = pygame.Rect(rover.x - 10, rover.y - 10, 20, 20)
+            rover_rect.update(rover.x - 10, rover.y - 10, 20, 20)
             if drone_rect.colliderect(rover_rect):
                 return rover
         return None
 
+    def _probe(self):
+        radius = self.drone.radius
+        self.probe_rect.update(self.drone.x - radius, self.drone.y - radius, radius * 2, radius * 2)
+        return self.probe_rect
+
     # -----------------------------
     # Check resource under drone
     # -----------------------------
     def resource_under_drone(self, resources):
-        drone_rect = pygame.Rect(self.drone.x - self.drone.radius, self.drone.y - self.drone.radius,
-                                 self.drone.radius * 2, self.drone.radius * 2)
-        for res in resources:
-            for x, y in res.positions:
-                res_rect = pygame.Rect(x * 10, y * 10, 10, 10)
-                if drone_rect.colliderect(res_rect):
-                    self.current_resource = res
-                    return res
-        self.current_resource = None
-        return None
+        probe = self._probe()
+        self._probe_key = self._probe_state()
+        self.current_resource = deposit_under(resources, probe, self.tile_size,
+                                              self.fog.explored if self.fog else None)
+        return self.current_resource
+
+    def _probe_state(self):
+        # Changes only when the probe covers other tiles or the deposits change (the probe is always in sight)
+        return probe_tiles(self.probe_rect, self.tile_size), getattr(self.dashboard, "deposit_version", None)
 
     # -----------------------------
     # Update logic
     # -----------------------------
     def update(self, dt, resources):
-        self.resource_under_drone(resources)
-
-        # Power transfer to rover if active
-        if self.drone.recharging_rover:
+        # Without a timer wheel the power transfer and the mining intervals run off dt here
+        if self.timers is None and self.drone.recharging_rover:
             self.drone.transfer_power_to_rover(self.drone.recharging_rover, dt)
+        if self.timers is None and self.mining:
+            self._count_mining(dt)
 
-        # Stop mining if storage full
-        if self.drone.storage >= self.drone.storage_capacity:
-            self.mining = False
-            self.drone.mining_active = False
-            self.error_message = "Drone Storage is Full"
+        self._probe()
+        if self._probe_state() == self._probe_key:
             return
+        if not self.resource_under_drone(resources) and self.mining:
+            self.stop_mining("No Resources to Mine")
 
-        # Mining per interval
-        if self.mining and self.current_resource:
-            now = time.time()
-            elapsed = now - self.mining_start_time
-            if elapsed >= self.mine_interval:
-                remaining_space = self.drone.storage_capacity - self.drone.storage
-                if remaining_space > 0:
-                    self.drone.storage += 1
-                    res_type = self.current_resource.type.lower()
-                    self.drone.resources_held[res_type] = min(
-                        self.drone.resources_held.get(res_type, 0) + 1,
-                        self.drone.storage_capacity
-                    )
-                self.mining_start_time = time.time()
-
-            if not self.resource_under_drone(resources):
-                self.mining = False
-                self.drone.mining_active = False
-                self.error_message = "No Resources to Mine"
+    # -----------------------------
+    # Mining (one unit per mine_interval, completed by a timer or counted in update())
+    # -----------------------------
+    def start_mining(self, res):
+        self.mining = True
+        self.error_message = ""
+        self.drone.mining_active = True
+        self.current_resource = res
+        self.mining_elapsed = 0.0
+        self._schedule_mining()
+
+    def stop_mining(self, message=""):
+        self.mining = False
+        self.drone.mining_active = False
+        self.error_message = message
+        if self.mining_timer:
+            self.mining_timer.cancel()
+            self.mining_timer = None
+
+    def _schedule_mining(self):
+        if self.mining_timer:
+            self.mining_timer.cancel()
+        self.mining_timer = None
+        if self.timers is not None:
+            self.mining_timer = self.timers.schedule(self.mine_interval, self._mine_tick)
+
+    def _count_mining(self, dt):
+        self.mining_elapsed += dt
+        while self.mining and self.mining_elapsed >= self.mine_interval:
+            self.mining_elapsed -= self.mine_interval
+            self._mine_tick()
+
+    def _mine_tick(self):
+        self.mining_timer = None
+        if not (self.mining and self.current_resource):
+            return
+        remaining_space = self.drone.storage_capacity - self.drone.storage
+        if remaining_space > 0:
+            self.drone.load(self.current_resource.type.lower(), 1)
+        if not self._check_storage():
+            self._schedule_mining()
+
+    def _check_storage(self):
+        """Stop mining once storage is full; returns True if it is."""
+        if self.drone.storage >= self.drone.storage_capacity:
+            self.stop_mining("Drone Storage is Full")
+            return True
+        return False
+
+    # -----------------------------
+    # Rover recharge (stepped by a repeating timer)
+    # -----------------------------
+    def start_recharge(self, rover):
+        self.drone.recharging_rover = rover
+        if self.timers is not None and self.charge_timer is None:
+            self.charge_timer = self.timers.every(CHARGE_STEP, self._charge_step)
+
+    def _charge_step(self):
+        rover = self.drone.recharging_rover
+        if rover:
+            self.drone.transfer_power_to_rover(rover, CHARGE_STEP)
+        if not self.drone.recharging_rover:     # done, or cleared at the round change
+            self.charge_timer.cancel()
+            self.charge_timer = None
 
     # -----------------------------
     # Apply +2 mining per round
@@ -158,12 +216,8 @@ class DroneInventory:
             remaining_space = self.drone.storage_capacity - self.drone.storage
             gain = min(gain, remaining_space)
             if gain > 0:
-                self.drone.storage += gain
-                res_type = self.current_resource.type.lower()
-                self.drone.resources_held[res_type] = min(
-                    self.drone.resources_held.get(res_type, 0) + gain,
-                    self.drone.storage_capacity
-                )
+                self.drone.load(self.current_resource.type.lower(), gain)
+            self._check_storage()
 
     # -----------------------------
     # Refine resources over Vehicle Bay
@@ -173,8 +227,8 @@ class DroneInventory:
             self.error_message = "Cannot refine"
             return
 
-        gx = int(self.drone.x // 10)
-        gy = int(self.drone.y // 10)
+        gx = int(self.drone.x // self.tile_size)
+        gy = int(self.drone.y // self.tile_size)
         over_vb = False
         for b in self.building_manager.buildings:
             if b["type"] == "Vehicle Bay":
@@ -187,33 +241,41 @@ class DroneInventory:
             self.error_message = "Must be over Vehicle Bay"
             return
 
-        for res_type, amount in self.drone.resources_held.items():
+        for res_type, amount in self.drone.unload().items():
             key = res_type.lower()
             if key in ["iron", "marsium"]:
                 setattr(self.dashboard, key if key=="marsium" else "metals", getattr(self.dashboard, key if key=="marsium" else "metals") + amount)
             elif key == "ice":
                 self.dashboard.water += amount
 
-        self.drone.resources_held = {}
-        self.drone.storage = 0
         self.error_message = "Resources Refined!"
 
+    def panel_state(self):
+        drone = self.drone
+        return (round(drone.power), self.current_resource.type if self.current_resource else None,
+                drone.move_count, drone.max_moves, drone.storage, drone.storage_capacity,
+                tuple(drone.resources_held.items()), self.mining, self.error_message)
+
     # -----------------------------
     # Draw the inventory
     # -----------------------------
     def draw(self, screen, resources):
-        panel_rect = pygame.Rect(self.x, self.y, self.width, self.height)
+        state = self.panel_state()
+        if self.panel_cache.blit_cached(screen, state):
+            return
+
+        panel_rect = self.panel_rect
         pygame.draw.rect(screen, (0, 0, 0), panel_rect)
         pygame.draw.rect(screen, (255, 255, 255), panel_rect, 3)
 
         # Title
-        title_text = self.font.render("Drone Inventory", True, (255, 255, 255))
+        title_text = render_text(self.font, "Drone Inventory", (255, 255, 255))
         screen.blit(title_text, (self.x + (self.width - title_text.get_width()) // 2, self.y + 10))
 
         # X button
-        x_rect = pygame.Rect(self.x + self.width - 35, self.y + 5, 30, 30)
+        x_rect = self.x_rect
         pygame.draw.rect(screen, (255, 0, 0), x_rect)
-        x_text = self.font.render("X", True, (255, 255, 255))
+        x_text = render_text(self.font, "X", (255, 255, 255))
         screen.blit(x_text, (x_rect.x + (x_rect.width - x_text.get_width()) // 2,
                              x_rect.y + (x_rect.height - x_text.get_height()) // 2))
 
@@ -226,41 +288,43 @@ class DroneInventory:
             f"Drone Storage: {self.drone.storage}/{self.drone.storage_capacity}"
         ]
         for i, line in enumerate(lines):
-            txt = self.font.render(line, True, (255, 255, 255))
+            txt = render_text(self.font, line, (255, 255, 255))
             screen.blit(txt, (self.x + 20, self.y + 50 + i * 28))  # smaller spacing for clean layout
 
         # Held resources
         if self.drone.resources_held:
             y_offset = self.y + 50 + len(lines)*28 + 5
             for res_type, amt in self.drone.resources_held.items():
-                txt = self.font.render(f"+{amt} {res_type.capitalize()}", True, (0, 255, 0))
+                txt = render_text(self.font, f"+{amt} {res_type.capitalize()}", (0, 255, 0))
                 screen.blit(txt, (self.x + 40, y_offset))
                 y_offset += 28
 
         # Mine Button
-        mine_rect = pygame.Rect(self.x + 50, self.y + self.height - 170, self.width - 100, 45)
+        mine_rect = self.mine_rect
         pygame.draw.rect(screen, (0, 255, 0) if not self.mining else (255, 0, 0), mine_rect)
         mine_text = "Mine" if not self.mining else "Stop Mining"
-        txt = self.font.render(mine_text, True, (255, 255, 255))
+        txt = render_text(self.font, mine_text, (255, 255, 255))
         screen.blit(txt, (mine_rect.x + (mine_rect.width - txt.get_width()) // 2,
                           mine_rect.y + (mine_rect.height - txt.get_height()) // 2))
 
         # Recharge Rover Button
-        recharge_rect = pygame.Rect(self.x + 50, self.y + self.height - 115, self.width - 100, 45)
+        recharge_rect = self.recharge_rect
         pygame.draw.rect(screen, (100, 200, 255), recharge_rect)
-        txt = self.font.render("Recharge Rover", True, (0, 0, 0))
+        txt = render_text(self.font, "Recharge Rover", (0, 0, 0))
         screen.blit(txt, (recharge_rect.x + (recharge_rect.width - txt.get_width()) // 2,
                           recharge_rect.y + (recharge_rect.height - txt.get_height()) // 2))
 
         # Refine Resources Button
-        refine_rect = pygame.Rect(self.x + 50, self.y + self.height - 60, self.width - 100, 45)
+        refine_rect = self.refine_rect
         pygame.draw.rect(screen, (255, 200, 100), refine_rect)
-        txt = self.font.render("Refine", True, (0, 0, 0))
+        txt = render_text(self.font, "Refine", (0, 0, 0))
         screen.blit(txt, (refine_rect.x + (refine_rect.width - txt.get_width()) // 2,
                           refine_rect.y + (refine_rect.height - txt.get_height()) // 2))
 
         # Error Message
         if self.error_message:
-            err_txt = self.font.render(self.error_message, True, (255, 100, 100))
+            err_txt = render_text(self.font, self.error_message, (255, 100, 100))
             screen.blit(err_txt, (self.x + (self.width - err_txt.get_width()) // 2,
                                   self.y + self.height - 200))
+
+        self.panel_cache.store(screen, state)
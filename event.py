@@ -1,15 +1,18 @@
-import pygame
 import random
 import math
+from tracing import tracer
+from text_cache import get_font, render_text
 
 class EventManager:
-    def __init__(self, dashboard, width, height):
+    def __init__(self, dashboard, width, height, timers=None):
         self.dashboard = dashboard
+        self.timers = timers  # TimerWheel that ends the popup
         self.width = width
         self.height = height
         self.active_event = None
-        self.duration_frames = 120  # ~2 seconds
-        self.frames_left = 0
+        self.duration = 2.0  # seconds the popup stays up
+        self.popup_timer = None
+        self.time_left = 0.0  # popup countdown when there is no timer wheel
 
         # round timing
         self.last_event_round = 0
@@ -124,6 +127,7 @@ class EventManager:
         if candidates:
             to_remove = random.choice(candidates)
             deposits.remove(to_remove)
+            self.dashboard.deposits_changed(to_remove.positions)
             print(f"[Avalanche] Removed a {to_remove.type} deposit near mountains.")
         else:
             print("[Avalanche] No nearby mountain deposits found to remove.")
@@ -177,6 +181,7 @@ class EventManager:
                 ) if 0 <= x+dx < cols and 0 <= y+dy < rows]
 
                 deposits.append(ResourceDeposit(resource_type, patch, color))
+                self.dashboard.deposits_changed(patch)
 
             print("[Volcanic Eruption] New visible resources have appeared!")
 
@@ -242,11 +247,15 @@ class EventManager:
 
         # Add brown border rim around crater
         rim_color = (120, 80, 40)
+        rim_positions = []
         for (x, y) in crater_positions:
             for dx, dy in [(-1,0),(1,0),(0,-1),(0,1)]:
                 nx, ny = x + dx, y + dy
                 if (nx, ny) not in crater_positions and 0 <= nx < cols and 0 <= ny < rows:
                     deposits.append(ResourceDeposit("rock", [(nx, ny)], rim_color))
+                    rim_positions.append((nx, ny))
+        self.dashboard.deposits_changed(crater_positions + rim_positions)
+        self.dashboard.terrain_changed(crater_positions)
 
         print(f"[Meteorite Impact] Small meteorite crater created at ({cx}, {cy}).")
 
@@ -255,40 +264,62 @@ class EventManager:
     # -------------------------------
     # EVENT LOGIC
     # -------------------------------
-    def update(self, current_round):
+    def update(self, current_round, dt=1 / 60):
         if self.active_event is None and current_round - self.last_event_round >= self.event_interval:
             self.trigger_event()
             self.last_event_round = current_round
 
-        if self.active_event:
-            self.frames_left -= 1
-            if self.frames_left <= 0:
-                self.active_event = None
+        # Without a timer wheel the popup counts down here
+        if self.timers is None and self.active_event:
+            self.time_left -= dt
+            if self.time_left <= 0:
+                self._end_event()
 
     def trigger_event(self):
         self.active_event = random.choice(self.events)
-        self.active_event["effect"]()
-        self.frames_left = self.duration_frames
+        effect = self.active_event["effect"]
+        with tracer.span(effect.__name__, "event"):
+            effect()
+        if self.popup_timer:
+            self.popup_timer.cancel()
+        self.popup_timer = None
+        if self.timers is not None:
+            self.popup_timer = self.timers.schedule(self.duration, self._end_event)
+        else:
+            self.time_left = self.duration
+
+    def _end_event(self):
+        self.popup_timer = None
+        self.active_event = None
 
     # -------------------------------
     # DRAW POPUP
     # -------------------------------
+    def popup_lines(self):
+        """Title and description of the active event (empty while none is shown)."""
+        if not self.active_event:
+            return ()
+        return (self.active_event["title"],) + tuple(self.active_event["description"])
+
+    def popup_bounds(self, lines):
+        """Screen area draw() touches for `lines`, or None when there is nothing to show."""
+        bounds = None
+        for _, rect in self._line_surfaces(lines):
+            bounds = rect if bounds is None else bounds.union(rect)
+        return bounds
+
+    def _line_surfaces(self, lines):
+        font = get_font(None, 40, bold=True)
+        start_y = (self.height - len(lines) * 50) // 2
+        for i, line in enumerate(lines):
+            # Outline is pre-composited and pads the surface by 2px on each side
+            text_surface = render_text(font, line, (255, 0, 0), (0, 0, 0), 2)
+            topleft = (self.width // 2 - text_surface.get_width() // 2, start_y + i * 50 - 2)
+            yield text_surface, text_surface.get_rect(topleft=topleft)
+
     def draw(self, screen):
         if not self.active_event:
             return
 
-        font = pygame.font.SysFont(None, 40, bold=True)
-        lines = [self.active_event["title"]] + self.active_event["description"]
-        total_height = len(lines) * 50
-        start_y = (self.height - total_height) // 2
-
-        for i, line in enumerate(lines):
-            text_surface = font.render(line, True, (255, 0, 0))
-            for dx in [-2, 0, 2]:
-                for dy in [-2, 0, 2]:
-                    if dx or dy:
-                        outline = font.render(line, True, (0, 0, 0))
-                        screen.blit(outline, (self.width // 2 - text_surface.get_width() // 2 + dx,
-                                              start_y + i * 50 + dy))
-            screen.blit(text_surface, (self.width // 2 - text_surface.get_width() // 2,
-                                       start_y + i * 50))
+        for text_surface, rect in self._line_surfaces(self.popup_lines()):
+            screen.blit(text_surface, rect)
@@ -0,0 +1,162 @@
+# fog.py
+import numpy as np
+import pygame
+
+COLORKEY = (255, 0, 255)
+FOG_COLOR = (0, 0, 0)
+MAX_DAMAGE = 64     # damage entries kept before they are merged into one
+
+
+def disc_offsets(radius):
+    """(dy, dx) arrays of every tile within `radius` tiles of the centre."""
+    r = np.arange(-radius, radius + 1)
+    dy, dx = np.meshgrid(r, r, indexing="ij")
+    inside = dx * dx + dy * dy <= radius * radius
+    return dy[inside], dx[inside]
+
+
+def step_offsets(radius, sx, sy):
+    """
+    For a centre that moved one step by (sx, sy): the (dy, dx) offsets, relative
+    to the new centre, of the tiles that entered and that left the disc.
+    """
+    disc = set(zip(*(a.tolist() for a in disc_offsets(radius))))
+    old = {(dy - sy, dx - sx) for dy, dx in disc}   # the old disc seen from the new centre
+    entered = sorted(disc - old)
+    left = sorted(old - disc)
+    return (np.array([p[0] for p in entered], dtype=int), np.array([p[1] for p in entered], dtype=int),
+            np.array([p[0] for p in left], dtype=int), np.array([p[1] for p in left], dtype=int))
+
+
+class FogOfWar:
+    def __init__(self, cols, rows, tile_size, radius=6):
+        """
+        What the colony has explored and what it can see right now, per tile.
+
+        `explored` is a uint8 raster (1 = seen at least once) and `visible`
+        counts how many sight sources currently cover each tile (uint16, so a
+        crowd of units on one spot cannot wrap it). A source is remembered at
+        the tile it was last stamped on; moving it within that tile costs
+        nothing, and a one-tile step only touches the tiles entering and
+        leaving its disc. `version` changes when new tiles get explored,
+        `visible_version` on any change of `visible`.
+        """
+        self.cols = cols
+        self.rows = rows
+        self.tile_size = tile_size
+        self.radius = radius
+        self.explored = np.zeros((rows, cols), dtype=np.uint8)
+        self.visible = np.zeros((rows, cols), dtype=np.uint16)
+        self.version = 0
+        self.visible_version = 0
+        self._sources = {}          # key -> (tx, ty, radius)
+        self._discs = {}            # radius -> disc_offsets
+        self._steps = {}            # (radius, sx, sy) -> step_offsets
+        self._damage = []           # tile bounds (x0, y0, x1, y1) explored since take_damage()
+
+    # -----------------------------
+    # Sight sources
+    # -----------------------------
+    def move(self, key, x, y, radius=None):
+        """Put sight source `key` at world pixel (x, y); only tile changes cost anything."""
+        radius = self.radius if radius is None else radius
+        tile = (int(x) // self.tile_size, int(y) // self.tile_size, radius)
+        previous = self._sources.get(key)
+        if previous == tile:
+            return
+        self._sources[key] = tile
+        tx, ty, _ = tile
+        step = None if previous is None or previous[2] != radius else (radius, tx - previous[0], ty - previous[1])
+        if step and abs(step[1]) <= 1 and abs(step[2]) <= 1:
+            offsets = self._steps.get(step)
+            if offsets is None:
+                # All eight steps of a new radius at once; they're needed sooner or later
+                for sx in (-1, 0, 1):
+                    for sy in (-1, 0, 1):
+                        self._steps[(radius, sx, sy)] = step_offsets(radius, sx, sy)
+                offsets = self._steps[step]
+            entered_y, entered_x, left_y, left_x = offsets
+            self._add(tx, ty, left_y, left_x, -1)
+            self._add(tx, ty, entered_y, entered_x, 1)
+        else:
+            if previous is not None:
+                self._add(previous[0], previous[1], *self._disc(previous[2]), -1)
+            self._add(tx, ty, *self._disc(radius), 1)
+
+    def remove(self, key):
+        previous = self._sources.pop(key, None)
+        if previous is not None:
+            self._add(previous[0], previous[1], *self._disc(previous[2]), -1)
+
+    def update(self, units):
+        """Follow the units' positions (each with its own `sight` radius)."""
+        for u in units:
+            self.move(u, u.x, u.y, getattr(u, "sight", None))
+
+    def _disc(self, radius):
+        disc = self._discs.get(radius)
+        if disc is None:
+            disc = self._discs[radius] = disc_offsets(radius)
+        return disc
+
+    def _add(self, tx, ty, dy, dx, amount):
+        ys, xs = ty + dy, tx + dx
+        inside = (xs >= 0) & (xs < self.cols) & (ys >= 0) & (ys < self.rows)
+        ys, xs = ys[inside], xs[inside]
+        if not len(ys):
+            return
+        self.visible_version += 1
+        if amount < 0:
+            self.visible[ys, xs] -= 1
+            return
+        self.visible[ys, xs] += 1
+        new = self.explored[ys, xs] == 0
+        if new.any():
+            ys, xs = ys[new], xs[new]
+            self.explored[ys, xs] = 1
+            self.version += 1
+            self._damage.append((int(xs.min()), int(ys.min()), int(xs.max()) + 1, int(ys.max()) + 1))
+            if len(self._damage) > MAX_DAMAGE:
+                # Nobody is taking the damage (e.g. a headless run); keep just its bounds
+                x0s, y0s, x1s, y1s = zip(*self._damage)
+                self._damage = [(min(x0s), min(y0s), max(x1s), max(y1s))]
+
+    # -----------------------------
+    # Queries
+    # -----------------------------
+    def is_explored(self, tx, ty):
+        return 0 <= tx < self.cols and 0 <= ty < self.rows and bool(self.explored[ty, tx])
+
+    def is_visible(self, tx, ty):
+        return 0 <= tx < self.cols and 0 <= ty < self.rows and bool(self.visible[ty, tx])
+
+    def take_damage(self):
+        """
+        World pixel Rects around the tiles explored since the last call, one
+        per step that explored something; kept apart so units exploring at
+        opposite ends of the map don't damage everything in between.
+        """
+        ts = self.tile_size
+        damage = [pygame.Rect(x0 * ts, y0 * ts, (x1 - x0) * ts, (y1 - y0) * ts) for x0, y0, x1, y1 in self._damage]
+        self._damage = []
+        return damage
+
+    # -----------------------------
+    # Drawing
+    # -----------------------------
+    def draw(self, surface, area=None):
+        """Cover the unexplored tiles overlapping the pixel Rect `area` (None = all) with FOG_COLOR."""
+        ts = self.tile_size
+        x0, y0, x1, y1 = 0, 0, self.cols, self.rows
+        if area is not None:
+            x0, y0 = max(area.left // ts, 0), max(area.top // ts, 0)
+            x1, y1 = min(-(-area.right // ts), self.cols), min(-(-area.bottom // ts), self.rows)
+        if x1 <= x0 or y1 <= y0:
+            return
+        # One pixel per tile, coloured in one go and scaled up
+        window = self.explored[y0:y1, x0:x1].T
+        colors = np.empty(window.shape + (3,), dtype=np.uint8)
+        colors[...] = FOG_COLOR
+        colors[window != 0] = COLORKEY
+        tiles = pygame.surfarray.make_surface(colors)
+        surface.blit(pygame.transform.scale(tiles, ((x1 - x0) * ts, (y1 - y0) * ts)), (x0 * ts, y0 * ts))
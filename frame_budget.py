@@ -0,0 +1,246 @@
+# frame_budget.py
+"""
+Scenario-based frame-budget regression harness.
+
+Builds production-like game states programmatically and drives N frames of
+GameSession's update + draw headless, failing (exit code 1) when the p50 or
+p99 frame time goes over budget.
+
+Usage:
+    python frame_budget.py                              # all scenarios, 300 frames each
+    python frame_budget.py --scenario colony --frames 600
+    python frame_budget.py --p50-ms 8 --p99-ms 20 --output frames.json
+"""
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import argparse
+import json
+import random
+import statistics
+import sys
+import time
+from collections import deque
+
+import pygame
+
+import main as game
+from main import GameSession, TILE_SIZE, COLS, ROWS
+from rover import Rover
+from farm_inventory import FarmInventory
+from power_generator import PowerGenerator
+from frame_timer import FrameTimer
+from tracing import tracer
+
+DT = 1 / 60
+
+
+# ---------------- State builders ---------------- #
+def build_colony(session, count, size=(2, 2)):
+    """Grow a lattice of `count` buildings out from the base through BuildingManager.add_building."""
+    manager = session.building_manager
+    base = session.base
+    step = size[0] + 1
+    x0 = (base.x - base.size // 2 + base.size + 1) % step
+    y0 = (base.y - base.size // 2) % step
+    types = ["Power Generator", "Housing", "Farm", "Vehicle Bay"]
+
+    candidates = [(x, y) for x in range(x0, COLS - size[0], step)
+                  for y in range(y0, ROWS - size[1], step)]
+    candidates.sort(key=lambda p: (p[0] - base.x) ** 2 + (p[1] - base.y) ** 2)
+
+    placed = 0
+    while placed < count:
+        added_this_pass = 0
+        for gx, gy in candidates:
+            if placed >= count:
+                break
+            b_type = types[placed % len(types)]
+            obj = PowerGenerator(gx=gx, gy=gy) if b_type == "Power Generator" else None
+            building = manager.add_building(gx, gy, size=size, b_type=b_type, obj=obj)
+            if building:
+                if b_type == "Farm":
+                    farm = FarmInventory(building, session.dashboard, session.totals)
+                    farm.set_growing(True)
+                    building["object"] = farm
+                placed += 1
+                added_this_pass += 1
+        if not added_this_pass:
+            break
+    return placed
+
+
+def add_units(session, count, mining_share=0.8):
+    """Add rovers and drones; most of them sit on a deposit mining, the rest travel."""
+    tiles = [pos for res in session.resources for pos in res.positions]
+    for i in range(count):
+        if tiles and random.random() < mining_share:
+            tx, ty = random.choice(tiles)
+            x, y = tx * TILE_SIZE + TILE_SIZE // 2, ty * TILE_SIZE + TILE_SIZE // 2
+        else:
+            x, y = random.randint(0, COLS * TILE_SIZE - 1), random.randint(0, ROWS * TILE_SIZE - 1)
+        unit = session.add_rover(x, y) if i % 2 == 0 else session.add_drone(x, y)
+
+        inventory = unit.inventory
+        if isinstance(unit, Rover):
+            under = inventory.resource_under_rover(session.resources)
+        else:
+            under = inventory.resource_under_drone(session.resources)
+        if under:
+            inventory.start_mining(under)
+        else:
+            unit.set_target((random.randint(0, COLS * TILE_SIZE - 1), random.randint(0, ROWS * TILE_SIZE - 1)))
+
+
+def meteorite_storm(session, impacts):
+    for _ in range(impacts):
+        session.event_manager.apply_meteorite_impact()
+
+
+# ---------------- Scenarios ---------------- #
+def scenario_colony(session):
+    build_colony(session, 200)
+    add_units(session, 500)
+    return None
+
+
+def scenario_meteorite_storm(session):
+    meteorite_storm(session, 40)
+    add_units(session, 100)
+    return None
+
+
+def scenario_placement_ghost(session):
+    build_colony(session, 200)
+    session.placing_building = "Housing"
+    base = session.base
+    cx, cy = base.x * TILE_SIZE, base.y * TILE_SIZE
+
+    def hover(frame):
+        # Sweep the cursor back and forth over the dense part of the base (mouse positions are screen pixels)
+        return session.camera.to_screen((max(0, min(COLS * TILE_SIZE - 1, cx + (frame * 7) % 300 - 150)),
+                                         max(0, min(ROWS * TILE_SIZE - 1, cy + (frame * 3) % 200 - 100))))
+    return hover
+
+
+SCENARIOS = {
+    "colony": scenario_colony,
+    "meteorite_storm": scenario_meteorite_storm,
+    "placement_ghost": scenario_placement_ghost,
+}
+
+
+# ---------------- Runner ---------------- #
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def run_scenario(name, frames, warmup, seed, round_every=0, profile=None, allocations=False, full_redraw=False):
+    random.seed(seed)
+    game.init_display()
+    session = GameSession()
+    mouse_at = SCENARIOS[name](session)
+    timer = session.frame_timer = FrameTimer(history=frames, enabled=True, allocations=session.allocations)
+    if allocations:
+        session.allocations.frames = deque(maxlen=frames)
+        session.allocations.enable()
+    if profile:
+        session.profiler.out_dir = profile.pop("out_dir")
+        session.profiler.request(**profile)
+
+    frame_ms = []
+    for frame in range(warmup + frames):
+        mouse_pos = mouse_at(frame) if mouse_at else (0, 0)
+        if round_every and frame and frame % round_every == 0:
+            session.advance_round()
+        start = time.perf_counter_ns()
+        session.begin_frame()
+        with tracer.span("frame"):
+            with tracer.span("input"):
+                session.process_events(pygame.event.get())
+            with tracer.span("update"):
+                session.update(DT)
+            with tracer.span("draw"):
+                if full_redraw:
+                    session.compositor.dirty.invalidate()
+                game.present(session.draw(game.screen, mouse_pos, DT))
+        session.end_frame()
+        if frame >= warmup:
+            frame_ms.append((time.perf_counter_ns() - start) / 1e6)
+    session.profiler.stop()
+    if allocations:
+        print(session.allocations.report())
+        session.allocations.disable()
+
+    return {
+        "frames": frames,
+        "units": len(session.units),
+        "buildings": len(session.building_manager.buildings),
+        "deposits": len(session.resources),
+        "p50_ms": round(percentile(frame_ms, 50), 3),
+        "p99_ms": round(percentile(frame_ms, 99), 3),
+        "max_ms": round(max(frame_ms), 3),
+        "mean_ms": round(statistics.fmean(frame_ms), 3),
+        "phase_mean_ms": {phase: round(mean, 3) for phase, (mean, _) in timer.summary().items()},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Frame-budget regression harness")
+    parser.add_argument("--scenario", choices=sorted(SCENARIOS), action="append",
+                        help="scenario to run (repeatable, default: all)")
+    parser.add_argument("--frames", type=int, default=300, help="measured frames per scenario")
+    parser.add_argument("--warmup", type=int, default=30, help="unmeasured frames before timing")
+    parser.add_argument("--p50-ms", type=float, default=16.7, help="budget for the median frame time")
+    parser.add_argument("--p99-ms", type=float, default=33.3, help="budget for the 99th percentile frame time")
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--round-every", type=int, default=0,
+                        help="advance the round every N frames (0 keeps round 1)")
+    parser.add_argument("--output", default=None, help="optional JSON file for the results")
+    parser.add_argument("--profile-frames", type=int, default=0, help="cProfile this many frames per scenario")
+    parser.add_argument("--profile-rounds", type=int, default=0, help="cProfile this many rounds per scenario")
+    parser.add_argument("--profile-start-round", type=int, default=None, help="delay the capture until this round")
+    parser.add_argument("--profile-dir", default="profiles", help="directory for .pstats files")
+    parser.add_argument("--allocations", action="store_true",
+                        help="account allocations per phase with tracemalloc (timings become meaningless)")
+    parser.add_argument("--full-redraw", action="store_true",
+                        help="redraw and flip the whole screen every frame (disables dirty rects)")
+    parser.add_argument("--trace", default=None, metavar="DIR",
+                        help="write a Chrome trace JSON per scenario into DIR")
+    args = parser.parse_args()
+
+    results = {}
+    failed = []
+    for name in args.scenario or sorted(SCENARIOS):
+        profile = None
+        if args.profile_frames or args.profile_rounds:
+            profile = dict(out_dir=os.path.join(args.profile_dir, name), frames=args.profile_frames,
+                           rounds=args.profile_rounds, start_round=args.profile_start_round)
+        if args.trace:
+            tracer.start()
+        r = run_scenario(name, args.frames, args.warmup, args.seed, args.round_every, profile, args.allocations,
+                         args.full_redraw)
+        if args.trace:
+            tracer.stop(os.path.join(args.trace, f"{name}.json"))
+        r["over_budget"] = r["p50_ms"] > args.p50_ms or r["p99_ms"] > args.p99_ms
+        results[name] = r
+        status = "FAIL" if r["over_budget"] else "ok"
+        print(f"{name:<18} p50 {r['p50_ms']:8.2f} ms  p99 {r['p99_ms']:8.2f} ms  "
+              f"({r['units']} units, {r['buildings']} buildings, {r['deposits']} deposits)  {status}")
+        print("    " + "  ".join(f"{phase} {ms:.2f}" for phase, ms in r["phase_mean_ms"].items()))
+        if r["over_budget"]:
+            failed.append(name)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"budget": {"p50_ms": args.p50_ms, "p99_ms": args.p99_ms}, "results": results}, f, indent=2)
+
+    if failed:
+        print(f"Over budget: {', '.join(failed)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
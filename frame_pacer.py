@@ -0,0 +1,47 @@
+# frame_pacer.py
+import pygame
+
+
+class FramePacer:
+    def __init__(self, fps=60, idle_fps=4, idle_after_ms=1000):
+        """
+        Frame pacing that backs off while nothing is happening.
+
+        Runs at `fps` while the session is busy. Once it has reported itself
+        quiescent for `idle_after_ms` (no unit moved, no popup or message)
+        and no input arrived, frames block in pygame.event.wait() for up to
+        1/idle_fps seconds instead of spinning, so an idle window costs
+        almost no CPU. Any input ends the wait immediately and puts the
+        pacer back at full rate. dt is always the real time since the last
+        frame, so time-based simulation (generator charge, timers) is
+        unaffected.
+        """
+        self.fps = fps
+        self.idle_timeout_ms = int(1000 / idle_fps)
+        self.idle_after_ms = idle_after_ms
+        self.clock = pygame.time.Clock()
+        self.quiet_since = None   # pygame ticks when the session last went quiet
+        self.idle = False
+
+    def next_frame(self, quiescent):
+        """Wait until the next frame is due; returns (dt seconds, pending events)."""
+        now = pygame.time.get_ticks()
+        if not quiescent:
+            self.quiet_since = None
+        elif self.quiet_since is None:
+            self.quiet_since = now
+        self.idle = self.quiet_since is not None and now - self.quiet_since >= self.idle_after_ms
+
+        if self.idle:
+            event = pygame.event.wait(self.idle_timeout_ms)
+            events = [] if event.type == pygame.NOEVENT else [event]
+            events += pygame.event.get()
+            dt = self.clock.tick() / 1000
+        else:
+            dt = self.clock.tick(self.fps) / 1000
+            events = pygame.event.get()
+
+        if events:
+            self.quiet_since = None
+            self.idle = False
+        return dt, events
@@ -0,0 +1,130 @@
+# frame_timer.py
+import time
+import pygame
+from text_cache import get_font
+
+PHASES = ("events", "movement", "recharge", "inventories", "terrain", "world", "ui")
+
+
+class FrameTimer:
+    def __init__(self, history=120, enabled=False, allocations=None):
+        """
+        Per-phase frame timing kept in ring buffers of the last `history` frames.
+
+        Usage inside the loop:
+            t = timer.start()
+            ... phase work ...
+            timer.stop("movement", t)
+        When disabled, start() returns 0 and stop() returns immediately.
+        An AllocationTracker passed as `allocations` is fed the same phases.
+        """
+        self.enabled = enabled
+        self.allocations = allocations
+        self.history = history
+        self.samples = {phase: [0] * history for phase in PHASES + ("frame",)}
+        self.index = 0
+        self.filled = 0
+        self._current = dict.fromkeys(PHASES, 0)
+        self._frame_start = 0
+
+    # -----------------------------
+    # Recording
+    # -----------------------------
+    def start(self):
+        if not self.enabled:
+            return 0
+        if self.allocations and self.allocations.enabled:
+            self.allocations.phase_start()
+        return time.perf_counter_ns()
+
+    def stop(self, phase, started):
+        # started == 0 means the phase began while disabled (e.g. toggled mid-frame)
+        if self.enabled and started:
+            self._current[phase] += time.perf_counter_ns() - started
+            if self.allocations and self.allocations.enabled:
+                self.allocations.phase_stop(phase)
+
+    def begin_frame(self):
+        if self.enabled:
+            self._frame_start = time.perf_counter_ns()
+
+    def end_frame(self):
+        if not self.enabled:
+            return
+        i = self.index
+        for phase, ns in self._current.items():
+            self.samples[phase][i] = ns
+            self._current[phase] = 0
+        self.samples["frame"][i] = time.perf_counter_ns() - self._frame_start
+        self.index = (i + 1) % self.history
+        self.filled = min(self.filled + 1, self.history)
+        if self.allocations and self.allocations.enabled:
+            self.allocations.end_frame()
+
+    def toggle(self):
+        self.enabled = not self.enabled
+        self.index = 0
+        self.filled = 0
+        self._current = dict.fromkeys(PHASES, 0)
+        self._frame_start = time.perf_counter_ns()
+
+    # -----------------------------
+    # Stats
+    # -----------------------------
+    def stats(self, phase):
+        """Return (mean_ms, p99_ms) over the recorded frames."""
+        if not self.filled:
+            return 0.0, 0.0
+        values = sorted(self.samples[phase][:self.filled])
+        mean = sum(values) / len(values)
+        p99 = values[min(len(values) - 1, int(len(values) * 0.99))]
+        return mean / 1e6, p99 / 1e6
+
+    def summary(self):
+        return {phase: self.stats(phase) for phase in PHASES + ("frame",)}
+
+
+class FrameTimerOverlay:
+    def __init__(self, timer, refresh_frames=15):
+        """
+        Debug overlay showing rolling per-phase mean/p99 and entity counts (toggle with F3).
+        While allocation accounting is on (F4) it adds transient KB and net blocks per phase.
+        """
+        self.timer = timer
+        self.refresh_frames = refresh_frames
+        self.font = get_font("Consolas", 16)
+        self.frames_since_refresh = refresh_frames
+        self.panel = None
+
+    def draw(self, screen, counts):
+        self.refresh(counts)
+        screen.blit(self.panel, self.panel_rect(screen.get_height()))
+
+    def panel_rect(self, screen_height):
+        return self.panel.get_rect(bottomleft=(10, screen_height - 10))
+
+    def refresh(self, counts):
+        """Re-render the panel Surface when due; a new Surface means new contents."""
+        # Re-render text a few times per second; the numbers are rolling averages anyway
+        self.frames_since_refresh += 1
+        if self.panel is None or self.frames_since_refresh >= self.refresh_frames:
+            self.frames_since_refresh = 0
+            allocations = self.timer.allocations
+            alloc = allocations.summary() if allocations and allocations.enabled else None
+            text = [f"{'phase':<12}{'mean':>8}{'p99':>8}" + (f"{'KB':>9}{'blocks':>8}" if alloc else "")]
+            for phase, (mean, p99) in self.timer.summary().items():
+                line = f"{phase:<12}{mean:>8.2f}{p99:>8.2f}"
+                if alloc and phase in alloc:
+                    transient, _, blocks, _ = alloc[phase]
+                    line += f"{transient / 1024:>9.1f}{blocks:>8.1f}"
+                text.append(line)
+            text.append("  ".join(f"{name}: {value}" for name, value in counts.items()))
+            lines = [self.font.render(line, True, (255, 255, 255)) for line in text]
+
+            line_height = self.font.get_height() + 2
+            width = max(s.get_width() for s in lines) + 16
+            height = len(lines) * line_height + 12
+            self.panel = pygame.Surface((width, height), pygame.SRCALPHA)
+            self.panel.fill((0, 0, 0, 180))
+            for i, surf in enumerate(lines):
+                self.panel.blit(surf, (8, 6 + i * line_height))
@@ -1,4 +1,7 @@
 import pygame
+from text_cache import get_font, render_text
+from panel_cache import PanelCache
+from aggregates import housing_capacity
 
 class HousingInventory:
     def __init__(self, building, dashboard=None):
@@ -8,21 +11,25 @@ class HousingInventory:
         self.height = 200
         self.x = (1280 - self.width) // 2
         self.y = (720 - self.height) // 2
-        self.font = pygame.font.SysFont("Arial", 24, bold=True)
+        self.font = get_font("Arial", 24, bold=True)
         self.error_message = ""
 
+        # Buttons (panel position is fixed, so build the Rects once)
+        self.panel_rect = pygame.Rect(self.x, self.y, self.width, self.height)
+        self.panel_cache = PanelCache(self.panel_rect)
+        self.x_rect = pygame.Rect(self.x + self.width - 35, self.y + 5, 30, 30)
+        self.upgrade_rect = pygame.Rect(self.x + 50, self.y + self.height - 70, self.width - 100, 50)
+
     def handle_event(self, event):
         if event.type == pygame.MOUSEBUTTONDOWN:
             mx, my = event.pos
 
             # X button
-            x_rect = pygame.Rect(self.x + self.width - 35, self.y + 5, 30, 30)
-            if x_rect.collidepoint(mx, my):
+            if self.x_rect.collidepoint(mx, my):
                 return "close"
 
             # Upgrade button
-            upgrade_rect = pygame.Rect(self.x + 50, self.y + self.height - 70, self.width - 100, 50)
-            if upgrade_rect.collidepoint(mx, my):
+            if self.upgrade_rect.collidepoint(mx, my):
                 self.error_message = "Upgrade feature not implemented yet"
         return None
 
@@ -30,42 +37,51 @@ class HousingInventory:
         # Nothing dynamic for now
         pass
 
+    def panel_state(self):
+        return (housing_capacity(self.building), getattr(self.building, "occupants", 5),
+                self.error_message)
+
     def draw(self, screen):
+        state = self.panel_state()
+        if self.panel_cache.blit_cached(screen, state):
+            return
+
         # Panel
-        panel_rect = pygame.Rect(self.x, self.y, self.width, self.height)
+        panel_rect = self.panel_rect
         pygame.draw.rect(screen, (0, 0, 0), panel_rect)
         pygame.draw.rect(screen, (255, 255, 255), panel_rect, 3)
 
         # Title
-        title_text = self.font.render("Housing Inventory", True, (255, 255, 255))
+        title_text = render_text(self.font, "Housing Inventory", (255, 255, 255))
         screen.blit(title_text, (self.x + (self.width - title_text.get_width()) // 2, self.y + 10))
 
         # X button
-        x_rect = pygame.Rect(self.x + self.width - 35, self.y + 5, 30, 30)
+        x_rect = self.x_rect
         pygame.draw.rect(screen, (255, 0, 0), x_rect)
-        x_text = self.font.render("X", True, (255, 255, 255))
+        x_text = render_text(self.font, "X", (255, 255, 255))
         screen.blit(x_text, (x_rect.x + (x_rect.width - x_text.get_width()) // 2,
                              x_rect.y + (x_rect.height - x_text.get_height()) // 2))
 
         # Housing info
-        housing_capacity = getattr(self.building, "capacity", 10)
         current_occupants = getattr(self.building, "occupants", 5)
         lines = [
-            f"Housing Space: {current_occupants}/{housing_capacity}"
+            f"Housing Space: {current_occupants}/{housing_capacity(self.building)}"
         ]
         for i, line in enumerate(lines):
-            txt = self.font.render(line, True, (255, 255, 255))
+            txt = render_text(self.font, line, (255, 255, 255))
             screen.blit(txt, (self.x + 20, self.y + 50 + i * 30))
 
         # Upgrade button
-        upgrade_rect = pygame.Rect(self.x + 50, self.y + self.height - 70, self.width - 100, 50)
+        upgrade_rect = self.upgrade_rect
         pygame.draw.rect(screen, (0, 255, 0), upgrade_rect)
-        upgrade_text = self.font.render("Upgrade", True, (255, 255, 255))
+        upgrade_text = render_text(self.font, "Upgrade", (255, 255, 255))
         screen.blit(upgrade_text, (upgrade_rect.x + (upgrade_rect.width - upgrade_text.get_width()) // 2,
                                    upgrade_rect.y + (upgrade_rect.height - upgrade_text.get_height()) // 2))
 
         # Error message
         if self.error_message:
-            err_txt = self.font.render(self.error_message, True, (255, 100, 100))
+            err_txt = render_text(self.font, self.error_message, (255, 100, 100))
             screen.blit(err_txt, (self.x + (self.width - err_txt.get_width()) // 2,
                                   upgrade_rect.y - 35))
+
+        self.panel_cache.store(screen, state)
@@ -1,460 +1,949 @@
+import sys
+from startup import startup_timer
+startup_timer.enable_from_argv(sys.argv)  # before the other imports so they are timed
+
+import argparse
 import pygame
 from building_manager import BuildingManager
 from rover import Rover
 from drone import Drone
-from terrain import generate_noise_map, draw_terrain
+from terrain import draw_terrain
+from compositor import Compositor, StaticLayer
+from unit_sprites import SpriteAtlas
 from dashboard import Dashboard
-from event import EventManager
-from building import Base
 from menu import Menu
-from resources import ResourceDeposit
-from rover_inventory import RoverInventory
-from drone_inventory import DroneInventory
-from base_inventory import BaseInventory
-from vehicle_bay_inventory import VehicleBayInventory
-from power_generator_inventory import PowerGeneratorInventory
-from power_generator import PowerGenerator
-from housing_inventory import HousingInventory
-from farm_inventory import FarmInventory
-
-pygame.font.init()
-pygame.init()
+from world_gen import generate_world, WorldGenerator
+from frame_timer import FrameTimer, FrameTimerOverlay
+from alloc_tracker import AllocationTracker
+from profiler import SessionProfiler
+from tracing import tracer
+from text_cache import get_font, render_text
+from ui_router import UIRouter
+from frame_pacer import FramePacer
+from camera import Camera
+from minimap import Minimap
+from fog import FogOfWar
+from timers import TimerWheel
+from construction import ConstructionScheduler
+from aggregates import ColonyTotals
+# Inventory, event and power generator modules are imported where first used,
+# so none of them are loaded before the menu is on screen.
 
 # ---------------- Window setup ---------------- #
 WIDTH, HEIGHT = 1280, 720
 TILE_SIZE = 10
-COLS = WIDTH // TILE_SIZE
-ROWS = HEIGHT // TILE_SIZE
-
-screen = pygame.display.set_mode((WIDTH, HEIGHT))
-pygame.display.set_caption("Mars Colony Simulator - Top-Down Mars Terrain")
-
-
-def game_loop():
-    noise_map = generate_noise_map(ROWS, COLS)
-    base = Base.spawn(noise_map, COLS, ROWS, TILE_SIZE)
-    building_manager = BuildingManager(noise_map)
-
-    # Filter resources outside base
-    all_resources = ResourceDeposit.spawn_resources(noise_map, COLS, ROWS, TILE_SIZE)
-    resources = []
-    half = base.size // 2
-    base_rect = pygame.Rect((base.x - half) * TILE_SIZE - 5,
-                            (base.y - half) * TILE_SIZE - 5,
-                            base.size * TILE_SIZE + 10,
-                            base.size * TILE_SIZE + 10)
-
-    for res in all_resources:
-        filtered_positions = [(x, y) for x, y in res.positions
-                              if not base_rect.collidepoint(x * TILE_SIZE, y * TILE_SIZE)]
-        if filtered_positions:
-            res.positions = filtered_positions
-            resources.append(res)
-
-    building_manager.set_resources(resources)
-    building_manager.set_base(base)
-
-    # --- Units ---
-    units = []
-    selected_unit = None
-
-    # --- Inventories ---
-    open_unit_inventory = None
-    show_base_inventory = False
-    base_inventory = BaseInventory(base, None)
-    show_vehicle_inventory = False
-    vehicle_inventory = None
-    show_power_inventory = False
-    power_inventory = None
-    show_housing_inventory = False
-    housing_inventory = None
-    show_farm_inventory = False
-    farm_inventory = None
-
-    bottom_right_message = ""
-    message_timer = 0
-    placing_building = None
-    ignore_next_click = False
-    rotate_pressed_last_frame = False
-    next_round_triggered = False  # Prevent movement during next round
-
-    # --- Dashboard ---
-    dashboard = Dashboard(rounds_total=30)
-    dashboard.food = 15
-    dashboard.water = 30
-    dashboard.power = 20
-    dashboard.metals = 25
-    dashboard.marsium = 0
-    dashboard.population = 5
-    dashboard.soldiers = 0
-    dashboard.current_event = ""
-    base_inventory.dashboard = dashboard
-    dashboard.building_manager = building_manager
-    dashboard.noise_map = noise_map
-    dashboard.resources = resources
-
-
-    # --- Event manager ---
-    event_manager = EventManager(dashboard, WIDTH, HEIGHT)
-    clock = pygame.time.Clock()
-    running = True
-
-    # --- Message helper ---
-    def set_message(msg, duration=2.0):
-        nonlocal bottom_right_message, message_timer
-        bottom_right_message = msg
-        message_timer = duration
+# The world is the window's size unless set_world_scale() makes it bigger; the camera shows part of it
+WORLD_WIDTH, WORLD_HEIGHT = WIDTH, HEIGHT
+COLS = WORLD_WIDTH // TILE_SIZE
+ROWS = WORLD_HEIGHT // TILE_SIZE
+PAN_SPEED = 900  # world pixels per second while an arrow/WASD key is held
+BASE_SIGHT = 12  # tiles the base reveals around itself
+BUILD_SLOTS = 3  # buildings that can be under construction at once
+UNIT_CELL = 8 * TILE_SIZE  # world pixels per cell of the unit index used for recharging
+
+screen = None
+
+
+def set_world_scale(scale):
+    """Make worlds generated from now on `scale` times the window size in each direction."""
+    global WORLD_WIDTH, WORLD_HEIGHT, COLS, ROWS
+    WORLD_WIDTH, WORLD_HEIGHT = scale * WIDTH, scale * HEIGHT
+    COLS = WORLD_WIDTH // TILE_SIZE
+    ROWS = WORLD_HEIGHT // TILE_SIZE
+
+
+def init_display():
+    """Open the window (and the font module) once; returns the display Surface."""
+    global screen
+    if screen is None:
+        # Only the subsystems the game uses; pygame.init() would also bring up audio and joysticks
+        pygame.display.init()
+        pygame.font.init()
+        screen = pygame.display.set_mode((WIDTH, HEIGHT))
+        pygame.display.set_caption("Mars Colony Simulator - Top-Down Mars Terrain")
+    return screen
+
+
+def present(rects):
+    """Show a drawn frame: the dirty rects when GameSession.draw() returned some, else a full flip."""
+    if rects is None:
+        pygame.display.flip()
+    else:
+        pygame.display.update(rects)
+
+
+def tile_pixels(tiles):
+    """World pixel Rect of a Rect measured in tiles (None, meaning everything, stays None)."""
+    if tiles is None:
+        return None
+    return pygame.Rect(tiles.x * TILE_SIZE, tiles.y * TILE_SIZE, tiles.w * TILE_SIZE, tiles.h * TILE_SIZE)
+
+
+def panel_rect(shown, panel):
+    """Hit region of an optional inventory panel (None while it is closed)."""
+    return panel.panel_rect if shown and panel else None
+
+
+class GameSession:
+    """
+    All state of one game, plus the per-frame input/update/draw steps.
+    game_loop() drives it interactively; frame_budget.py drives it headless.
+    """
+    def __init__(self, world=None):
+        if world is None:
+            world = generate_world(COLS, ROWS, TILE_SIZE)
+        self.noise_map = world.noise_map
+        self.base = world.base
+        self.resources = world.resources
+        # --- Colony-wide totals, kept current by the buildings, farms and units themselves ---
+        self.totals = ColonyTotals()
+        self.building_manager = BuildingManager(self.noise_map, self.totals)
+        base = self.base
+
+        self.building_manager.set_resources(self.resources)
+        self.building_manager.set_base(base)
+
+        # --- Timed effects run off the simulation clock advanced in update() ---
+        self.timers = TimerWheel()
+        # --- Multi-round jobs finish at round boundaries; each vehicle bay builds one unit at a time ---
+        self.construction = ConstructionScheduler(BUILD_SLOTS)
+        self.production = ConstructionScheduler(self.totals.vehicle_bays)
+
+        # --- Fog of war: the base and every unit reveal the tiles around them ---
+        self.fog = FogOfWar(COLS, ROWS, TILE_SIZE)
+        self.fog.move(base, base.x * TILE_SIZE, base.y * TILE_SIZE, BASE_SIGHT)
+
+        # --- Units ---
+        self.units = []
+        self.selected_unit = None
+
+        # --- Inventories ---
+        self.open_unit_inventory = None
+        self.show_base_inventory = False
+        from base_inventory import BaseInventory
+        self.base_inventory = BaseInventory(base, None, self.construction)
+        self.show_vehicle_inventory = False
+        self.vehicle_inventory = None
+        self.show_power_inventory = False
+        self.power_inventory = None
+        self.show_housing_inventory = False
+        self.housing_inventory = None
+        self.show_farm_inventory = False
+        self.farm_inventory = None
+
+        self.bottom_right_message = ""
+        self._message_timer = None   # clears bottom_right_message
+        self.placing_building = None
+        self.rotate_pressed_last_frame = False
+        self.next_round_triggered = False  # Prevent movement during next round
+        self.units_moved = False  # any unit changed position in the last update()
+        self.panning = False      # the camera is being moved by held keys
+        self.clicked_ui = False
+        self.tile_rect = pygame.Rect(0, 0, TILE_SIZE, TILE_SIZE)  # reused for deposit tiles
+
+        # --- Dashboard ---
+        dashboard = Dashboard(rounds_total=30)
+        dashboard.food = 15
+        dashboard.water = 30
+        dashboard.power = 20
+        dashboard.metals = 25
+        dashboard.marsium = 0
+        dashboard.population = 5
+        dashboard.soldiers = 0
+        dashboard.current_event = ""
+        dashboard.layout(WIDTH)
+        self.base_inventory.dashboard = dashboard
+        dashboard.building_manager = self.building_manager
+        dashboard.noise_map = self.noise_map
+        dashboard.resources = self.resources
+        dashboard.totals = self.totals
+        self.dashboard = dashboard
+        self.refresh_power()
+
+        # --- Event manager ---
+        from event import EventManager
+        self.event_manager = EventManager(dashboard, WIDTH, HEIGHT, self.timers)
+        self.running = True
+
+        # --- UI event routing: each mouse event goes to the topmost region under the cursor ---
+        self.ui_router = UIRouter(WIDTH, HEIGHT)
+        screen_rect = pygame.Rect(0, 0, WIDTH, HEIGHT)
+        self.ui_router.add("world", 0, lambda: screen_rect, self.on_world_event)
+        self.ui_router.add("dashboard", 10, lambda: dashboard.button_area, self.on_dashboard_event)
+        self.ui_router.add("minimap", 20, lambda: self.minimap.rect, self.on_minimap_event)
+        # Panels in draw order, so the one drawn last is hit first
+        self.ui_router.add("unit_inventory", 101,
+                           lambda: self.open_unit_inventory.inventory.panel_rect if self.open_unit_inventory else None,
+                           self.on_unit_inventory_event)
+        self.ui_router.add("base_inventory", 102,
+                           lambda: self.base_inventory.panel_rect if self.show_base_inventory else None,
+                           self.on_base_inventory_event)
+        self.ui_router.add("vehicle_inventory", 103,
+                           lambda: panel_rect(self.show_vehicle_inventory, self.vehicle_inventory),
+                           self.on_vehicle_inventory_event)
+        self.ui_router.add("power_inventory", 104,
+                           lambda: panel_rect(self.show_power_inventory, self.power_inventory),
+                           self.on_power_inventory_event)
+        self.ui_router.add("housing_inventory", 105,
+                           lambda: panel_rect(self.show_housing_inventory, self.housing_inventory),
+                           self.on_housing_inventory_event)
+        self.ui_router.add("farm_inventory", 106,
+                           lambda: panel_rect(self.show_farm_inventory, self.farm_inventory),
+                           self.on_farm_inventory_event)
+
+        # --- Frame timing (F3 toggles the overlay, F4 adds allocation accounting) ---
+        self.allocations = AllocationTracker()
+        self.frame_timer = FrameTimer(allocations=self.allocations)
+        self.timer_overlay = FrameTimerOverlay(self.frame_timer)
+        self.show_timer_overlay = False
+
+        # --- cProfile capture (F9 starts/stops, or armed from the command line) ---
+        self.profiler = SessionProfiler()
+        self.frame_count = 0
+
+        # --- Camera: world coordinates everywhere, converted only for drawing and mouse input ---
+        self.camera = Camera((WIDTH, HEIGHT), (WORLD_WIDTH, WORLD_HEIGHT))
+        self.camera.center_on(base.x * TILE_SIZE, base.y * TILE_SIZE)
+        self.sprite_atlas = SpriteAtlas()
+        self.minimap = Minimap(self.noise_map, self.resources, self.building_manager, base, self.fog, TILE_SIZE,
+                               topright=(WIDTH - 10, dashboard.button_area.bottom + 10))
+
+        # --- Rendering: static layers cached until their model changes, only changed regions redrawn ---
+        self.compositor = Compositor((WIDTH, HEIGHT), (WORLD_WIDTH, WORLD_HEIGHT), [
+            StaticLayer("terrain", lambda: dashboard.terrain_version, self.draw_terrain_layer,
+                        opaque=True, damage_fn=self.terrain_damage),
+            StaticLayer("deposits", lambda: dashboard.deposit_version, self.draw_deposit_layer,
+                        damage_fn=self.deposit_damage),
+            StaticLayer("buildings", lambda: self.building_manager.version, self.draw_building_layer,
+                        damage_fn=self.building_damage),
+            StaticLayer("fog", lambda: self.fog.version, self.fog.draw, damage_fn=self.fog.take_damage),
+        ])
+        self._building_snapshot = None
+
+    # ------------------- Helpers ------------------- #
+    def set_message(self, msg, duration=2.0):
+        self.bottom_right_message = msg
+        if self._message_timer:
+            self._message_timer.cancel()
+        self._message_timer = self.timers.schedule(duration, self._clear_message)
+
+    def _clear_message(self):
+        self.bottom_right_message = ""
+        self._message_timer = None
+
+    def refresh_power(self):
+        """Show the summed generator charge (a dust storm holds the dashboard's value until the next event)."""
+        if self.dashboard.current_event != "Dust Storm":
+            self.dashboard.power = self.totals.power()
+
+    def is_quiescent(self):
+        """True while nothing on screen is animating, so the game loop may slow down."""
+        return not (self.units_moved or self.panning or self.event_manager.active_event
+                    or self.bottom_right_message)
+
+    def any_panel_open(self):
+        return bool(self.open_unit_inventory or self.show_base_inventory or self.show_vehicle_inventory
+                    or self.show_power_inventory or self.show_housing_inventory or self.show_farm_inventory)
+
+    def toggle_allocation_tracking(self):
+        if self.allocations.enabled:
+            print(self.allocations.report())
+            self.allocations.disable()
+        else:
+            if not self.frame_timer.enabled:
+                self.frame_timer.toggle()
+                self.show_timer_overlay = True
+            self.allocations.enable()
+
+    def add_rover(self, x, y):
+        from rover_inventory import RoverInventory
+        rover = Rover(x, y)
+        rover.inventory = RoverInventory(rover, self.building_manager, self.dashboard, self.units, TILE_SIZE,
+                                         self.fog, self.timers)
+        self.units.append(rover)
+        self.totals.unit_added(rover)
+        self.fog.update([rover])
+        return rover
+
+    def add_drone(self, x, y):
+        from drone_inventory import DroneInventory
+        drone = Drone(x, y)
+        drone.move_count = 0
+        drone.max_moves = 2
+        drone.inventory = DroneInventory(drone, [r for r in self.units if isinstance(r, Rover)],
+                                         self.dashboard, self.building_manager, TILE_SIZE, self.fog, self.timers)
+        self.units.append(drone)
+        self.totals.unit_added(drone)
+        self.fog.update([drone])
+        return drone
 
     # ------------------- Helper: Recharge units ------------------- #
-    def recharge_units_at_generators(dt):
-        for b in building_manager.buildings:
-            if b["type"] == "Power Generator" and "object" in b:
-                generator = b["object"]
-                generator.update_power(dt)
-
-                rect = pygame.Rect(generator.gx * TILE_SIZE, generator.gy * TILE_SIZE,
-                                   generator.size[0] * TILE_SIZE, generator.size[1] * TILE_SIZE)
-
-                for u in units:
-                    if isinstance(u, (Rover, Drone)):
-                        ux, uy = int(u.x), int(u.y)
+    def recharge_units_at_generators(self, dt):
+        cells = None
+        for generator in self.totals.generators:
+            generator.update_power(dt)
+            if cells is None:
+                cells = self.unit_cells()
+
+            rect = generator.pixel_rect(TILE_SIZE)
+            for cy in range(rect.top // UNIT_CELL, (rect.bottom - 1) // UNIT_CELL + 1):
+                for cx in range(rect.left // UNIT_CELL, (rect.right - 1) // UNIT_CELL + 1):
+                    for u, ux, uy in cells.get((cx, cy), ()):
                         if rect.collidepoint(ux, uy) and u.power < u.max_power and generator.power > 0:
                             u.recharge(dt)
                             generator.power -= 2 * dt
                             if generator.power < 0:
                                 generator.power = 0
 
-    # ------------------- Main Loop ------------------- #
-    while running:
-        dt = clock.tick(60) / 1000
-        mouse_pos = pygame.mouse.get_pos()
-        keys = pygame.key.get_pressed()
+    def unit_cells(self):
+        """Rovers and drones bucketed by UNIT_CELL grid cell, so a generator only checks the units near it."""
+        cells = {}
+        for u in self.units:
+            if isinstance(u, (Rover, Drone)):
+                ux, uy = int(u.x), int(u.y)
+                cells.setdefault((ux // UNIT_CELL, uy // UNIT_CELL), []).append((u, ux, uy))
+        return cells
+
+    # ------------------- Frame bookkeeping ------------------- #
+    def begin_frame(self):
+        self.frame_timer.begin_frame()
+        self.profiler.begin_frame(self.dashboard.current_round, self.frame_count)
+
+    def end_frame(self):
+        self.frame_timer.end_frame()
+        self.profiler.end_frame(self.dashboard.current_round, self.frame_count)
+        self.frame_count += 1
+
+    # ------------------- Input ------------------- #
+    def handle_keys(self, keys, dt=1/60):
+        # Pan the camera with the arrow keys / WASD
+        dx = (keys[pygame.K_RIGHT] or keys[pygame.K_d]) - (keys[pygame.K_LEFT] or keys[pygame.K_a])
+        dy = (keys[pygame.K_DOWN] or keys[pygame.K_s]) - (keys[pygame.K_UP] or keys[pygame.K_w])
+        self.panning = bool(dx or dy) and self.camera.pan(dx * PAN_SPEED * dt, dy * PAN_SPEED * dt)
 
         # Rotate building if placing
-        if placing_building:
-            if keys[pygame.K_r] and not rotate_pressed_last_frame:
-                b_info = next(b for b in base_inventory.buildings if b["name"] == placing_building)
+        if self.placing_building:
+            if keys[pygame.K_r] and not self.rotate_pressed_last_frame:
+                b_info = next(b for b in self.base_inventory.buildings if b["name"] == self.placing_building)
                 current_size = b_info.get("size", (4, 4))
                 b_info["size"] = (current_size[1], current_size[0])
-                rotate_pressed_last_frame = True
+                self.rotate_pressed_last_frame = True
             elif not keys[pygame.K_r]:
-                rotate_pressed_last_frame = False
+                self.rotate_pressed_last_frame = False
+
+    def process_events(self, events):
+        t = self.frame_timer.start()
+        self.clicked_ui = False
+        for event in events:
+            self.handle_event(event)
+        self.frame_timer.stop("events", t)
+
+    def handle_event(self, event):
+        if event.type == pygame.QUIT:
+            self.running = False
+        elif event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+            self.frame_timer.toggle()
+            self.show_timer_overlay = self.frame_timer.enabled
+        elif event.type == pygame.KEYDOWN and event.key == pygame.K_F4:
+            self.toggle_allocation_tracking()
+        elif event.type == pygame.KEYDOWN and event.key == pygame.K_F9:
+            self.profiler.toggle()
+        elif event.type == pygame.KEYDOWN and event.key in (pygame.K_EQUALS, pygame.K_PLUS, pygame.K_KP_PLUS):
+            self.camera.zoom_to(self.camera.level - 1)
+        elif event.type == pygame.KEYDOWN and event.key in (pygame.K_MINUS, pygame.K_KP_MINUS):
+            self.camera.zoom_to(self.camera.level + 1)
+        elif event.type == pygame.KEYDOWN and event.key == pygame.K_F10:
+            if tracer.enabled:
+                tracer.stop()
+            else:
+                tracer.start()
+
+        # --- Mouse events go to the topmost UI region under the cursor ---
+        self.ui_router.route(event)
+
+    # ------------------- Panel regions ------------------- #
+    def on_unit_inventory_event(self, event):
+        action = self.open_unit_inventory.inventory.handle_event(event, self.resources)
+        if action == "close":
+            self.open_unit_inventory = None
+            self.selected_unit = None
+        self.clicked_ui = True
+        return True
+
+    def on_base_inventory_event(self, event):
+        action = self.base_inventory.handle_event(event)
+        if action == "close":
+            self.show_base_inventory = False
+            self.selected_unit = None
+        elif action and action.startswith("build_"):
+            self.placing_building = action.replace("build_", "")
+            self.show_base_inventory = False
+            self.selected_unit = None
+        self.clicked_ui = True
+        return True
+
+    def on_vehicle_inventory_event(self, event):
+        action = self.vehicle_inventory.handle_event(event)
+        dashboard = self.dashboard
+        if action == "close":
+            self.show_vehicle_inventory = False
+            self.selected_unit = None
+        elif action in ("buy_rover", "buy_drone"):
+            bay = self.vehicle_inventory.vehicle_bay
+            spawn_x = (bay["gx"] + bay["size"][0] // 2) * TILE_SIZE + TILE_SIZE // 2
+            spawn_y = (bay["gy"] + bay["size"][1] // 2) * TILE_SIZE + TILE_SIZE // 2
+            inventory = self.vehicle_inventory
+            if action == "buy_rover" and dashboard.metals >= inventory.rover_cost:
+                dashboard.metals -= inventory.rover_cost
+                self.production.submit("Rover", inventory.rover_rounds,
+                                       lambda: self._finish_unit("Rover", self.add_rover, spawn_x, spawn_y),
+                                       dashboard.current_round)
+                self.set_message("Rover queued")
+            elif action == "buy_drone" and dashboard.metals >= inventory.drone_cost:
+                dashboard.metals -= inventory.drone_cost
+                self.production.submit("Drone", inventory.drone_rounds,
+                                       lambda: self._finish_unit("Drone", self.add_drone, spawn_x, spawn_y - TILE_SIZE),
+                                       dashboard.current_round)
+                self.set_message("Drone queued")
+            else:
+                self.set_message("Not enough metal for this unit")
+            self.selected_unit = None  # Clear selected unit after buying
+        self.clicked_ui = True
+        return True
+
+    def _finish_unit(self, name, add, x, y):
+        add(x, y)
+        self.set_message(f"{name} constructed!")
+
+    def _finish_building(self, building):
+        from power_generator import PowerGenerator
+        b_type = building["type"]
+        obj = PowerGenerator(gx=building["gx"], gy=building["gy"]) if b_type == "Power Generator" else None
+        self.building_manager.finish_construction(building, obj)
+        if obj:
+            self.refresh_power()
+        self.sync_production_slots()
+        self.set_message(f"{b_type} completed at {building['gx']},{building['gy']}")
+
+    def sync_production_slots(self):
+        """One production slot per finished Vehicle Bay, however the bay was added."""
+        self.production.set_slots(self.totals.vehicle_bays, self.dashboard.current_round)
+
+    def on_power_inventory_event(self, event):
+        if self.power_inventory.handle_event(event) == "close":
+            self.power_inventory.close()
+            self.show_power_inventory = False
+            self.selected_unit = None
+        self.clicked_ui = True
+        return True
+
+    def on_housing_inventory_event(self, event):
+        if self.housing_inventory.handle_event(event) == "close":
+            self.show_housing_inventory = False
+            self.selected_unit = None
+        self.clicked_ui = True
+        return True
+
+    def on_farm_inventory_event(self, event):
+        if self.farm_inventory.handle_event(event) == "close":
+            self.show_farm_inventory = False
+            self.selected_unit = None
+        self.clicked_ui = True
+        return True
+
+    def on_dashboard_event(self, event):
+        if event.type != pygame.MOUSEBUTTONDOWN or event.button != 1 or self.any_panel_open():
+            return False
+        action = self.dashboard.handle_click(event.pos)
+        if action == "next_round":
+            self.start_next_round()
+            return True
+        elif action == "stop_control":
+            self.selected_unit = None
+            self.set_message("Stopped controlling unit", 1.5)
+            return True
+        return False
+
+    def on_minimap_event(self, event):
+        target = self.minimap.handle_event(event)
+        if target:
+            self.camera.center_on(*target)
+        return True
+
+    # ------------------- World clicks ------------------- #
+    def on_world_event(self, event):
+        if event.type == pygame.MOUSEMOTION and event.buttons[1]:
+            # Middle-drag pans the camera
+            self.camera.pan(-event.rel[0], -event.rel[1])
+        if event.type != pygame.MOUSEBUTTONDOWN:
+            return True
+        if event.button in (4, 5):
+            # Wheel zooms around the cursor
+            self.camera.zoom_to(self.camera.level + (1 if event.button == 5 else -1), event.pos)
+            return True
+        world_pos = self.camera.to_world(event.pos)
+        if event.button == 3:
+            self.handle_world_right_click(world_pos)
+        elif event.button == 1 and not self.any_panel_open():
+            self.handle_world_left_click(world_pos)
+        return True
+
+    def handle_world_right_click(self, click_pos):
+        """Right-click on units/buildings/base opens their inventory."""
+        from rover_inventory import RoverInventory
+        from drone_inventory import DroneInventory
+        from vehicle_bay_inventory import VehicleBayInventory
+        from power_generator_inventory import PowerGeneratorInventory
+        from housing_inventory import HousingInventory
+        from farm_inventory import FarmInventory
+        dashboard = self.dashboard
+        building_manager = self.building_manager
+        units = self.units
+        panel_was_open = self.any_panel_open()
 
-        clicked_ui = False
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                running = False
-
-            # --- Handle unit inventory ---
-            if open_unit_inventory and hasattr(open_unit_inventory, "inventory"):
-                action = open_unit_inventory.inventory.handle_event(event, resources)
-                if action == "close":
-                    open_unit_inventory = None
-                    ignore_next_click = True
-                    selected_unit = None
-                clicked_ui = True
-
-            # --- Handle building/base inventories ---
-            if show_base_inventory:
-                action = base_inventory.handle_event(event)
-                if action == "close":
-                    show_base_inventory = False
-                    ignore_next_click = True
-                    selected_unit = None
-                elif action and action.startswith("build_"):
-                    placing_building = action.replace("build_", "")
-                    show_base_inventory = False
-                    ignore_next_click = True
-                    selected_unit = None
-                clicked_ui = True
-
-            if show_vehicle_inventory and vehicle_inventory:
-                action = vehicle_inventory.handle_event(event)
-                if action == "close":
-                    show_vehicle_inventory = False
-                    ignore_next_click = True
-                    selected_unit = None
-                elif action in ("buy_rover", "buy_drone"):
-                    spawn_x = (vehicle_inventory.vehicle_bay["gx"] + vehicle_inventory.vehicle_bay["size"][0] // 2) * TILE_SIZE + TILE_SIZE // 2
-                    spawn_y = (vehicle_inventory.vehicle_bay["gy"] + vehicle_inventory.vehicle_bay["size"][1] // 2) * TILE_SIZE + TILE_SIZE // 2
-                    if action == "buy_rover" and dashboard.metals >= 5:
-                        new_rover = Rover(spawn_x, spawn_y)
-                        new_rover.inventory = RoverInventory(new_rover, building_manager, dashboard, units)
-                        units.append(new_rover)
-                        dashboard.metals -= 5
-                        set_message("Rover constructed!")
-                        show_vehicle_inventory = False
-                    elif action == "buy_drone" and dashboard.metals >= 10:
-                        new_drone = Drone(spawn_x, spawn_y - TILE_SIZE)
-                        new_drone.move_count = 0
-                        new_drone.max_moves = 2
-                        new_drone.inventory = DroneInventory(new_drone, [r for r in units if isinstance(r, Rover)], dashboard, building_manager)
-                        units.append(new_drone)
-                        dashboard.metals -= 10
-                        set_message("Drone constructed!")
-                        show_vehicle_inventory = False
-                    else:
-                        set_message("Not enough metal for this unit")
-                    selected_unit = None  # Clear selected unit after buying
-                clicked_ui = True
-
-            if show_power_inventory and power_inventory:
-                action = power_inventory.handle_event(event)
-                if action == "close":
-                    show_power_inventory = False
-                    ignore_next_click = True
-                    selected_unit = None
-                clicked_ui = True
-
-            if show_housing_inventory and housing_inventory:
-                action = housing_inventory.handle_event(event)
-                if action == "close":
-                    show_housing_inventory = False
-                    ignore_next_click = True
-                    selected_unit = None
-                clicked_ui = True
-
-            if show_farm_inventory and farm_inventory:
-                action = farm_inventory.handle_event(event)
-                if action == "close":
-                    show_farm_inventory = False
-                    ignore_next_click = True
-                    selected_unit = None
-                clicked_ui = True
-
-            # --- Handle world clicks ---
-            if event.type == pygame.MOUSEBUTTONDOWN:
-                click_pos = event.pos
-                if ignore_next_click:
-                    ignore_next_click = False
-                    continue
+        for u in units:
+            if u.is_clicked(click_pos):
+                if isinstance(u, Rover):
+                    if not hasattr(u, "inventory") or u.inventory is None:
+                        u.inventory = RoverInventory(u, building_manager, dashboard, units, TILE_SIZE,
+                                                     self.fog, self.timers)
+                    self.open_unit_inventory = u
+                elif isinstance(u, Drone):
+                    if not hasattr(u, "inventory") or u.inventory is None:
+                        u.inventory = DroneInventory(u, [r for r in units if isinstance(r, Rover)], dashboard,
+                                                     building_manager, TILE_SIZE, self.fog, self.timers)
+                    self.open_unit_inventory = u
+                self.clicked_ui = True
+                return
 
-                # --- Right-click on units/buildings/base ---
-                if event.button == 3:
-                    clicked_on_unit = False
-                    for u in units:
-                        if u.is_clicked(click_pos):
-                            if isinstance(u, Rover):
-                                if not hasattr(u, "inventory") or u.inventory is None:
-                                    u.inventory = RoverInventory(u, building_manager, dashboard, units)
-                                open_unit_inventory = u
-                            elif isinstance(u, Drone):
-                                if not hasattr(u, "inventory") or u.inventory is None:
-                                    u.inventory = DroneInventory(u, [r for r in units if isinstance(r, Rover)], dashboard, building_manager)
-                                open_unit_inventory = u
-                            clicked_on_unit = True
-                            break
-
-                    if clicked_on_unit:
-                        clicked_ui = True
-                        continue
-
-                    # --- Check building inventories ---
-                    for b in building_manager.buildings:
-                        gx, gy, bsize, b_type = b["gx"], b["gy"], b["size"], b["type"]
-                        rect = pygame.Rect(gx*TILE_SIZE, gy*TILE_SIZE, bsize[0]*TILE_SIZE, bsize[1]*TILE_SIZE)
-                        if rect.collidepoint(click_pos):
-                            if b_type == "Power Generator" and "object" in b:
-                                power_inventory = PowerGeneratorInventory(b["object"], dashboard)
-                                show_power_inventory = True
-                                selected_unit = None
-                                clicked_ui = True
-                                break
-                            elif b_type == "Vehicle Bay":
-                                vehicle_inventory = VehicleBayInventory(b, dashboard)
-                                show_vehicle_inventory = True
-                                selected_unit = None
-                                clicked_ui = True
-                                break
-                            elif b_type == "Housing":
-                                housing_inventory = HousingInventory(b, dashboard)
-                                show_housing_inventory = not show_housing_inventory
-                                selected_unit = None
-                                clicked_ui = True
-                                break
-                            elif b_type == "Farm":
-                                if "object" not in b:
-                                    b["object"] = FarmInventory(b, dashboard)
-                                farm_inventory = b["object"]
-                                show_farm_inventory = not show_farm_inventory
-                                selected_unit = None
-                                clicked_ui = True
-                                break
-
-                    # --- Base inventory ---
-                    half = base.size // 2
-                    base_rect_px = pygame.Rect((base.x - half) * TILE_SIZE,
-                                               (base.y - half) * TILE_SIZE,
-                                               base.size * TILE_SIZE,
-                                               base.size * TILE_SIZE)
-                    if base_rect_px.collidepoint(click_pos) and not clicked_ui:
-                        show_base_inventory = not show_base_inventory
-                        selected_unit = None
-                        clicked_ui = True
-
-                # --- Left-click world actions ---
-                elif event.button == 1:
-                    if open_unit_inventory or show_base_inventory or show_vehicle_inventory or show_power_inventory or show_housing_inventory or show_farm_inventory:
-                        continue
-
-                    action = dashboard.handle_click(click_pos)
-                    if action == "next_round":
-                        # --- Start next round ---
-                        next_round_triggered = True
-
-                        dashboard.food = max(dashboard.food - dashboard.population*1, 0)
-                        dashboard.water = max(dashboard.water - dashboard.population*0.5, 0)
-
-                        # Apply farm production
-                        for b in building_manager.buildings:
-                            if b["type"] == "Farm" and "object" in b:
-                                b["object"].apply_next_round()
-
-                        # Reset unit move counts & mining/recharging
-                        for u in units:
-                            u.move_count = 0
-                            if isinstance(u, Drone):
-                                u.mining_active = False
-                                u.recharging_rover = None
-                            # Apply unit mining/production if any
-                            if hasattr(u, "inventory") and u.inventory:
-                                u.inventory.apply_next_round_mining()
-
-                        next_round_triggered = False
-                        continue
-
-                    elif action == "stop_control":
-                        selected_unit = None
-                        set_message("Stopped controlling unit", 1.5)
-                        continue
-
-                    # --- Unit movement ---
-                    if placing_building:
-                        b_info = next(b for b in base_inventory.buildings if b["name"] == placing_building)
-                        b_size = b_info.get("size", (4, 4))
-                        cost = b_info["cost"].get("metals", 0)
-                        new_obj = PowerGenerator if placing_building == "Power Generator" else None
-                        if dashboard.metals >= cost:
-                            if building_manager.add_building(click_pos[0]//TILE_SIZE, click_pos[1]//TILE_SIZE,
-                                                            size=b_size, color=(200,200,200),
-                                                            b_type=placing_building,
-                                                            obj=new_obj(gx=click_pos[0]//TILE_SIZE,
-                                                                        gy=click_pos[1]//TILE_SIZE) if new_obj else None):
-                                dashboard.metals -= cost
-                                set_message(f"Placed {placing_building} at {click_pos[0]//TILE_SIZE},{click_pos[1]//TILE_SIZE}")
-                                placing_building = None
-                            else:
-                                set_message("Invalid building spot")
+        # --- Check building inventories ---
+        gx, gy = click_pos[0] // TILE_SIZE, click_pos[1] // TILE_SIZE
+        for b in building_manager.buildings:
+            bx, by = b["gx"], b["gy"]
+            bw, bh = b["size"]
+            if not (bx <= gx < bx + bw and by <= gy < by + bh):
+                continue
+            b_type = b["type"]
+            if b.get("under_construction"):
+                self.set_message(f"{b_type} is still under construction")
+                self.clicked_ui = True
+                break
+            if b_type == "Power Generator" and "object" in b:
+                if self.power_inventory:
+                    self.power_inventory.close()
+                self.power_inventory = PowerGeneratorInventory(b["object"], dashboard, self.timers)
+                self.show_power_inventory = True
+                self.selected_unit = None
+                self.clicked_ui = True
+                break
+            elif b_type == "Vehicle Bay":
+                self.vehicle_inventory = VehicleBayInventory(b, dashboard, self.production)
+                self.show_vehicle_inventory = True
+                self.selected_unit = None
+                self.clicked_ui = True
+                break
+            elif b_type == "Housing":
+                self.housing_inventory = HousingInventory(b, dashboard)
+                self.show_housing_inventory = not self.show_housing_inventory
+                self.selected_unit = None
+                self.clicked_ui = True
+                break
+            elif b_type == "Farm":
+                if "object" not in b:
+                    b["object"] = FarmInventory(b, dashboard, self.totals)
+                self.farm_inventory = b["object"]
+                self.show_farm_inventory = not self.show_farm_inventory
+                self.selected_unit = None
+                self.clicked_ui = True
+                break
+
+        # --- Base inventory ---
+        base = self.base
+        half = base.size // 2
+        base_rect_px = pygame.Rect((base.x - half) * TILE_SIZE,
+                                   (base.y - half) * TILE_SIZE,
+                                   base.size * TILE_SIZE,
+                                   base.size * TILE_SIZE)
+        if base_rect_px.collidepoint(click_pos) and not self.clicked_ui and not panel_was_open:
+            self.show_base_inventory = not self.show_base_inventory
+            self.selected_unit = None
+            self.clicked_ui = True
+
+    def handle_world_left_click(self, click_pos):
+        """Left-click places the pending building, selects a unit or moves the selected one."""
+        dashboard = self.dashboard
+        building_manager = self.building_manager
+        units = self.units
+
+        # --- Unit movement ---
+        if self.placing_building:
+            placing_building = self.placing_building
+            b_info = next(b for b in self.base_inventory.buildings if b["name"] == placing_building)
+            b_size = b_info.get("size", (4, 4))
+            cost = b_info["cost"].get("metals", 0)
+            if dashboard.metals >= cost:
+                gx, gy = click_pos[0] // TILE_SIZE, click_pos[1] // TILE_SIZE
+                # Holds its spot while it is being built
+                building = building_manager.add_building(gx, gy, size=b_size, color=(200,200,200),
+                                                         b_type=placing_building, under_construction=True)
+                if building:
+                    dashboard.metals -= cost
+                    self.placing_building = None
+                    if b_info["build_time"] <= 1:
+                        self._finish_building(building)
+                    else:
+                        self.construction.submit(placing_building, b_info["build_time"],
+                                                 lambda: self._finish_building(building), dashboard.current_round)
+                        self.set_message(f"Started {placing_building} at {gx},{gy}")
+                else:
+                    self.set_message("Invalid building spot")
+            else:
+                self.set_message("Not enough metals")
+        else:
+            clicked_on_unit = False
+            for u in units:
+                if u.is_clicked(click_pos):
+                    self.selected_unit = u
+                    clicked_on_unit = True
+                    break
+            selected_unit = self.selected_unit
+            if not clicked_on_unit and selected_unit:
+                if getattr(selected_unit, "move_count", 0) >= getattr(selected_unit, "max_moves", 9999):
+                    self.set_message(f"{selected_unit.__class__.__name__} has no moves left this round")
+                else:
+                    if getattr(selected_unit, "mining_active", False):
+                        if not getattr(selected_unit, "awaiting_move_confirmation", False):
+                            self.set_message("This unit is mining. Click again to move it.")
+                            selected_unit.awaiting_move_confirmation = True
                         else:
-                            set_message("Not enough metals")
+                            selected_unit.awaiting_move_confirmation = False
+                            selected_unit.mining_active = False
+                            selected_unit.set_target(click_pos)
+                            selected_unit.move_count += 1
                     else:
-                        clicked_on_unit = False
-                        for u in units:
-                            if u.is_clicked(click_pos):
-                                selected_unit = u
-                                clicked_on_unit = True
-                                break
-                        if not clicked_on_unit and selected_unit:
-                            if getattr(selected_unit, "move_count", 0) >= getattr(selected_unit, "max_moves", 9999):
-                                set_message(f"{selected_unit.__class__.__name__} has no moves left this round")
-                            else:
-                                if getattr(selected_unit, "mining_active", False):
-                                    if not getattr(selected_unit, "awaiting_move_confirmation", False):
-                                        set_message("This unit is mining. Click again to move it.")
-                                        selected_unit.awaiting_move_confirmation = True
-                                    else:
-                                        selected_unit.awaiting_move_confirmation = False
-                                        selected_unit.mining_active = False
-                                        selected_unit.set_target(click_pos)
-                                        selected_unit.move_count += 1
-                                else:
-                                    selected_unit.set_target(click_pos)
-                                    selected_unit.move_count += 1
-
-        # ---------------- Updates ---------------- #
-        event_manager.update(dashboard.current_round)
+                        selected_unit.set_target(click_pos)
+                        selected_unit.move_count += 1
+
+    def advance_round(self):
+        """Advance the round as if Next Round was clicked (used by the headless runners)."""
+        if self.dashboard.current_round < self.dashboard.rounds_total:
+            self.dashboard.next_round()
+            self.start_next_round()
+
+    def start_next_round(self):
+        """Apply end-of-round consumption and production (dashboard already advanced the round)."""
+        dashboard = self.dashboard
+        self.next_round_triggered = True
+
+        dashboard.food = max(dashboard.food - dashboard.population*1, 0)
+        dashboard.water = max(dashboard.water - dashboard.population*0.5, 0)
+
+        self.totals.resync()
+        self.refresh_power()
+
+        # Finish the buildings and units due this round
+        self.construction.advance(dashboard.current_round)
+        self.sync_production_slots()
+        self.production.advance(dashboard.current_round)
+
+        # Apply farm production
+        for b in self.building_manager.buildings:
+            if b["type"] == "Farm" and "object" in b:
+                b["object"].apply_next_round()
+
+        # Reset unit move counts & mining/recharging
+        for u in self.units:
+            u.move_count = 0
+            if isinstance(u, Drone):
+                u.mining_active = False
+                u.recharging_rover = None
+            # Apply unit mining/production if any
+            if hasattr(u, "inventory") and u.inventory:
+                u.inventory.apply_next_round_mining()
 
-        # Only allow movement if no inventory is open
-        if not next_round_triggered and not (open_unit_inventory or show_base_inventory or show_vehicle_inventory or show_power_inventory or show_housing_inventory or show_farm_inventory):
-            for u in units:
-                u.move(noise_map, TILE_SIZE, COLS, ROWS, dt)
+        self.next_round_triggered = False
 
-        recharge_units_at_generators(dt)
+    # ---------------- Updates ---------------- #
+    def update(self, dt):
+        dashboard = self.dashboard
+        timer = self.frame_timer
+        t = timer.start()
+        self.event_manager.update(dashboard.current_round, dt)
+        self.timers.advance(dt)
+        self.sync_production_slots()
+        timer.stop("events", t)
 
-        for u in units:
+        # Only allow movement if no inventory is open
+        t = timer.start()
+        moved = False
+        if not self.next_round_triggered and not self.any_panel_open():
+            for u in self.units:
+                x, y = u.x, u.y
+                u.move(self.noise_map, TILE_SIZE, COLS, ROWS, dt)
+                if u.x != x or u.y != y:
+                    moved = True
+        self.units_moved = moved
+        if moved:
+            self.fog.update(self.units)
+        timer.stop("movement", t)
+
+        t = timer.start()
+        with tracer.span("recharge_units_at_generators"):
+            self.recharge_units_at_generators(dt)
+        timer.stop("recharge", t)
+
+        t = timer.start()
+        # The open unit inventory is one of these; each only rescans deposits when its probe moved
+        for u in self.units:
             if hasattr(u, "inventory") and u.inventory:
-                u.inventory.update(dt, resources)
-        if open_unit_inventory:
-            open_unit_inventory.inventory.update(dt, resources)
-        if base_inventory:
-            base_inventory.update()
-        if show_vehicle_inventory and vehicle_inventory:
-            vehicle_inventory.update()
-        if show_power_inventory and power_inventory:
-            power_inventory.update(dt)
-        if show_housing_inventory and housing_inventory:
-            housing_inventory.update()
-        if show_farm_inventory and farm_inventory:
-            farm_inventory.update()
-
-        if dashboard.current_event != "Dust Storm":
-            dashboard.power = round(sum(
-                b["object"].power for b in building_manager.buildings
-                if b["type"] == "Power Generator" and "object" in b
-            ), 1)
-
-        # ---------------- Drawing ---------------- #
-        screen.fill((0,0,0))
-        draw_terrain(screen, noise_map, TILE_SIZE)
-        for res in resources:
+                u.inventory.update(dt, self.resources)
+        if self.show_housing_inventory and self.housing_inventory:
+            self.housing_inventory.update()
+        if self.show_farm_inventory and self.farm_inventory:
+            self.farm_inventory.update()
+
+        timer.stop("inventories", t)
+
+    # ---------------- Drawing ---------------- #
+    # Static layers redraw only the damaged area; terrain and deposit edits report their own
+    # tiles to the dashboard, while building_damage diffs the building list against a snapshot
+    def terrain_damage(self):
+        damage, self.dashboard.terrain_damage = self.dashboard.terrain_damage, None
+        return tile_pixels(damage)
+
+    def deposit_damage(self):
+        damage, self.dashboard.deposit_damage = self.dashboard.deposit_damage, None
+        return tile_pixels(damage)
+
+    def building_damage(self):
+        previous = self._building_snapshot
+        self._building_snapshot = {(b["gx"], b["gy"]) + tuple(b["size"]) + (bool(b.get("under_construction")),)
+                                   for b in self.building_manager.buildings}
+        if previous is None:
+            return None
+        damage = pygame.Rect(0, 0, 0, 0)
+        for gx, gy, w, h, _ in previous ^ self._building_snapshot:
+            rect = pygame.Rect(gx * TILE_SIZE, gy * TILE_SIZE, w * TILE_SIZE, h * TILE_SIZE)
+            damage = rect if not damage else damage.union(rect)
+        return damage
+
+    def draw_terrain_layer(self, surface, area):
+        with tracer.span("draw_terrain"):
+            draw_terrain(surface, self.noise_map, TILE_SIZE, area)
+
+    def draw_deposit_layer(self, surface, area):
+        tile_rect = self.tile_rect
+        x0, y0, x1, y1 = 0, 0, COLS, ROWS
+        if area is not None:
+            # Tiles overlapping `area`, in the same rounding draw_terrain uses
+            x0, y0 = area.left // TILE_SIZE, area.top // TILE_SIZE
+            x1, y1 = -(-area.right // TILE_SIZE), -(-area.bottom // TILE_SIZE)
+        for res in self.resources:
             for x,y in res.positions:
-                pygame.draw.rect(screen, res.color, pygame.Rect(x*TILE_SIZE, y*TILE_SIZE, TILE_SIZE, TILE_SIZE))
-        building_manager.draw(screen, TILE_SIZE)
-        base.draw(screen, TILE_SIZE)
-        for u in units:
-            u.draw(screen)
-
-        if placing_building:
-            gx, gy = mouse_pos[0]//TILE_SIZE, mouse_pos[1]//TILE_SIZE
-            b_info = next(b for b in base_inventory.buildings if b["name"] == placing_building)
+                if not (x0 <= x < x1 and y0 <= y < y1):
+                    continue
+                tile_rect.x = x*TILE_SIZE
+                tile_rect.y = y*TILE_SIZE
+                surface.fill(res.color, tile_rect)
+
+    def draw_building_layer(self, surface, area):
+        self.building_manager.draw(surface, TILE_SIZE)
+        self.base.draw(surface, TILE_SIZE)
+
+    def add_world_drawables(self, mouse_pos):
+        compositor = self.compositor
+        sprite_atlas = self.sprite_atlas
+        camera = self.camera
+        origin = camera.rect.topleft
+        zoom = camera.level
+        in_view = camera.rect.inflate(2 * TILE_SIZE + 40, 2 * TILE_SIZE + 40)  # margin covers a unit sprite
+        for u in self.units:
+            if not in_view.collidepoint(u.x, u.y):
+                continue
+            # A (source, dest, area) drawable: the dirty units go out in one Surface.blits call
+            blit = sprite_atlas.blit_args(u, origin, zoom)
+            source, dest, area = blit
+            compositor.add("units", u, pygame.Rect(dest, area.size), (source, area), blit)
+
+        if self.placing_building:
+            wx, wy = camera.to_world(mouse_pos)
+            gx, gy = wx//TILE_SIZE, wy//TILE_SIZE
+            b_info = next(b for b in self.base_inventory.buildings if b["name"] == self.placing_building)
             b_size = b_info.get("size",(4,4))
-            valid = building_manager.can_place(gx, gy, b_size)
+            valid = self.building_manager.can_place(gx, gy, b_size)
             color = (0,200,0) if valid else (200,0,0)
-            pygame.draw.rect(screen, color, pygame.Rect(gx*TILE_SIZE, gy*TILE_SIZE, b_size[0]*TILE_SIZE, b_size[1]*TILE_SIZE), 2)
-
-        if open_unit_inventory:
-            open_unit_inventory.inventory.draw(screen, resources)
-        if show_base_inventory:
-            base_inventory.draw(screen)
-        if show_vehicle_inventory and vehicle_inventory:
-            vehicle_inventory.draw(screen)
-        if show_power_inventory and power_inventory:
-            power_inventory.draw(screen)
-        if show_housing_inventory and housing_inventory:
-            housing_inventory.draw(screen)
-        if show_farm_inventory and farm_inventory:
-            farm_inventory.draw(screen)
-
-        event_manager.draw(screen)
-        dashboard.draw(screen)
-
-        if bottom_right_message and message_timer>0:
-            msg_font = pygame.font.SysFont("Arial", 20, bold=True)
-            msg_text = msg_font.render(bottom_right_message, True, (255,255,255))
-            screen.blit(msg_text, (WIDTH-msg_text.get_width()-20, HEIGHT-msg_text.get_height()-20))
-            message_timer -= dt
-        elif message_timer<=0:
-            bottom_right_message = ""
+            step = camera.scale
+            ghost = pygame.Rect((gx*TILE_SIZE - origin[0]) // step, (gy*TILE_SIZE - origin[1]) // step,
+                                b_size[0]*TILE_SIZE // step, b_size[1]*TILE_SIZE // step)
+            compositor.add("ghost", "ghost", ghost, color, lambda screen: pygame.draw.rect(screen, color, ghost, 2))
+
+    def add_ui_drawables(self, dt):
+        compositor = self.compositor
+        if self.open_unit_inventory:
+            inventory = self.open_unit_inventory.inventory
+            compositor.add("panels", inventory, inventory.panel_rect, inventory.panel_state(),
+                      lambda screen: inventory.draw(screen, self.resources))
+        for shown, panel in ((self.show_base_inventory, self.base_inventory),
+                             (self.show_vehicle_inventory, self.vehicle_inventory),
+                             (self.show_power_inventory, self.power_inventory),
+                             (self.show_housing_inventory, self.housing_inventory),
+                             (self.show_farm_inventory, self.farm_inventory)):
+            if shown and panel:
+                compositor.add("panels", panel, panel.panel_rect, panel.panel_state(), panel.draw)
+
+        event_manager = self.event_manager
+        lines = event_manager.popup_lines()
+        if lines:
+            compositor.add("hud", "event", event_manager.popup_bounds(lines), lines, event_manager.draw)
+
+        dashboard = self.dashboard
+        minimap = self.minimap
+        minimap.refresh((dashboard.terrain_version, dashboard.deposit_version, self.building_manager.version,
+                         self.fog.version),
+                        self.units, self.units_moved, self.camera)
+        compositor.add("hud", "minimap", minimap.rect, minimap.version, minimap.blit_args())
+
+        lines = dashboard.text_lines()
+        compositor.add("hud", "dashboard_text", dashboard.text_bounds(lines), lines,
+                  lambda screen: dashboard.draw_text_block(screen, lines))
+        compositor.add("hud", "dashboard_buttons", dashboard.button_area,
+                  dashboard.current_round >= dashboard.rounds_total, dashboard.draw_buttons)
+
+        if self.bottom_right_message:
+            msg_font = get_font("Arial", 20, bold=True)
+            msg_text = render_text(msg_font, self.bottom_right_message, (255,255,255))
+            msg_rect = msg_text.get_rect(bottomright=(WIDTH-20, HEIGHT-20))
+            compositor.add("hud", "message", msg_rect, self.bottom_right_message,
+                      lambda screen: screen.blit(msg_text, msg_rect))
+
+        if self.show_timer_overlay:
+            overlay = self.timer_overlay
+            overlay.refresh({
+                "units": len(self.units),
+                "buildings": len(self.building_manager.buildings),
+                "deposits": len(self.resources),
+                "ore held": self.totals.stored_total,
+            })
+            panel = overlay.panel
+            overlay_rect = overlay.panel_rect(HEIGHT)
+            compositor.add("overlay", "timer_overlay", overlay_rect, panel,
+                      lambda screen: screen.blit(panel, overlay_rect))
+
+    def draw(self, screen, mouse_pos, dt):
+        """
+        Draw the frame into `screen`, touching only what changed since the last one.
+        Returns the dirty Rects for pygame.display.update(), or None when the
+        whole screen was redrawn (pass the result to present()).
+        """
+        timer = self.frame_timer
+        compositor = self.compositor
+        t = timer.start()
+        compositor.begin_frame(screen, self.camera)
+        self.add_world_drawables(mouse_pos)
+        self.add_ui_drawables(dt)
+        rects = compositor.restore(screen)
+        timer.stop("terrain", t)
+
+        t = timer.start()
+        compositor.draw(screen, "units", "ghost")
+        timer.stop("world", t)
+
+        t = timer.start()
+        compositor.draw(screen, "panels", "hud")
+        timer.stop("ui", t)
+
+        compositor.draw(screen, "overlay")
+        return rects
+
+
+def game_loop(args=None, world=None):
+    screen = init_display()
+    session = GameSession(world)
+    pacer = FramePacer()
+    if args and (args.profile_frames or args.profile_rounds):
+        session.profiler.out_dir = args.profile_dir
+        session.profiler.request(frames=args.profile_frames, rounds=args.profile_rounds,
+                                 start_round=args.profile_start_round)
+
+    if args and args.trace:
+        tracer.start()
 
-        pygame.display.flip()
+    # ------------------- Main Loop ------------------- #
+    while session.running:
+        dt, events = pacer.next_frame(session.is_quiescent())
+        session.begin_frame()
+        with tracer.span("frame"):
+            mouse_pos = pygame.mouse.get_pos()
+            keys = pygame.key.get_pressed()
+
+            with tracer.span("input"):
+                session.handle_keys(keys, dt)
+                session.process_events(events)
+            with tracer.span("update"):
+                session.update(dt)
+            with tracer.span("draw"):
+                present(session.draw(screen, mouse_pos, dt))
+        session.end_frame()
+
+    # Dump a capture/trace cut short by quitting
+    session.profiler.stop()
+    if tracer.enabled:
+        tracer.stop(args.trace if args and args.trace else None)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Mars Colony Simulator")
+    parser.add_argument("--profile-frames", type=int, default=0,
+                        help="wrap this many game frames in cProfile and dump a .pstats file")
+    parser.add_argument("--profile-rounds", type=int, default=0,
+                        help="wrap this many rounds in cProfile and dump a .pstats file")
+    parser.add_argument("--profile-start-round", type=int, default=None,
+                        help="delay the capture until this round is reached")
+    parser.add_argument("--profile-dir", default="profiles", help="directory for .pstats files")
+    parser.add_argument("--trace", default=None, metavar="PATH",
+                        help="record spans from the first frame and write Chrome trace JSON to PATH on exit")
+    parser.add_argument("--world-scale", type=int, default=1,
+                        help="make the world this many times the window size in each direction")
+    parser.add_argument("--startup-report", action="store_true",
+                        help="print import and init cost per module once the first menu frame is shown")
+    parser.add_argument("--startup-budget-ms", type=float, default=None,
+                        help="print the startup report and exit after the first menu frame "
+                             "(status 1 if it took longer than this)")
+    return parser.parse_args(argv)
+
+
+def report_startup(args):
+    """Called after the first menu flip; returns True when the run should end here (budget mode)."""
+    startup_timer.mark_first_frame()
+    if not (args.startup_report or args.startup_budget_ms is not None):
+        return False
+    print(startup_timer.report())
+    if args.startup_budget_ms is None:
+        return False
+    first_frame_ms = startup_timer.first_frame_ns / 1e6
+    if first_frame_ms > args.startup_budget_ms:
+        print(f"FAIL: first menu frame after {first_frame_ms:.1f} ms (budget {args.startup_budget_ms:.1f} ms)")
+        sys.exit(1)
+    print(f"OK: first menu frame within the {args.startup_budget_ms:.1f} ms budget")
+    return True
 
 
 def main():
-    menu = Menu(WIDTH, HEIGHT)
+    args = parse_args()
+    set_world_scale(args.world_scale)
+    with startup_timer.step("init_display"):
+        screen = init_display()
+    with startup_timer.step("Menu()"):
+        menu = Menu(WIDTH, HEIGHT)
     in_menu = True
     in_settings = False
+    first_frame = True
+    starting = False         # Start clicked, waiting for the world to finish generating
+    world_gen = WorldGenerator(COLS, ROWS, TILE_SIZE)
+    clock = pygame.time.Clock()
 
     while in_menu:
+        clock.tick(60)  # also leaves the world generator thread most of the time
         mouse_pos = pygame.mouse.get_pos()
         mouse_held = pygame.mouse.get_pressed()[0]
 
@@ -462,9 +951,11 @@ def main():
             if event.type == pygame.QUIT:
                 pygame.quit()
                 return
+            if starting:
+                continue
             result = menu.handle_events(event, in_settings=in_settings, mouse_pos=mouse_pos, mouse_held=mouse_held)
             if result == "start":
-                in_menu = False
+                starting = True
             elif result == "quit":
                 pygame.quit()
                 return
@@ -473,14 +964,26 @@ def main():
             elif result == "back":
                 in_settings = False
 
+        if starting and world_gen.done:
+            break
+
         if in_settings:
             menu.draw_settings_menu(screen)
         else:
             menu.draw_main_menu(screen)
+        if starting:
+            menu.draw_progress(screen, "Generating world...", world_gen.progress)
 
         pygame.display.flip()
+        if first_frame:
+            first_frame = False
+            if report_startup(args):
+                pygame.quit()
+                return
+            # Build the world in the background while the player looks at the menu
+            world_gen.start()
 
-    game_loop()
+    game_loop(args, world_gen.result())
 
 
 if __name__ == "__main__":
@@ -2,7 +2,8 @@ import pygame
 import noise
 import numpy as np
 import random
-from terrain import get_biome_color  
+from terrain import biome_colors
+from text_cache import get_font, render_text
 
 class Menu:
     def __init__(self, width, height, tile_size=10, num_stars=200):
@@ -13,9 +14,9 @@ class Menu:
         self.rows = height // tile_size
 
         # fonts
-        self.font_title = pygame.font.SysFont("Arial", 64, bold=True)
-        self.font_button = pygame.font.SysFont("Arial", 36, bold=True)
-        self.font_slider = pygame.font.SysFont("Arial", 28, bold=True)
+        self.font_title = get_font("Arial", 64, bold=True)
+        self.font_button = get_font("Arial", 36, bold=True)
+        self.font_slider = get_font("Arial", 28, bold=True)
 
         # Main menu buttons
         self.start_button = pygame.Rect(width // 2 - 100, height // 2 - 70, 200, 50)
@@ -47,6 +48,9 @@ class Menu:
         self.num_stars = num_stars
         self.stars = self.generate_stars()
 
+        # Stars and planet never change, so bake them once; each menu frame is then one blit
+        self.background = self.render_background()
+
     def generate_stars(self):
         stars = []
         for _ in range(self.num_stars):
@@ -57,7 +61,8 @@ class Menu:
         return stars
 
     def generate_noise_map(self):
-        noise_map = np.zeros((self.rows, self.cols))
+        """Noise for the half-sphere; -1 outside the planet. Only cells inside the ellipse are sampled."""
+        noise_map = np.full((self.rows, self.cols), -1.0)
         scale = 10.0
         octaves = 4
         persistence = 0.5
@@ -65,56 +70,46 @@ class Menu:
         x_offset = random.uniform(0, 1000)
         y_offset = random.uniform(0, 1000)
 
-        for y in range(self.rows):
-            for x in range(self.cols):
-                dx = x - self.cx
-                dy = (y - self.cy) * 0.65
-                if (dx*dx)/(self.radius_x*self.radius_x) + (dy*dy)/(self.radius_y*self.radius_y) > 1:
-                    noise_map[y][x] = -1
-                    continue
-                nx = (x + x_offset) / scale
-                ny = (y + y_offset) / scale
-                val = noise.pnoise2(nx, ny, octaves=octaves,
-                                    persistence=persistence,
-                                    lacunarity=lacunarity,
-                                    repeatx=1024, repeaty=1024, base=0)
-                noise_map[y][x] = (val + 0.5)
+        ys, xs = np.mgrid[0:self.rows, 0:self.cols]
+        dx = xs - self.cx
+        dy = (ys - self.cy) * 0.65
+        inside = (dx * dx) / (self.radius_x * self.radius_x) + (dy * dy) / (self.radius_y * self.radius_y) <= 1
+
+        # The noise package has no array API, so sample the masked cells only
+        pnoise2 = noise.pnoise2
+        for y, x in zip(*(idx.tolist() for idx in np.nonzero(inside))):
+            val = pnoise2((x + x_offset) / scale, (y + y_offset) / scale, octaves=octaves,
+                          persistence=persistence, lacunarity=lacunarity,
+                          repeatx=1024, repeaty=1024, base=0)
+            noise_map[y, x] = val + 0.5
         return noise_map
 
-    def draw_background(self, screen):
-        # Draw stars
+    def render_background(self):
+        background = pygame.Surface((self.width, self.height))
+        background.fill((0, 0, 0))
+
+        # Stars
         for x, y, color in self.stars:
-            # Ensure color is valid
-            if not color or len(color) != 3:
-                color = (255, 255, 255)
-            screen.fill(color, rect=pygame.Rect(x, y, 2, 2))
-
-        # Draw Mars half-sphere / terrain
-        for y in range(self.rows):
-            for x in range(self.cols):
-                val = self.noise_map[y][x]
-                if val is None or val < 0:
-                    continue
-                color = get_biome_color(val)
-
-                # Fallback if biome function returns invalid
-                if not color or len(color) != 3:
-                    color = (100, 100, 100)  # grey for unknown
-
-                rect = pygame.Rect(
-                    x * self.tile_size,
-                    y * self.tile_size,
-                    self.tile_size,
-                    self.tile_size
-                )
-                pygame.draw.rect(screen, color, rect)
+            background.fill(color, (x, y, 2, 2))
+
+        # Mars half-sphere: one pixel per tile, palette-mapped in one go and scaled up.
+        # Cells outside the planet (or with negative noise) stay black and are keyed out.
+        colors = biome_colors(self.noise_map)
+        colors[self.noise_map < 0] = 0
+        planet = pygame.surfarray.make_surface(colors.transpose(1, 0, 2))
+        planet = pygame.transform.scale(planet, (self.cols * self.tile_size, self.rows * self.tile_size))
+        planet.set_colorkey((0, 0, 0))
+        background.blit(planet, (0, 0))
+        return background.convert() if pygame.display.get_surface() else background
+
+    def draw_background(self, screen):
+        screen.blit(self.background, (0, 0))
 
     def draw_main_menu(self, screen):
-        screen.fill((0, 0, 0))
         self.draw_background(screen)
 
         # Title
-        title_text = self.font_title.render("Mars Colony Simulator", True, (255, 255, 255))
+        title_text = render_text(self.font_title, "Mars Colony Simulator", (255, 255, 255))
         screen.blit(title_text, (self.width // 2 - title_text.get_width() // 2, 100))
 
         # Buttons
@@ -122,9 +117,9 @@ class Menu:
         pygame.draw.rect(screen, (50, 150, 50), self.settings_button)
         pygame.draw.rect(screen, (50, 50, 200), self.quit_button)
 
-        start_text = self.font_button.render("Start Game", True, (255, 255, 255))
-        settings_text = self.font_button.render("Settings", True, (255, 255, 255))
-        quit_text = self.font_button.render("Quit", True, (255, 255, 255))
+        start_text = render_text(self.font_button, "Start Game", (255, 255, 255))
+        settings_text = render_text(self.font_button, "Settings", (255, 255, 255))
+        quit_text = render_text(self.font_button, "Quit", (255, 255, 255))
 
         screen.blit(start_text, (self.start_button.centerx - start_text.get_width() // 2,
                                  self.start_button.centery - start_text.get_height() // 2))
@@ -134,11 +129,10 @@ class Menu:
                                 self.quit_button.centery - quit_text.get_height() // 2))
 
     def draw_settings_menu(self, screen):
-        screen.fill((0, 0, 0))
         self.draw_background(screen)
 
         # Settings Title
-        title_text = self.font_title.render("Settings", True, (255, 255, 255))
+        title_text = render_text(self.font_title, "Settings", (255, 255, 255))
         screen.blit(title_text, (self.width // 2 - title_text.get_width() // 2, 100))
 
         # Audio slider
@@ -146,28 +140,37 @@ class Menu:
         handle_x = self.audio_slider_rect.x + int(self.audio_value / 100 * self.audio_slider_rect.width)
         pygame.draw.rect(screen, (255, 255, 255), (handle_x - 8, self.audio_slider_rect.y, 16, self.audio_slider_rect.height))
 
-        audio_text = self.font_slider.render(f"Game Audio: {self.audio_value}%", True, (255, 255, 255))
+        audio_text = render_text(self.font_slider, f"Game Audio: {self.audio_value}%", (255, 255, 255))
         screen.blit(audio_text, (self.audio_slider_rect.centerx - audio_text.get_width() // 2,
                                  self.audio_slider_rect.y - 30))
 
         # Resolution button
         pygame.draw.rect(screen, (50, 150, 50), self.resolution_button)
-        res_text = self.font_button.render(self.resolutions[self.res_index], True, (255, 255, 255))
+        res_text = render_text(self.font_button, self.resolutions[self.res_index], (255, 255, 255))
         screen.blit(res_text, (self.resolution_button.centerx - res_text.get_width() // 2,
                                self.resolution_button.centery - res_text.get_height() // 2))
 
         # Difficulty button
         pygame.draw.rect(screen, (50, 50, 200), self.difficulty_button)
-        diff_text = self.font_button.render(self.difficulties[self.diff_index], True, (255, 255, 255))
+        diff_text = render_text(self.font_button, self.difficulties[self.diff_index], (255, 255, 255))
         screen.blit(diff_text, (self.difficulty_button.centerx - diff_text.get_width() // 2,
                                 self.difficulty_button.centery - diff_text.get_height() // 2))
 
         # Back button
         pygame.draw.rect(screen, (150, 50, 200), self.back_button)
-        back_text = self.font_button.render("Back", True, (255, 255, 255))
+        back_text = render_text(self.font_button, "Back", (255, 255, 255))
         screen.blit(back_text, (self.back_button.centerx - back_text.get_width() // 2,
                                 self.back_button.centery - back_text.get_height() // 2))
 
+    def draw_progress(self, screen, label, fraction):
+        """Progress bar under the main menu buttons (e.g. while the world is generated)."""
+        bar = pygame.Rect(self.width // 2 - 150, self.quit_button.bottom + 40, 300, 24)
+        pygame.draw.rect(screen, (60, 60, 60), bar)
+        pygame.draw.rect(screen, (200, 50, 50), (bar.x, bar.y, int(bar.width * fraction), bar.height))
+        pygame.draw.rect(screen, (255, 255, 255), bar, 2)
+        label_text = render_text(self.font_slider, f"{label} {int(fraction * 100)}%", (255, 255, 255))
+        screen.blit(label_text, (bar.centerx - label_text.get_width() // 2, bar.bottom + 8))
+
     def handle_events(self, event, in_settings=False, mouse_pos=None, mouse_held=False):
         if in_settings:
             if event and event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
@@ -0,0 +1,175 @@
+# minimap.py
+import numpy as np
+import pygame
+from terrain import biome_colors
+
+BORDER = 2
+BUILDING_COLOR = (180, 180, 180)
+AIRLOCK_COLOR = (0, 0, 0)
+VIEW_COLOR = (255, 255, 255)
+OUT_OF_SIGHT_ALPHA = 110   # darkening of explored blocks no unit currently sees
+
+
+class Minimap:
+    def __init__(self, noise_map, resources, building_manager, base, fog, tile_size, block=2, topright=(0, 0)):
+        """
+        The whole world in a small panel: terrain, deposits, buildings, the
+        units and the camera's view.
+
+        One minimap pixel covers `block` x `block` tiles. The terrain is the
+        block average of the noise map run through the biome palette and is
+        only recomputed when the terrain changes; deposits, buildings and the
+        fog (blocks with no explored tile stay black) are painted over it only
+        when theirs do (refresh() is given the model versions). Blocks out of
+        every unit's sight are darkened. Unit dots and the view outline are
+        composed onto a copy of that only when a unit moved or the camera
+        changed, so a steady frame costs a single blit of `surface`, or
+        nothing at all while the dirty tracker sees the same `version`.
+        """
+        self.noise_map = noise_map
+        self.resources = resources
+        self.building_manager = building_manager
+        self.base = base
+        self.fog = fog
+        self.tile_size = tile_size
+        self.block = block
+        rows, cols = noise_map.shape
+        self.map_size = (cols // block, rows // block)
+        self.rect = pygame.Rect(0, 0, self.map_size[0] + 2 * BORDER, self.map_size[1] + 2 * BORDER)
+        self.rect.topright = topright
+        self.surface = pygame.Surface(self.rect.size)
+        self.version = 0
+
+        self._terrain = None        # (cols, rows, 3) block-averaged terrain colours
+        self._deposits = None       # (tile xs, tile ys, colours) of every deposit tile
+        self._buildings = None      # (building, airlock) masks over the minimap pixels
+        self._static = None         # terrain + deposits + buildings, one pixel per block
+        self._versions = (None, None, None, None)
+        self._shade = None          # darkening of the out-of-sight blocks
+        self._visible_version = None
+        self._camera_version = None
+        self._unit_count = None
+
+    # -----------------------------
+    # Static part (on model change only)
+    # -----------------------------
+    def _average_terrain(self):
+        w, h = self.map_size
+        b = self.block
+        blocks = self.noise_map[:h * b, :w * b].reshape(h, b, w, b).mean(axis=(1, 3))
+        self._terrain = biome_colors(blocks).transpose(1, 0, 2)
+
+    def _collect_deposits(self):
+        """Tile and minimap coordinates plus colour of every deposit tile, as arrays."""
+        tiles = [(x, y) + tuple(res.color) for res in self.resources for x, y in res.positions]
+        data = np.array(tiles, dtype=int).reshape(-1, 5)
+        w, h = self.map_size
+        data = data[(data[:, 0] < w * self.block) & (data[:, 1] < h * self.block)]
+        self._deposits = (data[:, 0], data[:, 1], data[:, 2:].astype(np.uint8))
+
+    def _collect_buildings(self):
+        """Minimap pixels covered by buildings and the base, with their colours."""
+        b = self.block
+        w, h = self.map_size
+        cover = np.zeros((w, h), dtype=bool)
+        airlock = np.zeros((w, h), dtype=bool)
+        for bd in self.building_manager.buildings:
+            x, y = bd["gx"] // b, bd["gy"] // b
+            mask = airlock if bd.get("type") == "Airlock" else cover
+            mask[x:x + max(bd["size"][0] // b, 1), y:y + max(bd["size"][1] // b, 1)] = True
+        base = self.base
+        half = base.size // 2
+        x, y = (base.x - half) // b, (base.y - half) // b
+        cover[x:x + max(base.size // b, 1), y:y + max(base.size // b, 1)] = True
+        self._buildings = (cover & ~airlock, airlock)
+
+    def _render_static(self):
+        """Terrain, explored deposits and buildings, blacked out where nothing was explored."""
+        colors = self._terrain.copy()
+        b = self.block
+        w, h = self.map_size
+        explored = self.fog.explored
+        tx, ty, deposit_colors = self._deposits
+        keep = explored[ty, tx] != 0
+        colors[tx[keep] // b, ty[keep] // b] = deposit_colors[keep]
+        cover, airlock = self._buildings
+        colors[cover] = BUILDING_COLOR
+        colors[airlock] = AIRLOCK_COLOR
+        seen = explored[:h * b, :w * b].reshape(h, b, w, b).max(axis=(1, 3)).T
+        colors[seen == 0] = 0
+        self._static = pygame.surfarray.make_surface(colors)
+
+    def _render_shade(self):
+        w, h = self.map_size
+        b = self.block
+        seen = self.fog.visible[:h * b, :w * b].reshape(h, b, w, b).max(axis=(1, 3)).T
+        self._shade = pygame.Surface(self.map_size, pygame.SRCALPHA)
+        self._shade.fill((0, 0, 0, 0))
+        pygame.surfarray.pixels_alpha(self._shade)[seen == 0] = OUT_OF_SIGHT_ALPHA
+
+    # -----------------------------
+    # Per frame
+    # -----------------------------
+    def refresh(self, versions, units, units_moved, camera):
+        """
+        Bring the panel up to date; `versions` is (terrain, deposits, buildings, fog).
+        Returns True when `surface` was recomposed.
+        """
+        static_changed = versions != self._versions
+        if static_changed:
+            previous = self._versions
+            if versions[0] != previous[0]:
+                self._average_terrain()
+            if versions[1] != previous[1]:
+                self._collect_deposits()
+            if versions[2] != previous[2]:
+                self._collect_buildings()
+            self._render_static()
+            self._versions = versions
+        if not (static_changed or units_moved or len(units) != self._unit_count
+                or camera.version != self._camera_version):
+            return False
+        self._unit_count = len(units)
+        self._camera_version = camera.version
+
+        surface = self.surface
+        surface.fill(VIEW_COLOR)
+        surface.fill((0, 0, 0), surface.get_rect().inflate(-2, -2))
+        surface.blit(self._static, (BORDER, BORDER))
+        if self.fog.visible_version != self._visible_version:
+            self._visible_version = self.fog.visible_version
+            self._render_shade()
+        surface.blit(self._shade, (BORDER, BORDER))
+        px = self.tile_size * self.block    # world pixels per minimap pixel
+        map_rect = pygame.Rect((BORDER, BORDER), self.map_size)
+        for u in units:
+            x, y = BORDER + int(u.x) // px, BORDER + int(u.y) // px
+            if map_rect.collidepoint(x, y):
+                surface.fill(u.color, (x - 1, y - 1, 2, 2))
+        view = camera.rect
+        outline = pygame.Rect(BORDER + view.x // px, BORDER + view.y // px,
+                              view.width // px, view.height // px).clip(map_rect)
+        pygame.draw.rect(surface, VIEW_COLOR, outline, 1)
+        self.version += 1
+        return True
+
+    def blit_args(self):
+        """(source, dest, area) drawing the panel with Surface.blits()."""
+        return self.surface, self.rect.topleft, self.surface.get_rect()
+
+    # -----------------------------
+    # Input
+    # -----------------------------
+    def to_world(self, pos):
+        """World pixel under screen position `pos` on the minimap."""
+        px = self.tile_size * self.block
+        return ((pos[0] - self.rect.x - BORDER) * px + px // 2,
+                (pos[1] - self.rect.y - BORDER) * px + px // 2)
+
+    def handle_event(self, event):
+        """World point to centre the camera on for a left click or drag, else None."""
+        if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+            return self.to_world(event.pos)
+        if event.type == pygame.MOUSEMOTION and event.buttons[0]:
+            return self.to_world(event.pos)
+        return None
@@ -0,0 +1,35 @@
+# panel_cache.py
+import pygame
+
+
+class PanelCache:
+    def __init__(self, rect):
+        """
+        Retained-mode layer for an inventory panel.
+
+        The owning panel describes what it displays as a tuple of values
+        (battery %, storage, level, metals, button states, ...). While that
+        tuple is unchanged the composed panel is blitted from this cache;
+        when it changes, the panel draws itself as usual and store() copies
+        the result back out of the target. `version` counts re-compositions.
+        """
+        self.rect = rect
+        self.surface = pygame.Surface(rect.size)
+        self.state = None
+        self.version = 0
+
+    def blit_cached(self, screen, state):
+        """Blit the cached panel if it was composed for `state`; returns True on a hit."""
+        if self.state is not None and state == self.state:
+            screen.blit(self.surface, self.rect)
+            return True
+        return False
+
+    def store(self, screen, state):
+        """Keep the panel area the owner just drew on `screen` (panels are opaque)."""
+        self.surface.blit(screen, (0, 0), self.rect)
+        self.state = state
+        self.version += 1
+
+    def invalidate(self):
+        self.state = None
@@ -1,5 +1,6 @@
 import pygame
 import random
+from text_cache import get_font, render_text
 
 class PowerGenerator:
     def __init__(self, gx, gy, size=(4, 4)):
@@ -16,6 +17,9 @@ class PowerGenerator:
         # Recharge rate for nearby units
         self.recharge_rate = 2.0   # % per second
 
+        self._pixel_rect = None
+        self._pixel_rect_tile = None
+
     # -----------------------------
     # Drawing
     # -----------------------------
@@ -29,6 +33,14 @@ class PowerGenerator:
         pygame.draw.rect(screen, (255, 255, 0), rect)
         pygame.draw.rect(screen, (255, 255, 255), rect, 2)
 
+    def pixel_rect(self, tile_size):
+        """Screen-space Rect of the generator; built once since generators never move."""
+        if self._pixel_rect_tile != tile_size:
+            self._pixel_rect_tile = tile_size
+            self._pixel_rect = pygame.Rect(self.gx * tile_size, self.gy * tile_size,
+                                           self.size[0] * tile_size, self.size[1] * tile_size)
+        return self._pixel_rect
+
     def is_clicked(self, pos, tile_size=10):
         rect = pygame.Rect(
             self.gx * tile_size,
@@ -86,7 +98,7 @@ class PowerGeneratorInventory:
         self.height = 160
         self.x = (1280 - self.width) // 2
         self.y = (720 - self.height) // 2
-        self.font = pygame.font.SysFont("Arial", 22, bold=True)
+        self.font = get_font("Arial", 22, bold=True)
         self.visible = False
 
     def update(self, dt):
@@ -107,11 +119,11 @@ class PowerGeneratorInventory:
         pygame.draw.rect(screen, (20, 20, 20), panel)
         pygame.draw.rect(screen, (255, 255, 255), panel, 3)
 
-        title_text = self.font.render("Solar Power Generator", True, (255, 255, 255))
+        title_text = render_text(self.font, "Solar Power Generator", (255, 255, 255))
         screen.blit(title_text, (self.x + 20, self.y + 15))
 
-        output_text = self.font.render(f"Power Output: {self.generator.last_output} W", True, (200, 255, 100))
+        output_text = render_text(self.font, f"Power Output: {self.generator.last_output} W", (200, 255, 100))
         screen.blit(output_text, (self.x + 20, self.y + 60))
 
-        charge_text = self.font.render(f"Stored Energy: {int(self.generator.power)}%", True, (180, 180, 255))
+        charge_text = render_text(self.font, f"Stored Energy: {int(self.generator.power)}%", (180, 180, 255))
         screen.blit(charge_text, (self.x + 20, self.y + 95))
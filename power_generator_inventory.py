@@ -1,24 +1,32 @@
 import pygame
 import random
+from text_cache import get_font, render_text
+from panel_cache import PanelCache
 
 class PowerGeneratorInventory:
-    def __init__(self, generator, dashboard):
+    def __init__(self, generator, dashboard, timers=None):
         self.generator = generator
         self.dashboard = dashboard
         self.width = 600
         self.height = 400
         self.x = (1280 - self.width) // 2
         self.y = (720 - self.height) // 2
-        self.font_title = pygame.font.SysFont("Arial", 28, bold=True)
-        self.font_text = pygame.font.SysFont("Arial", 22, bold=True)
+        self.font_title = get_font("Arial", 28, bold=True)
+        self.font_text = get_font("Arial", 22, bold=True)
 
-        # Close button
+        # Close button / panel / energy bar
         self.close_rect = pygame.Rect(self.x + self.width - 35, self.y + 5, 30, 30)
+        self.panel_rect = pygame.Rect(self.x, self.y, self.width, self.height)
+        self.panel_cache = PanelCache(self.panel_rect)
+        self.bar_rect = pygame.Rect(self.x + 20, self.y + 160, self.width - 40, 30)
+        self.fill_rect = self.bar_rect.copy()
 
-        # Flicker setup
+        # Flicker: re-read the output every fluctuation_interval seconds while open
         self.current_output = self.generator.get_output()
-        self.fluctuation_timer = 0.0
         self.fluctuation_interval = 0.3  # seconds
+        self.flicker_timer = None
+        if timers is not None:
+            self.flicker_timer = timers.every(self.fluctuation_interval, self._flicker)
 
     def handle_event(self, event):
         if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
@@ -26,47 +34,51 @@ class PowerGeneratorInventory:
                 return "close"
         return None
 
-    def update(self, dt):
-        # Update flicker timer for output display only
-        self.fluctuation_timer += dt
-        if self.fluctuation_timer >= self.fluctuation_interval:
-            self.fluctuation_timer = 0.0
-            self.current_output = self.generator.get_output()
+    def close(self):
+        if self.flicker_timer:
+            self.flicker_timer.cancel()
+            self.flicker_timer = None
 
-        # Always update dashboard to reflect current charge %
-        self.dashboard.power = int(self.generator.power)
+    def _flicker(self):
+        self.current_output = self.generator.get_output()
+
+    def panel_state(self):
+        return (round(self.current_output, 2), round(self.generator.power),
+                int(self.bar_rect.width * (self.generator.power / 100)))
 
     def draw(self, screen):
+        state = self.panel_state()
+        if self.panel_cache.blit_cached(screen, state):
+            return
+
         # Panel background
-        panel_rect = pygame.Rect(self.x, self.y, self.width, self.height)
+        panel_rect = self.panel_rect
         pygame.draw.rect(screen, (30, 30, 30), panel_rect)
         pygame.draw.rect(screen, (255, 255, 255), panel_rect, 3)
 
         # Title
-        title_text = self.font_title.render("Solar Power Generator", True, (255, 255, 255))
+        title_text = render_text(self.font_title, "Solar Power Generator", (255, 255, 255))
         screen.blit(title_text, (self.x + 20, self.y + 10))
 
         # Close X button
         pygame.draw.rect(screen, (255, 0, 0), self.close_rect)
-        x_text = self.font_title.render("X", True, (255, 255, 255))
+        x_text = render_text(self.font_title, "X", (255, 255, 255))
         screen.blit(x_text, (
             self.close_rect.x + (self.close_rect.width - x_text.get_width()) // 2,
             self.close_rect.y + (self.close_rect.height - x_text.get_height()) // 2
         ))
 
         # Power output
-        output_text = self.font_text.render(f"Power Output: {self.current_output:.2f} W", True, (200, 255, 100))
+        output_text = render_text(self.font_text, f"Power Output: {self.current_output:.2f} W", (200, 255, 100))
         screen.blit(output_text, (self.x + 20, self.y + 70))
 
         # Charge %
-        charge_text = self.font_text.render(f"Charge: {self.generator.power:.0f}%", True, (180, 180, 255))
+        charge_text = render_text(self.font_text, f"Charge: {self.generator.power:.0f}%", (180, 180, 255))
         screen.blit(charge_text, (self.x + 20, self.y + 120))
 
         # Energy bar
-        bar_width = self.width - 40
-        bar_height = 30
-        bar_x = self.x + 20
-        bar_y = self.y + 160
-        pygame.draw.rect(screen, (60, 60, 60), (bar_x, bar_y, bar_width, bar_height))
-        fill_width = int(bar_width * (self.generator.power / 100))
-        pygame.draw.rect(screen, (50, 200, 50), (bar_x, bar_y, fill_width, bar_height))
+        pygame.draw.rect(screen, (60, 60, 60), self.bar_rect)
+        self.fill_rect.width = int(self.bar_rect.width * (self.generator.power / 100))
+        pygame.draw.rect(screen, (50, 200, 50), self.fill_rect)
+
+        self.panel_cache.store(screen, state)
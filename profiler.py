@@ -0,0 +1,87 @@
+# profiler.py
+import os
+
+
+class SessionProfiler:
+    def __init__(self, out_dir="profiles", top=25):
+        """
+        Wraps N frames or N rounds of the game loop in cProfile.
+
+        request() arms a capture; it starts at the next frame (or once
+        start_round is reached) and is dumped to
+        <out_dir>/round<R>_frame<F>.pstats, named after the round and frame
+        the capture started on, followed by the top cumulative entries.
+        """
+        self.out_dir = out_dir
+        self.top = top
+        self.profile = None
+        self.pending = None      # (frames, rounds, start_round) waiting to start
+        self.frames_left = 0
+        self.end_round = None
+        self.started_at = None   # (round, frame)
+        self.last_dump = None
+
+    @property
+    def active(self):
+        return self.profile is not None
+
+    def request(self, frames=0, rounds=0, start_round=None):
+        """Arm a capture of `frames` frames or `rounds` rounds (frames wins if both are given)."""
+        if not frames and not rounds:
+            frames = 300
+        self.pending = (frames, rounds, start_round)
+
+    def toggle(self, frames=300):
+        """Hotkey behaviour: start a capture, or stop and dump the one running."""
+        if self.active:
+            self.stop()
+        else:
+            self.request(frames=frames)
+
+    # -----------------------------
+    # Loop hooks
+    # -----------------------------
+    def begin_frame(self, round_no, frame_no):
+        if self.pending and not self.active:
+            frames, rounds, start_round = self.pending
+            if start_round is None or round_no >= start_round:
+                self.pending = None
+                self.frames_left = frames
+                self.end_round = round_no + rounds if rounds and not frames else None
+                self.started_at = (round_no, frame_no)
+                import cProfile  # only loaded once a capture actually starts
+                self.profile = cProfile.Profile()
+        if self.profile:
+            self.profile.enable()
+
+    def end_frame(self, round_no, frame_no):
+        if not self.profile:
+            return
+        self.profile.disable()
+        if self.end_round is not None:
+            if round_no >= self.end_round:
+                self.stop()
+        else:
+            self.frames_left -= 1
+            if self.frames_left <= 0:
+                self.stop()
+
+    # -----------------------------
+    # Output
+    # -----------------------------
+    def stop(self):
+        if not self.profile:
+            return None
+        profile, self.profile = self.profile, None
+        profile.disable()
+
+        os.makedirs(self.out_dir, exist_ok=True)
+        round_no, frame_no = self.started_at
+        path = os.path.join(self.out_dir, f"round{round_no:03d}_frame{frame_no:06d}.pstats")
+        profile.dump_stats(path)
+        self.last_dump = path
+
+        print(f"[Profiler] Wrote {path}")
+        import pstats
+        pstats.Stats(profile).sort_stats("cumulative").print_stats(self.top)
+        return path
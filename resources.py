@@ -123,3 +123,23 @@ class ResourceDeposit:
                         break
 
         return deposits
+
+
+def probe_tiles(rect, tile_size=10):
+    """Tile range (x0, y0, x1, y1), inclusive, that a pixel Rect overlaps."""
+    return ((rect.x - tile_size) // tile_size + 1, (rect.y - tile_size) // tile_size + 1,
+            (rect.right - 1) // tile_size, (rect.bottom - 1) // tile_size)
+
+
+def deposit_under(resources, rect, tile_size=10, explored=None):
+    """
+    Return the first deposit with a tile overlapping `rect` (pixel pygame.Rect), or None.
+    Same result as colliding `rect` with a Rect per deposit tile, without building those Rects.
+    With an `explored` raster (FogOfWar.explored), tiles not yet explored are ignored.
+    """
+    x0, y0, x1, y1 = probe_tiles(rect, tile_size)
+    for res in resources:
+        for x, y in res.positions:
+            if x0 <= x <= x1 and y0 <= y <= y1 and (explored is None or explored[y, x]):
+                return res
+    return None
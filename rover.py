@@ -1,7 +1,8 @@
 import pygame
 import math
+from cargo import CargoHold
 
-class Rover:  
+class Rover(CargoHold):
     def __init__(self, x, y, speed=1.5, size=20, color=(0, 255, 0)):
         self.x = x
         self.y = y
@@ -10,6 +11,7 @@ class Rover:
         self.speed = speed
         self.size = size
         self.color = color
+        self.sight = 6                    # tiles revealed around the rover
         self.storage = 0
         self.max_storage = 5  # Max resource units rover can hold
 
@@ -30,6 +32,10 @@ class Rover:
         self.move_count = 0
         self.max_moves = 2
 
+        # Reused by draw() / is_clicked()
+        self.rect = pygame.Rect(0, 0, size, size)
+        self.bar_rect = pygame.Rect(0, 0, size, 4)
+
     # -----------------------------
     # Target and movement
     # -----------------------------
@@ -80,27 +86,44 @@ class Rover:
     # -----------------------------
     def draw(self, screen):
         # Rover body
-        rect = pygame.Rect(int(self.x - self.size // 2), int(self.y - self.size // 2),
-                           self.size, self.size)
+        rect = self.rect
+        rect.update(int(self.x - self.size // 2), int(self.y - self.size // 2), self.size, self.size)
         pygame.draw.rect(screen, self.color, rect)
 
         # Power bar background
         bar_width = self.size
-        bar_height = 4
-        bar_x = self.x - bar_width // 2
-        bar_y = self.y - self.size // 2 - 8
+        bar = self.bar_rect
+        bar.update(self.x - bar_width // 2, self.y - self.size // 2 - 8, bar_width, 4)
 
-        pygame.draw.rect(screen, (60, 60, 60), (bar_x, bar_y, bar_width, bar_height))
+        pygame.draw.rect(screen, (60, 60, 60), bar)
 
         # Power bar fill
-        fill_width = int(bar_width * (self.power / self.max_power))
+        bar.width = int(bar_width * (self.power / self.max_power))
         color = (50, 220, 50) if self.power > 30 else (220, 50, 50)
-        pygame.draw.rect(screen, color, (bar_x, bar_y, fill_width, bar_height))
+        pygame.draw.rect(screen, color, bar)
+
+    # Sprite atlas (unit_sprites.py) hooks
+    def sprite_key(self):
+        return ("rover", self.size, self.color)
+
+    def sprite_size(self):
+        return (self.size, self.size + 8)
+
+    def sprite_offset(self):
+        return (-(self.size // 2), -(self.size // 2) - 8)
+
+    def draw_sprite(self, surface, topleft, fraction, low):
+        """draw() laid out in an atlas cell: power bar on top, body 8px below it."""
+        x, y = topleft
+        pygame.draw.rect(surface, self.color, (x, y + 8, self.size, self.size))
+        pygame.draw.rect(surface, (60, 60, 60), (x, y, self.size, 4))
+        color = (220, 50, 50) if low else (50, 220, 50)
+        pygame.draw.rect(surface, color, (x, y, int(self.size * fraction), 4))
 
     # -----------------------------
     # Click detection
     # -----------------------------
     def is_clicked(self, pos):
-        rect = pygame.Rect(int(self.x - self.size // 2), int(self.y - self.size // 2),
-                           self.size, self.size)
+        rect = self.rect
+        rect.update(int(self.x - self.size // 2), int(self.y - self.size // 2), self.size, self.size)
         return rect.collidepoint(pos)
@@ -1,9 +1,14 @@
 import pygame
-import time
+from resources import deposit_under, probe_tiles
+from text_cache import get_font, render_text
+from panel_cache import PanelCache
 
 class RoverInventory:
-    def __init__(self, rover, building_manager=None, dashboard=None, units_list=None):
+    def __init__(self, rover, building_manager=None, dashboard=None, units_list=None, tile_size=10, fog=None, timers=None):
         self.rover = rover
+        self.tile_size = tile_size
+        self.fog = fog  # deposits on unexplored tiles can't be found
+        self.timers = timers  # TimerWheel that completes mining intervals
         self.building_manager = building_manager
         self.dashboard = dashboard
         self.units_list = units_list
@@ -13,14 +18,24 @@ class RoverInventory:
         self.height = 400
         self.x = (1280 - self.width) // 2
         self.y = (720 - self.height) // 2
-        self.font = pygame.font.SysFont("Arial", 24, bold=True)
+        self.font = get_font("Arial", 24, bold=True)
+
+        # Buttons (panel position is fixed, so build the Rects once)
+        self.x_rect = pygame.Rect(self.x + self.width - 35, self.y + 5, 30, 30)
+        self.mine_rect = pygame.Rect(self.x + 50, self.y + self.height - 110, self.width - 100, 45)
+        self.refine_rect = pygame.Rect(self.x + 50, self.y + self.height - 55, self.width - 100, 45)
+        self.panel_rect = pygame.Rect(self.x, self.y, self.width, self.height)
+        self.panel_cache = PanelCache(self.panel_rect)
+        self.probe_rect = pygame.Rect(0, 0, 20, 20)  # reused for resource checks
 
         # State
         self.mining = False
-        self.mining_start_time = None
+        self.mining_timer = None
+        self.mining_elapsed = 0.0  # progress towards the next unit when there is no timer wheel
         self.mine_interval = 10
         self.error_message = ""
         self.current_resource = None
+        self._probe_key = None  # what current_resource was computed for
 
         # Rover stats
         self.rover.storage = getattr(self.rover, "storage", 0)
@@ -39,35 +54,26 @@ class RoverInventory:
             mx, my = event.pos
 
             # X button
-            x_rect = pygame.Rect(self.x + self.width - 35, self.y + 5, 30, 30)
-            if x_rect.collidepoint(mx, my):
+            if self.x_rect.collidepoint(mx, my):
                 return "close"
 
             # Mine button
-            mine_rect = pygame.Rect(self.x + 50, self.y + self.height - 110, self.width - 100, 45)
-            if mine_rect.collidepoint(mx, my):
+            if self.mine_rect.collidepoint(mx, my):
                 if self.rover.storage >= self.rover.storage_capacity:
                     self.error_message = "Rover Storage is Full"
                     return None
 
                 if self.mining:
-                    self.mining = False
-                    self.error_message = ""
-                    self.rover.mining_active = False
+                    self.stop_mining()
                 else:
                     res = self.resource_under_rover(resources)
                     if res:
-                        self.mining = True
-                        self.mining_start_time = time.time()
-                        self.error_message = ""
-                        self.rover.mining_active = True
-                        self.current_resource = res
+                        self.start_mining(res)
                     else:
                         self.error_message = "No Resources to Mine"
 
             # Refine button (always visible)
-            refine_rect = pygame.Rect(self.x + 50, self.y + self.height - 55, self.width - 100, 45)
-            if refine_rect.collidepoint(mx, my):
+            if self.refine_rect.collidepoint(mx, my):
                 if self.is_over_vehicle_bay():
                     self.refine_resources()
                 else:
@@ -79,15 +85,16 @@ class RoverInventory:
     # Check resource under rover
     # -----------------------------
     def resource_under_rover(self, resources):
-        rover_rect = pygame.Rect(self.rover.x - 10, self.rover.y - 10, 20, 20)
-        for res in resources:
-            for x, y in res.positions:
-                res_rect = pygame.Rect(x * 10, y * 10, 10, 10)
-                if rover_rect.colliderect(res_rect):
-                    self.current_resource = res
-                    return res
-        self.current_resource = None
-        return None
+        self.probe_rect.update(self.rover.x - 10, self.rover.y - 10, 20, 20)
+        self._probe_key = self._probe_state()
+        self.current_resource = deposit_under(resources, self.probe_rect, self.tile_size,
+                                              self.fog.explored if self.fog else None)
+        return self.current_resource
+
+    def _probe_state(self):
+        # The answer only changes when the probe covers other tiles or the deposits change.
+        # Fog needn't be part of it: the probe is always inside the rover's own sight.
+        return probe_tiles(self.probe_rect, self.tile_size), getattr(self.dashboard, "deposit_version", None)
 
     # -----------------------------
     # Check if over Vehicle Bay
@@ -95,8 +102,8 @@ class RoverInventory:
     def is_over_vehicle_bay(self):
         if self.building_manager is None:
             return False
-        gx = int(self.rover.x // 10)
-        gy = int(self.rover.y // 10)
+        gx = int(self.rover.x // self.tile_size)
+        gy = int(self.rover.y // self.tile_size)
         for b in self.building_manager.buildings:
             if b["type"] == "Vehicle Bay":
                 bx, by = b["gx"], b["gy"]
@@ -109,32 +116,64 @@ class RoverInventory:
     # Update logic
     # -----------------------------
     def update(self, dt, resources):
-        self.resource_under_rover(resources)
+        # Without a timer wheel the mining intervals are counted here
+        if self.timers is None and self.mining:
+            self._count_mining(dt)
 
-        if self.rover.storage >= self.rover.storage_capacity:
-            self.mining = False
-            self.rover.mining_active = False
-            self.error_message = "Rover Storage is Full"
+        self.probe_rect.update(self.rover.x - 10, self.rover.y - 10, 20, 20)
+        if self._probe_state() == self._probe_key:
             return
+        if not self.resource_under_rover(resources) and self.mining:
+            self.stop_mining("No Resources to Mine")
 
-        if self.mining and self.current_resource:
-            now = time.time()
-            elapsed = now - self.mining_start_time
-            if elapsed >= self.mine_interval:
-                remaining_space = self.rover.storage_capacity - self.rover.storage
-                if remaining_space > 0:
-                    self.rover.storage += 1
-                    res_type = self.current_resource.type.lower()
-                    self.rover.resources_held[res_type] = min(
-                        self.rover.resources_held.get(res_type, 0) + 1,
-                        self.rover.storage_capacity
-                    )
-                self.mining_start_time = time.time()
-
-            if not self.resource_under_rover(resources):
-                self.mining = False
-                self.rover.mining_active = False
-                self.error_message = "No Resources to Mine"
+    # -----------------------------
+    # Mining (one unit per mine_interval, completed by a timer or counted in update())
+    # -----------------------------
+    def start_mining(self, res):
+        self.mining = True
+        self.error_message = ""
+        self.rover.mining_active = True
+        self.current_resource = res
+        self.mining_elapsed = 0.0
+        self._schedule_mining()
+
+    def stop_mining(self, message=""):
+        self.mining = False
+        self.rover.mining_active = False
+        self.error_message = message
+        if self.mining_timer:
+            self.mining_timer.cancel()
+            self.mining_timer = None
+
+    def _schedule_mining(self):
+        if self.mining_timer:
+            self.mining_timer.cancel()
+        self.mining_timer = None
+        if self.timers is not None:
+            self.mining_timer = self.timers.schedule(self.mine_interval, self._mine_tick)
+
+    def _count_mining(self, dt):
+        self.mining_elapsed += dt
+        while self.mining and self.mining_elapsed >= self.mine_interval:
+            self.mining_elapsed -= self.mine_interval
+            self._mine_tick()
+
+    def _mine_tick(self):
+        self.mining_timer = None
+        if not (self.mining and self.current_resource):
+            return
+        remaining_space = self.rover.storage_capacity - self.rover.storage
+        if remaining_space > 0:
+            self.rover.load(self.current_resource.type.lower(), 1)
+        if not self._check_storage():
+            self._schedule_mining()
+
+    def _check_storage(self):
+        """Stop mining once storage is full; returns True if it is."""
+        if self.rover.storage >= self.rover.storage_capacity:
+            self.stop_mining("Rover Storage is Full")
+            return True
+        return False
 
     # -----------------------------
     # Apply +2 mining per round & reset moves
@@ -148,12 +187,8 @@ class RoverInventory:
             remaining_space = self.rover.storage_capacity - self.rover.storage
             gain = min(gain, remaining_space)
             if gain > 0:
-                self.rover.storage += gain
-                res_type = self.current_resource.type.lower()
-                self.rover.resources_held[res_type] = min(
-                    self.rover.resources_held.get(res_type, 0) + gain,
-                    self.rover.storage_capacity
-                )
+                self.rover.load(self.current_resource.type.lower(), gain)
+            self._check_storage()
 
     # -----------------------------
     # Refine Resources (Vehicle Bay)
@@ -163,7 +198,7 @@ class RoverInventory:
             self.error_message = "Must be over Vehicle Bay to refine"
             return
 
-        for res_type, amount in self.rover.resources_held.items():
+        for res_type, amount in self.rover.unload().items():
             key = res_type.lower()
             if key == "iron":
                 self.dashboard.metals += amount
@@ -172,25 +207,34 @@ class RoverInventory:
             elif key == "marsium":
                 self.dashboard.marsium += amount
 
-        self.rover.resources_held = {}
-        self.rover.storage = 0
         self.error_message = "Resources Refined!"
 
+    def panel_state(self):
+        """Everything draw() displays; the cached panel is reused while this is unchanged."""
+        rover = self.rover
+        return (round(rover.power), self.current_resource.type if self.current_resource else None,
+                rover.move_count, rover.max_moves, rover.storage, rover.storage_capacity,
+                tuple(rover.resources_held.items()), self.mining, self.error_message)
+
     # -----------------------------
     # Draw UI
     # -----------------------------
     def draw(self, screen, resources):
-        panel_rect = pygame.Rect(self.x, self.y, self.width, self.height)
+        state = self.panel_state()
+        if self.panel_cache.blit_cached(screen, state):
+            return
+
+        panel_rect = self.panel_rect
         pygame.draw.rect(screen, (0, 0, 0), panel_rect)
         pygame.draw.rect(screen, (255, 255, 255), panel_rect, 3)
 
-        title_text = self.font.render("Rover Inventory", True, (255, 255, 255))
+        title_text = render_text(self.font, "Rover Inventory", (255, 255, 255))
         screen.blit(title_text, (self.x + (self.width - title_text.get_width()) // 2, self.y + 10))
 
         # X button
-        x_rect = pygame.Rect(self.x + self.width - 35, self.y + 5, 30, 30)
+        x_rect = self.x_rect
         pygame.draw.rect(screen, (255, 0, 0), x_rect)
-        x_text = self.font.render("X", True, (255, 255, 255))
+        x_text = render_text(self.font, "X", (255, 255, 255))
         screen.blit(x_text, (x_rect.x + (x_rect.width - x_text.get_width()) // 2,
                              x_rect.y + (x_rect.height - x_text.get_height()) // 2))
 
@@ -204,34 +248,36 @@ class RoverInventory:
 
         ]
         for i, line in enumerate(lines):
-            txt = self.font.render(line, True, (255, 255, 255))
+            txt = render_text(self.font, line, (255, 255, 255))
             screen.blit(txt, (self.x + 20, self.y + 50 + i * 28))
 
         # Held resources
         if self.rover.resources_held:
             y_offset = self.y + 50 + len(lines)*28 + 5
             for res_type, amt in self.rover.resources_held.items():
-                txt = self.font.render(f"+{amt} {res_type.capitalize()}", True, (0, 255, 0))
+                txt = render_text(self.font, f"+{amt} {res_type.capitalize()}", (0, 255, 0))
                 screen.blit(txt, (self.x + 40, y_offset))
                 y_offset += 28
 
         # Mine button
-        mine_rect = pygame.Rect(self.x + 50, self.y + self.height - 110, self.width - 100, 45)
+        mine_rect = self.mine_rect
         pygame.draw.rect(screen, (0, 255, 0) if not self.mining else (255, 0, 0), mine_rect)
         mine_text = "Mine" if not self.mining else "Stop Mining"
-        txt = self.font.render(mine_text, True, (255, 255, 255))
+        txt = render_text(self.font, mine_text, (255, 255, 255))
         screen.blit(txt, (mine_rect.x + (mine_rect.width - txt.get_width()) // 2,
                           mine_rect.y + (mine_rect.height - txt.get_height()) // 2))
 
         # Refine button (always visible)
-        refine_rect = pygame.Rect(self.x + 50, self.y + self.height - 55, self.width - 100, 45)
+        refine_rect = self.refine_rect
         pygame.draw.rect(screen, (100, 200, 255), refine_rect)
-        txt = self.font.render("Refine", True, (0, 0, 0))
+        txt = render_text(self.font, "Refine", (0, 0, 0))
         screen.blit(txt, (refine_rect.x + (refine_rect.width - txt.get_width()) // 2,
                           refine_rect.y + (refine_rect.height - txt.get_height()) // 2))
 
         # Error message
         if self.error_message:
-            err_txt = self.font.render(self.error_message, True, (255, 100, 100))
+            err_txt = render_text(self.font, self.error_message, (255, 100, 100))
             screen.blit(err_txt, (self.x + (self.width - err_txt.get_width()) // 2,
                                   self.y + self.height - 160))
+
+        self.panel_cache.store(screen, state)
@@ -0,0 +1,148 @@
+# soak.py
+"""
+Long-run memory growth detector.
+
+Plays thousands of headless rounds, takes a tracemalloc snapshot every K
+rounds and reports the allocation sites and object types that keep growing.
+Exits with code 1 when traced memory grows faster than the allowed bytes
+per round (least-squares slope over the snapshots after warmup).
+
+Usage:
+    python soak.py                                   # 2000 rounds, snapshot every 100
+    python soak.py --rounds 5000 --every 250 --max-bytes-per-round 512
+    python soak.py --units 50 --draw-every 10        # also exercise drawing
+"""
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import argparse
+import gc
+import random
+import sys
+import tracemalloc
+from collections import Counter
+
+import pygame
+
+import main as game
+from main import GameSession, TILE_SIZE, COLS, ROWS
+
+DT = 1 / 60
+TRACE_FILTERS = [
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+    tracemalloc.Filter(False, __file__),  # the soak runner's own bookkeeping
+]
+
+
+def object_counts():
+    gc.collect()
+    return Counter(type(o).__name__ for o in gc.get_objects()
+                   if type(o).__module__ != "tracemalloc")
+
+
+def slope(points):
+    """Least-squares slope of [(x, y), ...]."""
+    n = len(points)
+    if n < 2:
+        return 0.0
+    mean_x = sum(x for x, _ in points) / n
+    mean_y = sum(y for _, y in points) / n
+    var = sum((x - mean_x) ** 2 for x, _ in points)
+    if not var:
+        return 0.0
+    return sum((x - mean_x) * (y - mean_y) for x, y in points) / var
+
+
+def build_session(units, seed):
+    random.seed(seed)
+    game.init_display()
+    session = GameSession()
+    for i in range(units):
+        x = random.randint(0, COLS * TILE_SIZE - 1)
+        y = random.randint(0, ROWS * TILE_SIZE - 1)
+        unit = session.add_rover(x, y) if i % 2 == 0 else session.add_drone(x, y)
+        unit.set_target((random.randint(0, COLS * TILE_SIZE - 1), random.randint(0, ROWS * TILE_SIZE - 1)))
+    return session
+
+
+def play_round(session, frames_per_round, draw):
+    for _ in range(frames_per_round):
+        session.process_events(pygame.event.get())
+        session.update(DT)
+        if draw:
+            session.draw(game.screen, (0, 0), DT)
+    # Let the round's timed effects run out, so the event popup closes and the next event can fire
+    session.timers.advance(session.event_manager.duration)
+    # Keep units busy so movement/mining paths stay live
+    for u in session.units:
+        if random.random() < 0.3:
+            u.set_target((random.randint(0, COLS * TILE_SIZE - 1), random.randint(0, ROWS * TILE_SIZE - 1)))
+    session.advance_round()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Soak test: detect per-round memory growth")
+    parser.add_argument("--rounds", type=int, default=2000)
+    parser.add_argument("--every", type=int, default=100, help="snapshot every K rounds")
+    parser.add_argument("--warmup", type=int, default=50, help="rounds before the baseline snapshot")
+    parser.add_argument("--frames-per-round", type=int, default=3)
+    parser.add_argument("--draw-every", type=int, default=0, help="draw frames every N rounds (0 = never)")
+    parser.add_argument("--units", type=int, default=20)
+    parser.add_argument("--top", type=int, default=10, help="allocation sites / types to report")
+    parser.add_argument("--max-bytes-per-round", type=float, default=1024.0,
+                        help="fail when traced memory grows faster than this")
+    parser.add_argument("--seed", type=int, default=1234)
+    args = parser.parse_args()
+
+    session = build_session(args.units, args.seed)
+    session.dashboard.rounds_total = args.warmup + args.rounds + 2
+
+    print(f"Warming up for {args.warmup} rounds...")
+    for r in range(args.warmup):
+        play_round(session, args.frames_per_round, args.draw_every and r % args.draw_every == 0)
+
+    baseline_objects = object_counts()
+    tracemalloc.start(10)
+    baseline = tracemalloc.take_snapshot().filter_traces(TRACE_FILTERS)
+    samples = [(0, tracemalloc.get_traced_memory()[0])]
+
+    for r in range(1, args.rounds + 1):
+        play_round(session, args.frames_per_round, args.draw_every and r % args.draw_every == 0)
+        if r % args.every == 0:
+            gc.collect()
+            current = tracemalloc.get_traced_memory()[0]
+            samples.append((r, current))
+            print(f"round {r:>6}: traced {current / 1024:9.1f} KB, "
+                  f"{len(session.resources)} deposits, {len(session.building_manager.buildings)} buildings")
+
+    gc.collect()
+    final = tracemalloc.take_snapshot().filter_traces(TRACE_FILTERS)
+    tracemalloc.stop()
+    final_objects = object_counts()
+
+    print(f"\nTop {args.top} growing allocation sites:")
+    for stat in final.compare_to(baseline, "lineno")[:args.top]:
+        if stat.size_diff <= 0:
+            break
+        frame = stat.traceback[0]
+        print(f"  {stat.size_diff / 1024:+9.1f} KB  {stat.count_diff:+7d} blocks  {frame.filename}:{frame.lineno}")
+
+    print(f"\nTop {args.top} object-count deltas by type:")
+    deltas = Counter({name: final_objects[name] - baseline_objects.get(name, 0) for name in final_objects})
+    for name, delta in deltas.most_common(args.top):
+        if delta <= 0:
+            break
+        print(f"  {delta:+9d}  {name}")
+
+    growth = slope(samples)
+    print(f"\nMemory growth: {growth:.1f} bytes/round (limit {args.max_bytes_per_round:.1f})")
+    if growth > args.max_bytes_per_round:
+        print("FAIL: memory per round grows beyond the threshold")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
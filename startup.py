@@ -0,0 +1,97 @@
+# startup.py
+"""
+Cold-start accounting: import cost per module and named init steps, measured
+from the moment main.py starts executing until the first menu frame is shown.
+
+    python main.py --startup-report             # print the breakdown, keep playing
+    python main.py --startup-budget-ms 400      # print it and exit (status 1 if over budget)
+
+main.py imports this module first so the import hook sees everything after it.
+"""
+import builtins
+import sys
+import time
+from contextlib import contextmanager
+
+STARTUP_FLAGS = ("--startup-report", "--startup-budget-ms")
+
+
+class StartupTimer:
+    def __init__(self):
+        self.origin = time.perf_counter_ns()
+        self.enabled = False
+        self.imports = []        # [depth, name, inclusive_ns, self_ns] in import order
+        self.steps = []          # (name, duration_ns)
+        self.first_frame_ns = None
+        self._stack = []
+        self._original_import = None
+
+    def enable_from_argv(self, argv):
+        if any(arg.startswith(STARTUP_FLAGS) for arg in argv):
+            self.enable()
+
+    def enable(self):
+        if self.enabled:
+            return
+        self.enabled = True
+        self._original_import = builtins.__import__
+        builtins.__import__ = self._import
+
+    def disable(self):
+        if not self.enabled:
+            return
+        self.enabled = False
+        builtins.__import__ = self._original_import
+
+    # -----------------------------
+    # Recording
+    # -----------------------------
+    def _import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        # Only first-time absolute imports cost anything worth reporting
+        if level or name in sys.modules:
+            return self._original_import(name, globals, locals, fromlist, level)
+        entry = [len(self._stack), name, 0, 0]
+        self.imports.append(entry)
+        self._stack.append(0)
+        start = time.perf_counter_ns()
+        try:
+            return self._original_import(name, globals, locals, fromlist, level)
+        finally:
+            elapsed = time.perf_counter_ns() - start
+            children = self._stack.pop()
+            if self._stack:
+                self._stack[-1] += elapsed
+            entry[2] = elapsed
+            entry[3] = elapsed - children
+
+    @contextmanager
+    def step(self, name):
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.steps.append((name, time.perf_counter_ns() - start))
+
+    def mark_first_frame(self):
+        if self.first_frame_ns is None:
+            self.first_frame_ns = time.perf_counter_ns() - self.origin
+            self.disable()
+
+    # -----------------------------
+    # Reporting
+    # -----------------------------
+    def report(self, max_depth=1):
+        lines = []
+        if self.first_frame_ns is not None:
+            lines.append(f"First menu frame after {self.first_frame_ns / 1e6:.1f} ms")
+        lines.append(f"{'import':<40}{'total ms':>10}{'self ms':>10}")
+        for depth, name, inclusive, own in self.imports:
+            if depth <= max_depth:
+                lines.append(f"{'  ' * depth + name:<40}{inclusive / 1e6:>10.1f}{own / 1e6:>10.1f}")
+        lines.append(f"{'init step':<40}{'ms':>10}")
+        for name, duration in self.steps:
+            lines.append(f"{name:<40}{duration / 1e6:>10.1f}")
+        return "\n".join(lines)
+
+
+startup_timer = StartupTimer()
@@ -27,10 +27,25 @@ def get_biome_color(value):
     else:
         return lerp_color((180, 180, 180), (230, 230, 230), (value - 0.85) / 0.15)
 
-def generate_noise_map(rows, cols):
-    """Generate a normalized 2D noise map."""
+# Segment starts/widths and end colors of get_biome_color, for the array version below
+BIOME_STARTS = np.array([0.0, 0.35, 0.55, 0.7, 0.85])
+BIOME_WIDTHS = np.array([0.35, 0.2, 0.15, 0.15, 0.15])
+BIOME_LOW = np.array([(110, 40, 30), (200, 90, 50), (210, 160, 120), (70, 60, 55), (180, 180, 180)], dtype=float)
+BIOME_HIGH = np.array([(180, 60, 40), (230, 130, 70), (235, 190, 150), (130, 120, 115), (230, 230, 230)], dtype=float)
+
+def biome_colors(values):
+    """get_biome_color over a whole array at once: (rows, cols) floats -> (rows, cols, 3) uint8."""
+    seg = np.searchsorted(BIOME_STARTS[1:], values, side="right")
+    t = ((values - BIOME_STARTS[seg]) / BIOME_WIDTHS[seg])[..., None]
+    low = BIOME_LOW[seg]
+    return np.clip(low + (BIOME_HIGH[seg] - low) * t, 0, 255).astype(np.uint8)
+
+def generate_noise_map(rows, cols, progress=None):
+    """Generate a normalized 2D noise map; progress(fraction) is called after each row."""
     noise_map = np.zeros((rows, cols))
     for y in range(rows):
+        if progress:
+            progress(y / rows)
         for x in range(cols):
             nx = (x + X_OFFSET) / SCALE
             ny = (y + Y_OFFSET) / SCALE
@@ -45,11 +60,17 @@ def generate_noise_map(rows, cols):
     max_val = np.max(noise_map)
     return (noise_map - min_val) / (max_val - min_val + 1e-8)
 
-def draw_terrain(screen, noise_map, tile_size):
-    """Draw the terrain on the screen."""
+def draw_terrain(screen, noise_map, tile_size, area=None):
+    """Draw the terrain on the screen (only the tiles overlapping the pixel Rect `area`, if given)."""
     rows, cols = noise_map.shape
-    for y in range(rows):
-        for x in range(cols):
-            color = get_biome_color(noise_map[y][x])
-            rect = pygame.Rect(x * tile_size, y * tile_size, tile_size, tile_size)
-            pygame.draw.rect(screen, color, rect)
+    x0, y0, x1, y1 = 0, 0, cols, rows
+    if area is not None:
+        x0, y0 = max(area.left // tile_size, 0), max(area.top // tile_size, 0)
+        x1, y1 = min(-(-area.right // tile_size), cols), min(-(-area.bottom // tile_size), rows)
+    rect = pygame.Rect(0, 0, tile_size, tile_size)  # one Rect moved across the grid
+    for y in range(y0, y1):
+        row = noise_map[y]
+        rect.y = y * tile_size
+        for x in range(x0, x1):
+            rect.x = x * tile_size
+            screen.fill(get_biome_color(row[x]), rect)
@@ -0,0 +1,80 @@
+# text_cache.py
+"""
+Shared font registry and text-surface cache for all UI text.
+
+    font = get_font("Arial", 24, bold=True)
+    surf = render_text(font, "Food: 15", (255, 255, 255))
+    draw_text(screen, font, "Food: 15", (255, 255, 255), (x, y), outline_color=(0, 0, 0))
+
+Outlined text is pre-composited once (8 outline copies + the fill) into a
+single surface, so steady-state text costs one blit per line.
+"""
+from collections import OrderedDict
+import pygame
+
+_fonts = {}
+
+
+def get_font(name, size, bold=False):
+    """Return a shared SysFont; the system font lookup only happens once per (name, size, bold)."""
+    key = (name, size, bold)
+    font = _fonts.get(key)
+    if font is None:
+        font = _fonts[key] = pygame.font.SysFont(name, size, bold=bold)
+    return font
+
+
+class TextCache:
+    def __init__(self, max_entries=512):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, font, text, color, outline_color=None, outline_width=1):
+        """Cached surface for `text`; outlined surfaces are padded by outline_width on every side."""
+        key = (font, text, color, outline_color, outline_width if outline_color else 0)
+        surf = self._entries.get(key)
+        if surf is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return surf
+
+        self.misses += 1
+        surf = self._compose(font, text, color, outline_color, outline_width)
+        self._entries[key] = surf
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return surf
+
+    def _compose(self, font, text, color, outline_color, outline_width):
+        fill = font.render(text, True, color)
+        if not outline_color:
+            return fill
+
+        outline = font.render(text, True, outline_color)
+        w = outline_width
+        surf = pygame.Surface((fill.get_width() + 2 * w, fill.get_height() + 2 * w), pygame.SRCALPHA)
+        for dx in (-w, 0, w):
+            for dy in (-w, 0, w):
+                if dx or dy:
+                    surf.blit(outline, (w + dx, w + dy))
+        surf.blit(fill, (w, w))
+        return surf
+
+    def clear(self):
+        self._entries.clear()
+
+
+text_cache = TextCache()
+
+
+def render_text(font, text, color, outline_color=None, outline_width=1):
+    return text_cache.render(font, text, color, outline_color, outline_width)
+
+
+def draw_text(screen, font, text, color, pos, outline_color=None, outline_width=1):
+    """Blit cached text with its fill's top-left at `pos`; returns the blitted Rect."""
+    surf = text_cache.render(font, text, color, outline_color, outline_width)
+    offset = outline_width if outline_color else 0
+    return screen.blit(surf, (pos[0] - offset, pos[1] - offset))
@@ -0,0 +1,115 @@
+# timers.py
+import math
+
+SLOT_BITS = 6
+SLOTS = 1 << SLOT_BITS      # slots per wheel level
+SLOT_MASK = SLOTS - 1
+LEVELS = 4                  # 64**4 ticks (about 77 hours at 60 ticks/s) before the overflow bucket
+
+
+class Timer:
+    def __init__(self, wheel, tick, callback, interval=None):
+        """A pending callback due at `tick`; repeating timers carry their `interval` in ticks."""
+        self.wheel = wheel
+        self.tick = tick
+        self.callback = callback
+        self.interval = interval
+        self.cancelled = False
+        self.slot = None            # the wheel slot (dict) the timer currently sits in
+
+    def cancel(self):
+        """Drop the timer (also stops a repeating one); safe to call more than once or from its callback."""
+        self.cancelled = True
+        if self.slot is not None:
+            del self.slot[self]
+            self.slot = None
+            self.wheel._count -= 1
+
+
+class TimerWheel:
+    def __init__(self, resolution=1 / 60):
+        """
+        Callbacks due at a point in simulation time, on a hierarchical timing wheel.
+
+        `now` is the sum of the dt passed to advance(), so timers follow the
+        game's clock rather than the wall clock, rounded up to whole ticks of
+        `resolution` seconds. Level k has SLOTS slots of SLOTS**k ticks each;
+        a timer goes into the lowest level whose span covers its delay, and
+        is moved down a level when the level below wraps around to its slot.
+        Each slot is a dict, so schedule() and cancel() are O(1), and
+        advancing by one tick touches one slot (plus an occasional cascade)
+        however many timers are pending.
+        """
+        self.resolution = resolution
+        self.now = 0.0
+        self.tick = 0               # last tick processed
+        self._levels = [[{} for _ in range(SLOTS)] for _ in range(LEVELS)]
+        self._overflow = {}
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    def schedule(self, delay, callback):
+        """Call callback() once `delay` seconds of simulation time have passed; returns the Timer."""
+        tick = max(self.tick + 1, math.ceil((self.now + delay) / self.resolution - 1e-9))
+        return self._place(Timer(self, tick, callback))
+
+    def every(self, interval, callback):
+        """Call callback() every `interval` seconds until the returned Timer is cancelled."""
+        ticks = max(1, round(interval / self.resolution))
+        return self._place(Timer(self, self.tick + ticks, callback, ticks))
+
+    def _place(self, timer):
+        delta = timer.tick - self.tick
+        slot = self._overflow
+        for level in range(LEVELS):
+            if delta < SLOTS << (SLOT_BITS * level):
+                slot = self._levels[level][(timer.tick >> (SLOT_BITS * level)) & SLOT_MASK]
+                break
+        slot[timer] = None
+        timer.slot = slot
+        self._count += 1
+        return timer
+
+    def _take(self, slot):
+        """Empty a slot, returning its timers in scheduling order."""
+        timers = list(slot)
+        slot.clear()
+        for timer in timers:
+            timer.slot = None
+        self._count -= len(timers)
+        return timers
+
+    # -----------------------------
+    # Clock
+    # -----------------------------
+    def advance(self, dt):
+        """Move the clock on by dt and run every callback that came due, in due order."""
+        self.now += dt
+        target = int(self.now / self.resolution + 1e-9)
+        while self.tick < target:
+            if not self._count:
+                self.tick = target  # nothing pending; skip the empty ticks
+                break
+            self.tick += 1
+            self._run_tick(self.tick)
+
+    def _run_tick(self, tick):
+        # When a level wraps, the next level's current slot is spread over the levels below
+        for level in range(1, LEVELS):
+            if tick & ((1 << (SLOT_BITS * level)) - 1):
+                break
+            for timer in self._take(self._levels[level][(tick >> (SLOT_BITS * level)) & SLOT_MASK]):
+                self._place(timer)
+        else:
+            for timer in self._take(self._overflow):
+                self._place(timer)
+
+        for timer in self._take(self._levels[0][tick & SLOT_MASK]):
+            if timer.cancelled:     # cancelled by an earlier callback this tick
+                continue
+            timer.callback()
+            if timer.interval and not timer.cancelled:
+                timer.tick = tick + timer.interval
+                self._place(timer)
@@ -0,0 +1,143 @@
+# tracing.py
+"""
+Span tracing for the game loop, exported as Chrome trace JSON
+(open in chrome://tracing or https://ui.perfetto.dev).
+
+    from tracing import tracer
+
+    with tracer.span("update"):
+        ...
+
+Spans are written into a preallocated ring buffer; nothing is allocated
+per span and a disabled tracer returns a shared no-op context.
+"""
+import json
+import os
+import threading
+import time
+
+
+class _NullSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    """Reusable span slot; one per nesting depth."""
+    __slots__ = ("tracer", "name", "cat", "start")
+
+    def __init__(self, tracer):
+        self.tracer = tracer
+        self.name = None
+        self.cat = None
+        self.start = 0
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end = time.perf_counter_ns()
+        self.tracer._record(self.name, self.cat, self.start, end - self.start)
+        self.tracer._depth -= 1
+        return False
+
+
+class Tracer:
+    def __init__(self, capacity=200000, max_depth=32):
+        self.enabled = False
+        self.capacity = capacity
+        self.names = None        # ring buffers, allocated by the first start()
+        self.cats = None
+        self.starts = None
+        self.durations = None
+        self.threads = None
+        self.count = 0           # total spans recorded since the last clear
+        self._depth = 0
+        self._slots = [_Span(self) for _ in range(max_depth)]
+        self._origin = time.perf_counter_ns()
+
+    # -----------------------------
+    # Recording
+    # -----------------------------
+    def span(self, name, cat="game"):
+        if not self.enabled or self._depth >= len(self._slots):
+            return _NULL_SPAN
+        slot = self._slots[self._depth]
+        self._depth += 1
+        slot.name = name
+        slot.cat = cat
+        return slot
+
+    def _record(self, name, cat, start, duration):
+        i = self.count % self.capacity
+        self.names[i] = name
+        self.cats[i] = cat
+        self.starts[i] = start
+        self.durations[i] = duration
+        self.threads[i] = threading.get_ident()
+        self.count += 1
+
+    def start(self):
+        if self.names is None:
+            capacity = self.capacity
+            self.names = [None] * capacity
+            self.cats = [None] * capacity
+            self.starts = [0] * capacity
+            self.durations = [0] * capacity
+            self.threads = [0] * capacity
+        self.clear()
+        self.enabled = True
+
+    def clear(self):
+        self.count = 0
+        self._depth = 0
+        self._origin = time.perf_counter_ns()
+
+    # -----------------------------
+    # Export
+    # -----------------------------
+    def events(self):
+        """Recorded spans as Chrome trace "complete" events, oldest first."""
+        total = min(self.count, self.capacity)
+        first = self.count - total
+        pid = os.getpid()
+        events = []
+        for n in range(first, self.count):
+            i = n % self.capacity
+            events.append({
+                "name": self.names[i],
+                "cat": self.cats[i],
+                "ph": "X",
+                "ts": (self.starts[i] - self._origin) / 1000,
+                "dur": self.durations[i] / 1000,
+                "pid": pid,
+                "tid": self.threads[i],
+            })
+        return events
+
+    def flush(self, path):
+        """Write the buffer to `path` as Chrome trace JSON and return the path."""
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        with open(path, "w") as f:
+            json.dump({"traceEvents": self.events(), "displayTimeUnit": "ms"}, f)
+        print(f"[Tracing] Wrote {min(self.count, self.capacity)} spans to {path}")
+        return path
+
+    def stop(self, path=None):
+        """Stop recording and flush to `path` (default traces/trace_<time>.json)."""
+        self.enabled = False
+        if path is None:
+            path = os.path.join("traces", time.strftime("trace_%Y%m%d_%H%M%S.json"))
+        return self.flush(path)
+
+
+tracer = Tracer()
@@ -0,0 +1,83 @@
+# ui_router.py
+import pygame
+
+MOUSE_EVENTS = (pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP, pygame.MOUSEMOTION)
+
+
+class UIRegion:
+    __slots__ = ("name", "z", "rect_fn", "handler")
+
+    def __init__(self, name, z, rect_fn, handler):
+        self.name = name
+        self.z = z
+        self.rect_fn = rect_fn      # returns the region's Rect, or None while hidden
+        self.handler = handler      # handler(event) -> True when it consumed the event
+
+
+class UIRouter:
+    def __init__(self, width, height, cell_size=80):
+        """
+        Routes mouse events to the topmost interactive region under the cursor.
+
+        Regions are registered once with a z order; a region is hidden while
+        its rect_fn returns None. The visible rects are bucketed into a
+        coarse grid, rebuilt only when a region opens, closes or moves, so
+        a click only tests the few regions overlapping its cell. A handler
+        that returns False lets the event fall through to the region below.
+        """
+        self.cell_size = cell_size
+        self.cols = width // cell_size + 1
+        self.rows = height // cell_size + 1
+        self.regions = []
+        self._rects = None
+        self._cells = {}
+
+    def add(self, name, z, rect_fn, handler):
+        self.regions.append(UIRegion(name, z, rect_fn, handler))
+        self.regions.sort(key=lambda r: -r.z)
+        self._rects = None
+
+    def remove(self, name):
+        self.regions = [r for r in self.regions if r.name != name]
+        self._rects = None
+
+    # -----------------------------
+    # Hit-test index
+    # -----------------------------
+    def _refresh(self):
+        rects = tuple(r.rect_fn() for r in self.regions)
+        if rects == self._rects:
+            return
+        rects = tuple(rect.copy() if rect else None for rect in rects)  # rects may be moved in place later
+        self._rects = rects
+        cells = {}
+        cs = self.cell_size
+        for i, rect in enumerate(rects):   # regions are already topmost first
+            if rect is None:
+                continue
+            x0 = max(rect.left // cs, 0)
+            x1 = min((rect.right - 1) // cs, self.cols - 1)
+            y0 = max(rect.top // cs, 0)
+            y1 = min((rect.bottom - 1) // cs, self.rows - 1)
+            for cx in range(x0, x1 + 1):
+                for cy in range(y0, y1 + 1):
+                    cells.setdefault((cx, cy), []).append(i)
+        self._cells = cells
+
+    def hit_test(self, pos):
+        """Visible regions containing `pos`, topmost first."""
+        self._refresh()
+        candidates = self._cells.get((pos[0] // self.cell_size, pos[1] // self.cell_size), ())
+        return [self.regions[i] for i in candidates if self._rects[i].collidepoint(pos)]
+
+    # -----------------------------
+    # Dispatch
+    # -----------------------------
+    def route(self, event):
+        """Deliver a mouse event top-down until a region consumes it; returns the consuming region's name."""
+        if event.type not in MOUSE_EVENTS:
+            return None
+        for region in self.hit_test(event.pos):
+            if region.handler(event):
+                return region.name
+        return None
@@ -1,19 +1,30 @@
 import pygame
-import time
+from text_cache import get_font, render_text
+from panel_cache import PanelCache
 
 class VehicleBayInventory:
-    def __init__(self, vehicle_bay, dashboard):
+    def __init__(self, vehicle_bay, dashboard, production=None):
         self.vehicle_bay = vehicle_bay
         self.dashboard = dashboard
         self.width = 600
         self.height = 450
         self.x = (1280 - self.width) // 2
         self.y = (720 - self.height) // 2
-        self.font = pygame.font.SysFont("Arial", 22, bold=True)
+        self.font = get_font("Arial", 22, bold=True)
         self.error_message = ""
-        self.build_queue = []
+        self.production = production  # ConstructionScheduler shared by all vehicle bays
         self.rover_cost = 5
         self.drone_cost = 10
+        self.rover_rounds = 1
+        self.drone_rounds = 2
+
+        # Buttons (panel position is fixed, so build the Rects once)
+        self.panel_rect = pygame.Rect(self.x, self.y, self.width, self.height)
+        self.panel_cache = PanelCache(self.panel_rect)
+        self.x_rect = pygame.Rect(self.x + self.width - 35, self.y + 5, 30, 30)
+        self.rover_btn = pygame.Rect(self.x + 20, self.y + 60, self.width - 40, 50)
+        self.drone_btn = pygame.Rect(self.x + 20, self.y + 130, self.width - 40, 50)
+        self.bar_rect = pygame.Rect(0, 0, 0, 0)  # reused for production queue bars
 
     def handle_event(self, event):
         """Returns one of: 'buy_rover', 'buy_drone', 'close', or None"""
@@ -21,64 +32,91 @@ class VehicleBayInventory:
             mx, my = event.pos
 
             # X button (close)
-            x_rect = pygame.Rect(self.x + self.width - 35, self.y + 5, 30, 30)
-            if x_rect.collidepoint(mx, my):
+            if self.x_rect.collidepoint(mx, my):
                 return "close"
 
             # Buttons
-            rover_btn = pygame.Rect(self.x + 20, self.y + 60, self.width - 40, 50)
-            drone_btn = pygame.Rect(self.x + 20, self.y + 130, self.width - 40, 50)
-
-            if rover_btn.collidepoint(mx, my):
+            if self.rover_btn.collidepoint(mx, my):
                 return "buy_rover"
 
-            if drone_btn.collidepoint(mx, my):
+            if self.drone_btn.collidepoint(mx, my):
                 return "buy_drone"
 
         return None
 
-    def update(self):
-        now = time.time()
-        finished = [v for v in self.build_queue if v[1] <= now]
-        for v in finished:
-            self.build_queue = [q for q in self.build_queue if q[1] > now]
+    def queue_rows(self):
+        if self.production is None or self.dashboard is None:
+            return ()
+        return self.production.rows(self.dashboard.current_round)
+
+    def panel_state(self):
+        return (self.rover_cost, self.drone_cost, getattr(self.dashboard, 'metals', 0), self.error_message,
+                self.queue_rows())
 
     def draw(self, screen):
+        state = self.panel_state()
+        if self.panel_cache.blit_cached(screen, state):
+            return
+
         # Panel background
-        panel_rect = pygame.Rect(self.x, self.y, self.width, self.height)
+        panel_rect = self.panel_rect
         pygame.draw.rect(screen, (20, 20, 20), panel_rect)
         pygame.draw.rect(screen, (255, 255, 255), panel_rect, 3)
 
         # Title
-        title_text = self.font.render("Vehicle Bay", True, (255, 255, 255))
+        title_text = render_text(self.font, "Vehicle Bay", (255, 255, 255))
         screen.blit(title_text, (self.x + 20, self.y + 10))
 
         # Close button (X)
-        x_rect = pygame.Rect(self.x + self.width - 35, self.y + 5, 30, 30)
+        x_rect = self.x_rect
         pygame.draw.rect(screen, (255, 0, 0), x_rect)
-        x_text = self.font.render("X", True, (255, 255, 255))
+        x_text = render_text(self.font, "X", (255, 255, 255))
         screen.blit(x_text, (
             x_rect.x + (x_rect.width - x_text.get_width()) // 2,
             x_rect.y + (x_rect.height - x_text.get_height()) // 2
         ))
 
         # Rover Button
-        rover_btn = pygame.Rect(self.x + 20, self.y + 60, self.width - 40, 50)
+        rover_btn = self.rover_btn
         pygame.draw.rect(screen, (60, 60, 60), rover_btn)
-        rover_text = self.font.render(f"Purchase Rover - {self.rover_cost} Metal", True, (200, 200, 200))
+        rover_text = render_text(self.font, f"Purchase Rover - {self.rover_cost} Metal - {self.rover_rounds} Round", (200, 200, 200))
         screen.blit(rover_text, (rover_btn.x + 15, rover_btn.y + 12))
 
         # Drone Button
-        drone_btn = pygame.Rect(self.x + 20, self.y + 130, self.width - 40, 50)
+        drone_btn = self.drone_btn
         pygame.draw.rect(screen, (60, 60, 60), drone_btn)
-        drone_text = self.font.render(f"Purchase Drone - {self.drone_cost} Metal", True, (200, 200, 200))
+        drone_text = render_text(self.font, f"Purchase Drone - {self.drone_cost} Metal - {self.drone_rounds} Rounds", (200, 200, 200))
         screen.blit(drone_text, (drone_btn.x + 15, drone_btn.y + 12))
 
         # Current metals display
-        metals_text = self.font.render(f"Available Metal: {getattr(self.dashboard, 'metals', 0)}", True, (180, 180, 255))
+        metals_text = render_text(self.font, f"Available Metal: {getattr(self.dashboard, 'metals', 0)}", (180, 180, 255))
         screen.blit(metals_text, (self.x + 20, self.y + 210))
 
+        # Production queue
+        queue_y = self.y + 250
+        bar_width = self.width - 40
+        bar_height = 20
+        rows = state[4]
+        fits = (self.y + self.height - 45 - queue_y) // (bar_height + 10)
+        if len(rows) > fits:
+            fits -= 1   # room for the "more" line
+        for name, remaining_rounds, progress, waiting in rows[:fits]:
+            bar_rect = self.bar_rect
+            bar_rect.update(self.x + 20, queue_y, bar_width, bar_height)
+            pygame.draw.rect(screen, (100, 100, 100), bar_rect)
+            bar_rect.width = int(bar_width * progress)
+            pygame.draw.rect(screen, (0, 200, 0), bar_rect)
+            label = f"{name} - waiting for a bay" if waiting else f"{name} - {remaining_rounds} Rounds left"
+            text = render_text(self.font, label, (255, 255, 255))
+            screen.blit(text, (self.x + 25, queue_y + (bar_height - text.get_height()) // 2))
+            queue_y += bar_height + 10
+        if len(rows) > fits:
+            more_text = render_text(self.font, f"... and {len(rows) - fits} more", (200, 200, 255))
+            screen.blit(more_text, (self.x + 25, queue_y))
+
         # Error message (if used)
         if self.error_message:
-            err_text = self.font.render(self.error_message, True, (255, 100, 100))
+            err_text = render_text(self.font, self.error_message, (255, 100, 100))
             screen.blit(err_text, (self.x + 20, self.y + self.height - 40))
+
+        self.panel_cache.store(screen, state)
@@ -0,0 +1,82 @@
+# world_gen.py
+import threading
+import pygame
+from terrain import generate_noise_map
+from building import Base
+from resources import ResourceDeposit
+
+
+class World:
+    def __init__(self, noise_map, base, resources):
+        """Everything a new GameSession needs from world generation."""
+        self.noise_map = noise_map
+        self.base = base
+        self.resources = resources
+
+
+def generate_world(cols, rows, tile_size, progress=None):
+    """
+    Build the terrain, spawn the base and the resource deposits that don't overlap it.
+    progress(fraction) is called as the work advances (0..1).
+    """
+    report = progress or (lambda fraction: None)
+    noise_map = generate_noise_map(rows, cols, progress=lambda f: report(0.9 * f))
+    base = Base.spawn(noise_map, cols, rows, tile_size)
+    report(0.92)
+
+    # Filter resources outside base
+    all_resources = ResourceDeposit.spawn_resources(noise_map, cols, rows, tile_size)
+    resources = []
+    half = base.size // 2
+    base_rect = pygame.Rect((base.x - half) * tile_size - 5,
+                            (base.y - half) * tile_size - 5,
+                            base.size * tile_size + 10,
+                            base.size * tile_size + 10)
+
+    for res in all_resources:
+        filtered_positions = [(x, y) for x, y in res.positions
+                              if not base_rect.collidepoint(x * tile_size, y * tile_size)]
+        if filtered_positions:
+            res.positions = filtered_positions
+            resources.append(res)
+    report(1.0)
+    return World(noise_map, base, resources)
+
+
+class WorldGenerator:
+    def __init__(self, cols, rows, tile_size):
+        """
+        Runs generate_world() on a background thread, e.g. while the menu is open.
+        Poll `done` / `progress` from the UI, then call result() for the World.
+        """
+        self.cols = cols
+        self.rows = rows
+        self.tile_size = tile_size
+        self.progress = 0.0
+        self.world = None
+        self.error = None
+        self._thread = threading.Thread(target=self._run, name="world-gen", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def _run(self):
+        try:
+            self.world = generate_world(self.cols, self.rows, self.tile_size, progress=self._set_progress)
+        except Exception as e:
+            self.error = e
+
+    def _set_progress(self, fraction):
+        self.progress = fraction
+
+    @property
+    def done(self):
+        return not self._thread.is_alive() and (self.world is not None or self.error is not None)
+
+    def result(self, timeout=None):
+        """Wait for the thread and return the World (re-raises a generation error)."""
+        self._thread.join(timeout)
+        if self.error is not None:
+            raise self.error
+        return self.world